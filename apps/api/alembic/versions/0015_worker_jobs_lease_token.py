@@ -0,0 +1,34 @@
+"""Add lease_token (fencing token) to worker_jobs
+
+Revision ID: 0015_worker_jobs_lease_token
+Revises: 0014_affiliates_program
+Create Date: 2026-10-16
+
+Cada claim de um job gera um novo lease_token. O heartbeat do worker só
+estende `available_at` e o ack só é aceito se o token ainda for o atual,
+impedindo que um worker com lease expirado finalize um job já re-claimado.
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0015_worker_jobs_lease_token"
+down_revision: Union[str, None] = "0014_affiliates_program"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "worker_jobs",
+        sa.Column("lease_token", sa.String(length=64), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("worker_jobs", "lease_token")
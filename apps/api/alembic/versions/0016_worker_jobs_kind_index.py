@@ -0,0 +1,33 @@
+"""Index worker_jobs for per-kind worker lanes
+
+Revision ID: 0016_worker_jobs_kind_index
+Revises: 0015_worker_jobs_lease_token
+Create Date: 2026-10-16
+
+Cada lane do worker busca só o seu `kind`, na ordem de chegada. O índice
+composto cobre o filtro (kind, status) e a ordenação (created_at).
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0016_worker_jobs_kind_index"
+down_revision: Union[str, None] = "0015_worker_jobs_lease_token"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_worker_jobs_kind_status_created",
+        "worker_jobs",
+        ["kind", "status", "created_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_worker_jobs_kind_status_created", table_name="worker_jobs")
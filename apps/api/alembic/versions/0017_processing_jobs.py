@@ -0,0 +1,74 @@
+"""Persist media processing jobs
+
+Revision ID: 0017_processing_jobs
+Revises: 0016_worker_jobs_kind_index
+Create Date: 2026-10-16
+
+Os jobs de fallback (`/media/processing`) ficavam num dict em memória: eram
+perdidos no restart e divergiam entre réplicas. Os índices cobrem a listagem
+por usuário, a busca por asset, a posição na fila (pendentes por created_at)
+e o sweeper de retenção (completed_at).
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0017_processing_jobs"
+down_revision: Union[str, None] = "0016_worker_jobs_kind_index"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "processing_jobs",
+        sa.Column("id", sa.String(length=40), primary_key=True),
+        sa.Column("user_id", sa.Uuid(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("job_type", sa.String(length=32), nullable=False),
+        sa.Column("asset_id", sa.String(length=255), nullable=False),
+        sa.Column("source_key", sa.String(length=1024), nullable=False),
+        sa.Column("options", sa.JSON(), nullable=False),
+        sa.Column("priority", sa.Integer(), nullable=False, server_default=sa.text("5")),
+        sa.Column("callback_url", sa.Text(), nullable=True),
+        sa.Column("status", sa.String(length=24), nullable=False, server_default="pending"),
+        sa.Column("progress", sa.Float(), nullable=False, server_default=sa.text("0")),
+        sa.Column("stage", sa.String(length=40), nullable=True),
+        sa.Column("output_key", sa.String(length=1024), nullable=True),
+        sa.Column("output_url", sa.Text(), nullable=True),
+        sa.Column("thumbnail_key", sa.String(length=1024), nullable=True),
+        sa.Column("thumbnail_url", sa.Text(), nullable=True),
+        sa.Column("variants", sa.JSON(), nullable=True),
+        sa.Column("error_message", sa.Text(), nullable=True),
+        sa.Column("processing_time_seconds", sa.Float(), nullable=True),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+    op.create_index(
+        "ix_processing_jobs_user_status_created",
+        "processing_jobs",
+        ["user_id", "status", "created_at"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_processing_jobs_status_created",
+        "processing_jobs",
+        ["status", "created_at"],
+        unique=False,
+    )
+    op.create_index("ix_processing_jobs_asset_id", "processing_jobs", ["asset_id"], unique=False)
+    op.create_index("ix_processing_jobs_completed_at", "processing_jobs", ["completed_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_processing_jobs_completed_at", table_name="processing_jobs")
+    op.drop_index("ix_processing_jobs_asset_id", table_name="processing_jobs")
+    op.drop_index("ix_processing_jobs_status_created", table_name="processing_jobs")
+    op.drop_index("ix_processing_jobs_user_status_created", table_name="processing_jobs")
+    op.drop_table("processing_jobs")
@@ -0,0 +1,56 @@
+"""Track data exports with resumable checkpoints
+
+Revision ID: 0018_data_exports
+Revises: 0017_processing_jobs
+Create Date: 2026-10-16
+
+`POST /me/settings/data/export` passa a enfileirar um `export.zip` real. A linha
+em `data_exports` expõe o progresso ao usuário e guarda o checkpoint do ZIP
+em streaming (upload id do multipart, ETags e diretório parcial), para que
+exportações longas sobrevivam a restarts do worker.
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0018_data_exports"
+down_revision: Union[str, None] = "0017_processing_jobs"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "data_exports",
+        sa.Column("id", sa.Uuid(), primary_key=True),
+        sa.Column("account_id", sa.Uuid(), sa.ForeignKey("accounts.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("user_id", sa.Uuid(), sa.ForeignKey("users.id", ondelete="SET NULL"), nullable=True),
+        sa.Column("status", sa.String(length=24), nullable=False, server_default="queued"),
+        sa.Column("item_count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("items_done", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("bytes_written", sa.BigInteger(), nullable=False, server_default=sa.text("0")),
+        sa.Column("upload_id", sa.String(length=1024), nullable=True),
+        sa.Column("checkpoint", sa.JSON(), nullable=True),
+        sa.Column("result_key", sa.String(length=1024), nullable=True),
+        sa.Column("error_message", sa.Text(), nullable=True),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+    op.create_index(
+        "ix_data_exports_account_created",
+        "data_exports",
+        ["account_id", "created_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_data_exports_account_created", table_name="data_exports")
+    op.drop_table("data_exports")
@@ -0,0 +1,42 @@
+"""Composite indexes for keyset pagination
+
+Revision ID: 0019_keyset_pagination_indexes
+Revises: 0018_data_exports
+Create Date: 2026-10-16
+
+As listagens passam a paginar por cursor `(created_at, id)` (ou
+`(scheduled_at, id)` nas ocorrências de série). Cada índice cobre o escopo
+da listagem + a chave do cursor, para que qualquer página seja uma leitura
+de intervalo no índice, sem OFFSET.
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0019_keyset_pagination_indexes"
+down_revision: Union[str, None] = "0018_data_exports"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_INDEXES = (
+    ("ix_moments_account_created_id", "moments", ["account_id", "created_at", "id"]),
+    ("ix_guestbook_entries_account_created_id", "guestbook_entries", ["account_id", "created_at", "id"]),
+    ("ix_vault_documents_account_created_id", "vault_documents", ["account_id", "created_at", "id"]),
+    ("ix_chapters_account_created_id", "chapters", ["account_id", "created_at", "id"]),
+    ("ix_series_account_created_id", "series", ["account_id", "created_at", "id"]),
+    ("ix_series_occurrences_series_scheduled_id", "series_occurrences", ["series_id", "scheduled_at", "id"]),
+    ("ix_deliveries_partner_created_id", "deliveries", ["partner_id", "created_at", "id"]),
+)
+
+
+def upgrade() -> None:
+    for name, table, columns in _INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(_INDEXES):
+        op.drop_index(name, table_name=table)
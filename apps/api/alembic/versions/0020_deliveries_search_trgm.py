@@ -0,0 +1,47 @@
+"""Trigram index for the partner deliveries search
+
+Revision ID: 0020_deliveries_search_trgm
+Revises: 0019_keyset_pagination_indexes
+Create Date: 2026-10-16
+
+A busca `q` da listagem de entregas do portal faz `LIKE '%termo%'` sobre
+título, cliente, voucher e e-mails. Sem índice, isso é um seq scan em todas
+as entregas do parceiro. O índice GIN (pg_trgm) usa exatamente a mesma
+expressão de `_DELIVERY_SEARCH_TEXT` em routes/partner_portal.py; se uma
+mudar, a outra precisa acompanhar.
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0020_deliveries_search_trgm"
+down_revision: Union[str, None] = "0019_keyset_pagination_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_SEARCH_TEXT = (
+    "lower("
+    "coalesce(title, '') || ' ' || "
+    "coalesce(client_name, '') || ' ' || "
+    "coalesce(generated_voucher_code, '') || ' ' || "
+    "coalesce(target_email, '') || ' ' || "
+    "coalesce(beneficiary_email, '')"
+    ")"
+)
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(f"CREATE INDEX IF NOT EXISTS ix_deliveries_search_trgm ON deliveries USING gin (({_SEARCH_TEXT}) gin_trgm_ops)")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    # A extensão fica: outras tabelas podem passar a usá-la.
+    op.execute("DROP INDEX IF EXISTS ix_deliveries_search_trgm")
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import uuid
 from dataclasses import dataclass
+from datetime import datetime
 
 from fastapi import Cookie, Depends, Header
 from sqlalchemy import select
@@ -9,6 +11,7 @@ from sqlalchemy.orm import selectinload
 from starlette import status
 
 from babybook_api.auth.constants import SESSION_COOKIE_NAME
+from babybook_api.auth.session_cache import session_cache
 from babybook_api.db.models import Session as SessionModel
 from babybook_api.deps import get_db_session
 from babybook_api.errors import AppError
@@ -26,6 +29,18 @@ class UserSession:
     role: str
 
 
+@dataclass(frozen=True)
+class AuthenticatedSession:
+    """Snapshot imutável da sessão validada (é o que fica no cache)."""
+
+    id: uuid.UUID
+    user_id: uuid.UUID
+    account_id: uuid.UUID
+    csrf_token: str
+    expires_at: datetime
+    user: UserSession | None
+
+
 async def _get_session_token(
     cookie_token: str | None = Cookie(default=None, alias=SESSION_COOKIE_NAME),
     header_token: str | None = Header(default=None, alias="X-BB-Session"),
@@ -40,10 +55,14 @@ async def _get_session_token(
     return None
 
 
-async def _fetch_session(db: AsyncSession, token: str | None) -> SessionModel:
+async def _fetch_session(db: AsyncSession, token: str | None) -> AuthenticatedSession:
     if not token:
         raise AppError(status_code=401, code="auth.session.invalid", message="Sessao nao autenticada.")
 
+    cached = session_cache.get(token)
+    if cached is not None and not is_expired(cached.expires_at):
+        return cached
+
     stmt = select(SessionModel).where(SessionModel.token == token).options(selectinload(SessionModel.user))
     result = await db.execute(stmt)
     session = result.scalar_one_or_none()
@@ -54,31 +73,46 @@ async def _fetch_session(db: AsyncSession, token: str | None) -> SessionModel:
     ):
         raise AppError(status_code=401, code="auth.session.invalid", message="Sessao expirada.")
 
-    return session
+    snapshot = _snapshot(session)
+    session_cache.put(token, snapshot, session_id=snapshot.id, user_id=snapshot.user_id)
+    return snapshot
+
+
+def _snapshot(session: SessionModel) -> AuthenticatedSession:
+    user = session.user
+    return AuthenticatedSession(
+        id=session.id,
+        user_id=session.user_id,
+        account_id=session.account_id,
+        csrf_token=session.csrf_token,
+        expires_at=session.expires_at,
+        user=UserSession(
+            id=str(user.id),
+            account_id=str(user.account_id),
+            email=user.email,
+            name=user.name,
+            locale=user.locale,
+            role=user.role,
+        )
+        if user is not None
+        else None,
+    )
 
 
 async def get_current_session(
     token: str | None = Depends(_get_session_token),
     db: AsyncSession = Depends(get_db_session),
-) -> SessionModel:
+) -> AuthenticatedSession:
     return await _fetch_session(db, token)
 
 
 async def get_current_user(
-    session: SessionModel = Depends(get_current_session),
+    session: AuthenticatedSession = Depends(get_current_session),
 ) -> UserSession:
-    user = session.user
-    if user is None:
+    if session.user is None:
         raise AppError(status_code=401, code="auth.session.invalid", message="Usuario nao encontrado.")
 
-    return UserSession(
-        id=str(user.id),
-        account_id=str(user.account_id),
-        email=user.email,
-        name=user.name,
-        locale=user.locale,
-        role=user.role,
-    )
+    return session.user
 
 
 async def get_optional_user(
@@ -101,22 +135,11 @@ async def get_optional_user(
             return None
         raise
 
-    user = session.user
-    if user is None:
-        return None
-
-    return UserSession(
-        id=str(user.id),
-        account_id=str(user.account_id),
-        email=user.email,
-        name=user.name,
-        locale=user.locale,
-        role=user.role,
-    )
+    return session.user
 
 
 async def require_csrf_token(
-    session: SessionModel = Depends(get_current_session),
+    session: AuthenticatedSession = Depends(get_current_session),
     csrf_token: str | None = Header(default=None, alias="X-CSRF-Token"),
 ) -> None:
     """Exige CSRF token para requisições mutáveis (cookie-based session).
@@ -127,7 +150,7 @@ async def require_csrf_token(
     validate_csrf_token_for_session(session=session, csrf_token=csrf_token)
 
 
-def validate_csrf_token_for_session(*, session: SessionModel, csrf_token: str | None) -> None:
+def validate_csrf_token_for_session(*, session: AuthenticatedSession, csrf_token: str | None) -> None:
     """Valida CSRF token em modo cookie-session.
 
     Alguns endpoints precisam rodar checagens de autorização (ex.: ownership)
@@ -0,0 +1,183 @@
+"""Cache em processo das sessões já validadas.
+
+Sem cache, toda requisição autenticada fazia `SELECT sessions` + `SELECT
+users` antes da rota. Aqui guardamos um snapshot imutável da sessão (LRU,
+chave = sha256 do token, nunca o token em si) por até
+`SESSION_CACHE_TTL_SECONDS`.
+
+Invalidação: logout, logout_all, alteração/remoção de usuário chamam
+`invalidate_sessions`, que limpa a réplica local na hora e publica um NOTIFY
+em `session_invalidation`. O Postgres entrega o NOTIFY no COMMIT para todas
+as réplicas (inclusive a própria, o que também cobre uma requisição que
+recarregou a sessão antiga antes do commit). Se o LISTEN cair, o cache é
+esvaziado ao reconectar; durante a queda vale o TTL como limite.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable
+
+import asyncpg
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from babybook_api.settings import settings
+
+logger = logging.getLogger(__name__)
+
+SESSION_INVALIDATION_CHANNEL = "session_invalidation"
+
+
+@dataclass(slots=True)
+class _Entry:
+    value: Any
+    session_id: uuid.UUID
+    user_id: uuid.UUID
+    stored_at: float
+
+
+class SessionCache:
+    def __init__(
+        self,
+        *,
+        max_entries: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl_seconds > 0
+
+    @staticmethod
+    def key(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token: str) -> Any | None:
+        if not self.enabled:
+            return None
+        key = self.key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if self._clock() - entry.stored_at >= self.ttl_seconds:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry.value
+
+    def put(self, token: str, value: Any, *, session_id: uuid.UUID, user_id: uuid.UUID) -> None:
+        if not self.enabled:
+            return
+        key = self.key(token)
+        self._entries[key] = _Entry(value, session_id, user_id, self._clock())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate_session(self, session_id: uuid.UUID) -> None:
+        self._drop(lambda entry: entry.session_id == session_id)
+
+    def invalidate_user(self, user_id: uuid.UUID) -> None:
+        self._drop(lambda entry: entry.user_id == user_id)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def apply_notification(self, payload: str) -> None:
+        """Aplica um payload `session:<id>`, `user:<id>` ou `all` recebido via NOTIFY."""
+        scope, _, raw_id = payload.partition(":")
+        try:
+            if scope == "session":
+                self.invalidate_session(uuid.UUID(raw_id))
+                return
+            if scope == "user":
+                self.invalidate_user(uuid.UUID(raw_id))
+                return
+        except ValueError:
+            pass
+        # Payload desconhecido: na dúvida, descarta tudo.
+        self.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _drop(self, predicate: Callable[[_Entry], bool]) -> None:
+        # Varredura linear: invalidações são raras perto das leituras.
+        for key in [key for key, entry in self._entries.items() if predicate(entry)]:
+            del self._entries[key]
+
+
+session_cache = SessionCache(
+    max_entries=settings.session_cache_max_entries,
+    ttl_seconds=settings.session_cache_ttl_seconds,
+)
+
+
+async def invalidate_sessions(
+    db: AsyncSession,
+    *,
+    session_id: uuid.UUID | None = None,
+    user_id: uuid.UUID | None = None,
+) -> None:
+    """Invalida localmente e avisa as outras réplicas (no COMMIT da transação de `db`)."""
+    if session_id is not None:
+        session_cache.invalidate_session(session_id)
+        payload = f"session:{session_id}"
+    elif user_id is not None:
+        session_cache.invalidate_user(user_id)
+        payload = f"user:{user_id}"
+    else:
+        session_cache.clear()
+        payload = "all"
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    await db.execute(
+        text("SELECT pg_notify(:channel, :payload)"),
+        {"channel": SESSION_INVALIDATION_CHANNEL, "payload": payload},
+    )
+
+
+async def run_invalidation_listener(
+    database_url: str,
+    *,
+    cache: SessionCache = session_cache,
+    retry_seconds: float = 5.0,
+) -> None:
+    """Escuta `session_invalidation` e aplica nas entradas desta réplica (roda até ser cancelada)."""
+    dsn = make_url(database_url).set(drivername="postgresql").render_as_string(hide_password=False)
+    while True:
+        connection: asyncpg.Connection | None = None
+        try:
+            connection = await asyncpg.connect(dsn)
+            closed = asyncio.Event()
+            connection.add_termination_listener(lambda _conn: closed.set())
+            await connection.add_listener(
+                SESSION_INVALIDATION_CHANNEL,
+                lambda _conn, _pid, _channel, payload: cache.apply_notification(payload),
+            )
+            # Notificações perdidas enquanto estávamos desconectados.
+            cache.clear()
+            await closed.wait()
+            logger.warning("Conexão LISTEN de sessões encerrada; reconectando")
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.warning("LISTEN de invalidação de sessões indisponível; tentando de novo", exc_info=True)
+            cache.clear()
+        finally:
+            if connection is not None and not connection.is_closed():
+                await connection.close()
+        await asyncio.sleep(retry_seconds)
@@ -270,6 +270,7 @@ class Person(TimestampMixin, SoftDeleteMixin, Base):
 
 class Series(TimestampMixin, SoftDeleteMixin, Base):
     __tablename__ = "series"
+    __table_args__ = (Index("ix_series_account_created_id", "account_id", "created_at", "id"),)
 
     id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True, default=_generate_uuid)
     account_id: Mapped[uuid.UUID] = mapped_column(Uuid, ForeignKey("accounts.id", ondelete="CASCADE"))
@@ -285,6 +286,7 @@ class Series(TimestampMixin, SoftDeleteMixin, Base):
 
 class Moment(TimestampMixin, SoftDeleteMixin, Base):
     __tablename__ = "moments"
+    __table_args__ = (Index("ix_moments_account_created_id", "account_id", "created_at", "id"),)
 
     id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True, default=_generate_uuid)
     account_id: Mapped[uuid.UUID] = mapped_column(Uuid, ForeignKey("accounts.id", ondelete="CASCADE"))
@@ -309,6 +311,7 @@ class Moment(TimestampMixin, SoftDeleteMixin, Base):
 
 class SeriesOccurrence(TimestampMixin, Base):
     __tablename__ = "series_occurrences"
+    __table_args__ = (Index("ix_series_occurrences_series_scheduled_id", "series_id", "scheduled_at", "id"),)
 
     id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True, default=_generate_uuid)
     series_id: Mapped[uuid.UUID] = mapped_column(Uuid, ForeignKey("series.id", ondelete="CASCADE"))
@@ -402,10 +405,17 @@ class UploadSession(TimestampMixin, Base):
     account: Mapped[Account] = relationship(back_populates="upload_sessions")
 
 
+# Canal LISTEN/NOTIFY usado para acordar os workers assim que um job é enfileirado.
+# O payload da notificação é o `kind` do job.
+WORKER_JOBS_CHANNEL = "worker_jobs"
+
+
 class WorkerJob(TimestampMixin, Base):
     __tablename__ = "worker_jobs"
     __table_args__ = (
         Index("ix_worker_jobs_status_available", "status", "available_at"),
+        # Fetch de cada lane do worker: filtra (kind, status) e lê na ordem de chegada.
+        Index("ix_worker_jobs_kind_status_created", "kind", "status", "created_at"),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True, default=_generate_uuid)
@@ -421,10 +431,71 @@ class WorkerJob(TimestampMixin, Base):
     available_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
     attempts: Mapped[int] = mapped_column(Integer, default=0)
     last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # Fencing token do claim atual; renovado a cada fetch.
+    lease_token: Mapped[str | None] = mapped_column(String(64), nullable=True)
 
     account: Mapped[Account | None] = relationship(back_populates="worker_jobs")
 
 
+class ProcessingJob(TimestampMixin, Base):
+    """Job de processamento server-side (fallback do ffmpeg.wasm) visto pelo usuário."""
+
+    __tablename__ = "processing_jobs"
+    __table_args__ = (
+        Index("ix_processing_jobs_user_status_created", "user_id", "status", "created_at"),
+        # Posição na fila: COUNT(*) de pendentes criados antes, sem varrer a tabela.
+        Index("ix_processing_jobs_status_created", "status", "created_at"),
+        Index("ix_processing_jobs_asset_id", "asset_id"),
+        Index("ix_processing_jobs_completed_at", "completed_at"),
+    )
+
+    id: Mapped[str] = mapped_column(String(40), primary_key=True)
+    user_id: Mapped[uuid.UUID] = mapped_column(Uuid, ForeignKey("users.id", ondelete="CASCADE"))
+    job_type: Mapped[str] = mapped_column(String(32))
+    asset_id: Mapped[str] = mapped_column(String(255))
+    source_key: Mapped[str] = mapped_column(String(1024))
+    options: Mapped[dict[str, Any]] = mapped_column(MutableDict.as_mutable(JSON), default=dict)
+    priority: Mapped[int] = mapped_column(Integer, default=5)
+    callback_url: Mapped[str | None] = mapped_column(Text, nullable=True)
+    status: Mapped[str] = mapped_column(String(24), default="pending")
+    progress: Mapped[float] = mapped_column(Float, default=0.0)
+    stage: Mapped[str | None] = mapped_column(String(40), nullable=True)
+    output_key: Mapped[str | None] = mapped_column(String(1024), nullable=True)
+    output_url: Mapped[str | None] = mapped_column(Text, nullable=True)
+    thumbnail_key: Mapped[str | None] = mapped_column(String(1024), nullable=True)
+    thumbnail_url: Mapped[str | None] = mapped_column(Text, nullable=True)
+    variants: Mapped[list[dict[str, Any]] | None] = mapped_column(JSON, nullable=True)
+    error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
+    processing_time_seconds: Mapped[float | None] = mapped_column(Float, nullable=True)
+    started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    completed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+
+class DataExport(TimestampMixin, Base):
+    """Exportação LGPD da conta (ZIP com os originais), montada pelo worker.
+
+    `checkpoint` guarda o estado do ZIP em streaming (multipart upload, ETags
+    das partes e diretório parcial) para que um retry retome de onde parou.
+    """
+
+    __tablename__ = "data_exports"
+    __table_args__ = (Index("ix_data_exports_account_created", "account_id", "created_at"),)
+
+    id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True, default=_generate_uuid)
+    account_id: Mapped[uuid.UUID] = mapped_column(Uuid, ForeignKey("accounts.id", ondelete="CASCADE"))
+    user_id: Mapped[uuid.UUID | None] = mapped_column(Uuid, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    status: Mapped[str] = mapped_column(String(24), default="queued")
+    item_count: Mapped[int] = mapped_column(Integer, default=0)
+    items_done: Mapped[int] = mapped_column(Integer, default=0)
+    bytes_written: Mapped[int] = mapped_column(BigInteger, default=0)
+    upload_id: Mapped[str | None] = mapped_column(String(1024), nullable=True)
+    checkpoint: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
+    result_key: Mapped[str | None] = mapped_column(String(1024), nullable=True)
+    error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
+    started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    completed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+
 class ShareLink(TimestampMixin, Base):
     __tablename__ = "share_links"
 
@@ -463,6 +534,7 @@ class GuestbookInvite(TimestampMixin, Base):
 
 class GuestbookEntry(TimestampMixin, SoftDeleteMixin, Base):
     __tablename__ = "guestbook_entries"
+    __table_args__ = (Index("ix_guestbook_entries_account_created_id", "account_id", "created_at", "id"),)
 
     id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True, default=_generate_uuid)
     account_id: Mapped[uuid.UUID] = mapped_column(Uuid, ForeignKey("accounts.id", ondelete="CASCADE"))
@@ -495,7 +567,10 @@ class GuestbookEntry(TimestampMixin, SoftDeleteMixin, Base):
 
 class Chapter(TimestampMixin, SoftDeleteMixin, Base):
     __tablename__ = "chapters"
-    __table_args__ = (UniqueConstraint("account_id", "slug", name="uq_chapter_account_slug"),)
+    __table_args__ = (
+        UniqueConstraint("account_id", "slug", name="uq_chapter_account_slug"),
+        Index("ix_chapters_account_created_id", "account_id", "created_at", "id"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True, default=_generate_uuid)
     account_id: Mapped[uuid.UUID] = mapped_column(Uuid, ForeignKey("accounts.id", ondelete="CASCADE"))
@@ -528,6 +603,7 @@ class ChapterMoment(TimestampMixin, Base):
 
 class VaultDocument(TimestampMixin, Base):
     __tablename__ = "vault_documents"
+    __table_args__ = (Index("ix_vault_documents_account_created_id", "account_id", "created_at", "id"),)
 
     id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True, default=_generate_uuid)
     account_id: Mapped[uuid.UUID] = mapped_column(Uuid, ForeignKey("accounts.id", ondelete="CASCADE"))
@@ -716,6 +792,7 @@ class Delivery(TimestampMixin, Base):
     __tablename__ = "deliveries"
     __table_args__ = (
         Index("ix_deliveries_partner_status", "partner_id", "status"),
+        Index("ix_deliveries_partner_created_id", "partner_id", "created_at", "id"),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True, default=_generate_uuid)
@@ -1,4 +1,4 @@
-from fastapi import FastAPI, Request, Response
+from fastapi import FastAPI
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.exceptions import HTTPException as StarletteHTTPException
@@ -13,7 +13,7 @@ from .errors import (
     unhandled_exception_handler,
     validation_exception_handler,
 )
-from .observability import TraceIdMiddleware
+from .observability import ResponseHeadersMiddleware
 from .routes import (
     assets,
     affiliates_admin,
@@ -40,9 +40,15 @@ from .routes import (
     vault,
     vouchers,
 )
+from .security import security_headers
+import asyncio
 import os
+from datetime import timedelta
 
+from .auth.session_cache import run_invalidation_listener, session_cache
 from .services.auth import bootstrap_dev_partner, bootstrap_dev_user
+from .services.passwords import password_hasher
+from .services.processing_jobs import run_retention_sweeper
 from .services.seed_affiliates import bootstrap_dev_affiliates
 from .settings import settings
 
@@ -54,34 +60,14 @@ def create_app() -> FastAPI:
         openapi_url="/openapi.json"
     )
 
-    app.add_middleware(TraceIdMiddleware)
     # Performance: compress responses (especialmente JSON) quando vale a pena.
     # Mantemos um mínimo para não comprimir payloads pequenos.
     app.add_middleware(GZipMiddleware, minimum_size=1000)
-
-    @app.middleware("http")
-    async def add_security_headers(request: Request, call_next):
-        response: Response = await call_next(request)
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-        
-        if settings.app_env != "local" or settings.session_cookie_secure:
-            response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
-            
-        # Para uma API purista, default-src 'none' seria o ideal.
-        # Como servimos Swagger e OAuth Mocks em dev, usamos 'self' para scripts/styles.
-        csp = (
-            "default-src 'self'; "
-            "img-src 'self' data: https:; "
-            "font-src 'self' https:; "
-            "frame-ancestors 'none'; "
-            "base-uri 'none'; "
-            "form-action 'self';"
-        )
-        response.headers["Content-Security-Policy"] = csp
-        return response
+    # Trace-id + cabeçalhos de segurança + Server-Timing (ASGI puro, uma passada).
+    app.add_middleware(
+        ResponseHeadersMiddleware,
+        security_headers=security_headers(hsts=settings.app_env != "local" or settings.session_cookie_secure),
+    )
     # Protege contra Host header attacks / cache poisoning via Host.
     # Em staging/prod, ALLOWED_HOSTS é obrigatório e não permite wildcard.
     app.add_middleware(TrustedHostMiddleware, allowed_hosts=settings.allowed_hosts)
@@ -133,6 +119,43 @@ def create_app() -> FastAPI:
     app.include_router(affiliates_admin.router, prefix="/admin", tags=["affiliates-admin"])
     app.include_router(affiliates_portal.router, prefix="/affiliate", tags=["affiliates"])
 
+    @app.on_event("shutdown")
+    async def _stop_password_hasher():
+        password_hasher.shutdown()
+
+    # Invalidação do cache de sessões entre réplicas (LISTEN/NOTIFY; só Postgres).
+    if session_cache.enabled and settings.database_url.startswith("postgresql"):
+        session_listener: dict[str, asyncio.Task] = {}
+
+        @app.on_event("startup")
+        async def _start_session_invalidation_listener():
+            session_listener["task"] = asyncio.create_task(run_invalidation_listener(settings.database_url))
+
+        @app.on_event("shutdown")
+        async def _stop_session_invalidation_listener():
+            task = session_listener.pop("task", None)
+            if task is not None:
+                task.cancel()
+
+    if settings.processing_job_sweep_interval_seconds > 0:
+        sweeper: dict[str, asyncio.Task] = {}
+
+        @app.on_event("startup")
+        async def _start_processing_job_sweeper():
+            sweeper["task"] = asyncio.create_task(
+                run_retention_sweeper(
+                    AsyncSessionLocal,
+                    interval_seconds=settings.processing_job_sweep_interval_seconds,
+                    retention=timedelta(days=settings.processing_job_retention_days),
+                )
+            )
+
+        @app.on_event("shutdown")
+        async def _stop_processing_job_sweeper():
+            task = sweeper.pop("task", None)
+            if task is not None:
+                task.cancel()
+
     # Dev-only: ensure dev users exist on startup so developers can login with known credentials
     if settings.app_env == "local" and os.getenv("PYTEST_CURRENT_TEST") is None:
         @app.on_event("startup")
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
+import time
 import uuid
+from collections.abc import Mapping
 
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
 from starlette.requests import Request
-from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 TRACE_ID_HEADER = "X-Trace-Id"
+_TRACE_ID_HEADER_RAW = TRACE_ID_HEADER.lower().encode("latin-1")
 
 
 def _generate_suffix() -> str:
@@ -26,15 +28,50 @@ def get_trace_id(request: Request) -> str:
     return trace_id
 
 
-class TraceIdMiddleware(BaseHTTPMiddleware):
+class ResponseHeadersMiddleware:
     """
-    Gera um trace-id por requisicao e injeta no estado e no cabecalho X-Trace-Id.
+    Middleware ASGI puro: gera o trace-id por requisicao (estado + X-Trace-Id),
+    aplica os cabecalhos de seguranca e o Server-Timing numa unica passada.
     Necessario para cumprir a Convencao 4.2 (Erro Canonico + rastreabilidade).
+
+    Substitui o par BaseHTTPMiddleware + @app.middleware("http"): cada um
+    criava tasks e streams anyio por requisicao e bufferizava respostas em
+    streaming. Os cabecalhos fixos ja ficam prontos em bytes.
     """
 
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+    def __init__(self, app: ASGIApp, *, security_headers: Mapping[str, str] | None = None) -> None:
+        self.app = app
+        self._static = [
+            (name.lower().encode("latin-1"), value.encode("latin-1"))
+            for name, value in (security_headers or {}).items()
+        ]
+        self._static_names = frozenset(name for name, _ in self._static)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         trace_id = new_trace_id()
-        request.state.trace_id = trace_id
-        response = await call_next(request)
-        response.headers.setdefault(TRACE_ID_HEADER, trace_id)
-        return response
+        scope.setdefault("state", {})["trace_id"] = trace_id
+        started = time.perf_counter()
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                has_trace_id = False
+                headers = []
+                for name, value in message.get("headers", ()):
+                    if name in self._static_names:
+                        continue
+                    # Handlers de erro ja gravam o trace-id: mantemos o deles.
+                    has_trace_id = has_trace_id or name == _TRACE_ID_HEADER_RAW
+                    headers.append((name, value))
+                if not has_trace_id:
+                    headers.append((_TRACE_ID_HEADER_RAW, trace_id.encode("latin-1")))
+                headers.extend(self._static)
+                headers.append((b"server-timing", b"app;dur=%.1f" % elapsed_ms))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
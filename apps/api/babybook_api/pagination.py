@@ -0,0 +1,76 @@
+"""Paginação keyset (cursor) das listagens.
+
+Com OFFSET o banco lê e descarta todas as linhas anteriores, e páginas
+profundas ficam cada vez mais caras. Aqui cada página continua da última
+linha da anterior:
+
+    WHERE (created_at, id) < (:created_at, :id)
+    ORDER BY created_at DESC, id DESC
+    LIMIT :limit + 1
+
+Índices compostos `(<escopo>, created_at, id)` atendem o filtro e a ordem,
+então qualquer página custa o mesmo que a primeira. O `id` desempata linhas
+com o mesmo timestamp. O cursor é opaco e assinado: o cliente só devolve o
+`next` recebido e não consegue forjar posições.
+"""
+
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+from typing import Any, Sequence, TypeVar
+
+from itsdangerous import BadSignature, URLSafeSerializer
+from sqlalchemy import Select, tuple_
+from sqlalchemy.orm import InstrumentedAttribute
+
+from babybook_api.errors import AppError
+from babybook_api.settings import settings
+
+T = TypeVar("T")
+
+
+def _serializer() -> URLSafeSerializer:
+    return URLSafeSerializer(settings.secret_key, salt="list-cursor")
+
+
+def encode_cursor(position: datetime, row_id: uuid.UUID) -> str:
+    return _serializer().dumps([position.isoformat(), str(row_id)])
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    try:
+        position, row_id = _serializer().loads(cursor)
+        return datetime.fromisoformat(position), uuid.UUID(row_id)
+    except (BadSignature, TypeError, ValueError) as exc:
+        raise AppError(status_code=400, code="pagination.cursor.invalid", message="Cursor invalido.") from exc
+
+
+def keyset_page(
+    stmt: Select[Any],
+    *,
+    position: InstrumentedAttribute[datetime],
+    row_id: InstrumentedAttribute[uuid.UUID],
+    cursor: str | None,
+    limit: int,
+    descending: bool = True,
+) -> Select[Any]:
+    """Aplica cursor, ordem `(position, id)` e `LIMIT limit + 1` (o extra indica se há próxima página)."""
+    if cursor:
+        after = tuple_(position, row_id)
+        key = decode_cursor(cursor)
+        stmt = stmt.where(after < key if descending else after > key)
+    if descending:
+        stmt = stmt.order_by(position.desc(), row_id.desc())
+    else:
+        stmt = stmt.order_by(position.asc(), row_id.asc())
+    return stmt.limit(limit + 1)
+
+
+def split_page(rows: Sequence[T], limit: int, *, position: str = "created_at") -> tuple[list[T], str | None]:
+    """Separa a página e o `next` a partir das linhas de `keyset_page`."""
+    if len(rows) <= limit:
+        return list(rows), None
+    page = list(rows[:limit])
+    last = page[-1]
+    return page, encode_cursor(getattr(last, position), last.id)
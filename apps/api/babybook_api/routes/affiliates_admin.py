@@ -15,7 +15,6 @@ from babybook_api.auth.session import UserSession, get_current_user
 from babybook_api.db.models import Affiliate, AffiliatePayout, AffiliateSale, User
 from babybook_api.deps import get_db_session
 from babybook_api.errors import AppError
-from babybook_api.security import hash_password
 from babybook_api.services.affiliates import (
     get_or_create_program_config,
     normalize_commission_rate,
@@ -25,6 +24,7 @@ from babybook_api.services.affiliates import (
     serialize_payout,
     serialize_sale,
 )
+from babybook_api.services.passwords import password_hasher
 
 router = APIRouter()
 
@@ -100,7 +100,7 @@ async def create_affiliate(
     portal_user = User(
         account_id=UUID(user.account_id),
         email=email,
-        password_hash=hash_password(password_plain),
+        password_hash=await password_hasher.hash(password_plain),
         name=payload.name.strip(),
         locale="pt-BR",
         role="affiliate",
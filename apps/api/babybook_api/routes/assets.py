@@ -5,12 +5,13 @@ import uuid
 from fastapi import APIRouter, Depends
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 from babybook_api.auth.service import require_service_auth
 from babybook_api.db.models import Asset, AssetVariant
 from babybook_api.deps import get_db_session
 from babybook_api.errors import AppError
-from babybook_api.schemas.assets import AssetStatusUpdate
+from babybook_api.schemas.assets import AssetStatusBatch, AssetStatusUpdate
 
 router = APIRouter()
 
@@ -24,14 +25,7 @@ async def _get_asset(db: AsyncSession, asset_id: uuid.UUID) -> Asset:
     return asset
 
 
-@router.patch("/assets/{asset_id}", summary="Atualiza status e variantes de um asset")
-async def patch_asset(
-    asset_id: uuid.UUID,
-    payload: AssetStatusUpdate,
-    _: None = Depends(require_service_auth),
-    db: AsyncSession = Depends(get_db_session),
-) -> dict[str, str | None]:
-    asset = await _get_asset(db, asset_id)
+def _apply_status_update(asset: Asset, payload: AssetStatusUpdate) -> None:
     if payload.status is not None:
         asset.status = payload.status
     if payload.duration_ms is not None:
@@ -55,6 +49,48 @@ async def patch_asset(
                     vtype=variant.kind,
                 )
             )
+
+
+@router.patch("/assets:batch", summary="Atualiza status e variantes de vários assets")
+async def patch_assets_batch(
+    payload: AssetStatusBatch,
+    _: None = Depends(require_service_auth),
+    db: AsyncSession = Depends(get_db_session),
+) -> dict[str, list]:
+    """Aplica as atualizações dos workers numa única transação.
+
+    Assets inexistentes (ex.: removidos durante o processamento) não derrubam
+    o lote: voltam em `missing` para o worker tratar individualmente.
+    """
+    asset_ids = {update.asset_id for update in payload.updates}
+    stmt = select(Asset).where(Asset.id.in_(asset_ids))
+    if any(update.variants is not None for update in payload.updates):
+        stmt = stmt.options(selectinload(Asset.variants))
+    assets = {asset.id: asset for asset in (await db.execute(stmt)).scalars()}
+
+    missing: list[str] = []
+    for update in payload.updates:
+        asset = assets.get(update.asset_id)
+        if asset is None:
+            missing.append(str(update.asset_id))
+            continue
+        _apply_status_update(asset, update)
+    await db.commit()
+    return {
+        "updated": [{"id": str(asset.id), "status": asset.status} for asset in assets.values()],
+        "missing": missing,
+    }
+
+
+@router.patch("/assets/{asset_id}", summary="Atualiza status e variantes de um asset")
+async def patch_asset(
+    asset_id: uuid.UUID,
+    payload: AssetStatusUpdate,
+    _: None = Depends(require_service_auth),
+    db: AsyncSession = Depends(get_db_session),
+) -> dict[str, str | None]:
+    asset = await _get_asset(db, asset_id)
+    _apply_status_update(asset, payload)
     await db.flush()
     await db.commit()
     return {"id": str(asset.id), "status": asset.status}
@@ -9,8 +9,7 @@ from fastapi.responses import JSONResponse
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from babybook_api.auth.session import get_current_session, require_csrf_token
-from babybook_api.db.models import Session as SessionModel
+from babybook_api.auth.session import AuthenticatedSession, get_current_session, require_csrf_token
 from babybook_api.db.models import Affiliate
 from babybook_api.deps import get_db_session
 from babybook_api.errors import AppError
@@ -257,10 +256,10 @@ async def oauth_callback(
 async def logout(
     response: Response,
     _: None = Depends(require_csrf_token),
-    session: SessionModel = Depends(get_current_session),
+    session: AuthenticatedSession = Depends(get_current_session),
     db: AsyncSession = Depends(get_db_session),
 ) -> Response:
-    await revoke_session(db, session)
+    await revoke_session(db, session.id)
     await db.commit()
     response.delete_cookie(SESSION_COOKIE_NAME, path="/")
     response.status_code = status.HTTP_204_NO_CONTENT
@@ -275,7 +274,7 @@ async def logout(
 async def logout_all(
     response: Response,
     _: None = Depends(require_csrf_token),
-    session: SessionModel = Depends(get_current_session),
+    session: AuthenticatedSession = Depends(get_current_session),
     db: AsyncSession = Depends(get_db_session),
 ) -> Response:
     await revoke_all_user_sessions(db, session.user_id)
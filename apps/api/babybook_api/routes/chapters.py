@@ -13,6 +13,7 @@ from babybook_api.auth.session import UserSession, get_current_user
 from babybook_api.db.models import Chapter, ChapterMoment, Child, Moment
 from babybook_api.deps import get_db_session
 from babybook_api.errors import AppError
+from babybook_api.pagination import keyset_page, split_page
 from babybook_api.schemas.chapters import (
     ChapterCreate,
     ChapterMomentsPatch,
@@ -109,16 +110,16 @@ async def list_chapters(
     current_user: UserSession = Depends(get_current_user),
     db: AsyncSession = Depends(get_db_session),
     limit: int = Query(25, ge=1, le=100),
+    cursor: str | None = Query(default=None),
 ) -> PaginatedChapters:
     stmt = (
         select(Chapter)
         .where(Chapter.account_id == uuid.UUID(current_user.account_id), Chapter.deleted_at.is_(None))
-        .order_by(Chapter.created_at.desc())
-        .limit(limit)
         .options(selectinload(Chapter.moments))
     )
-    items = [_serialize_chapter(row) for row in (await db.execute(stmt)).scalars().all()]
-    return PaginatedChapters(items=items, next=None)
+    stmt = keyset_page(stmt, position=Chapter.created_at, row_id=Chapter.id, cursor=cursor, limit=limit)
+    rows, next_cursor = split_page((await db.execute(stmt)).scalars().all(), limit)
+    return PaginatedChapters(items=[_serialize_chapter(row) for row in rows], next=next_cursor)
 
 
 @router.post(
@@ -17,6 +17,7 @@ from babybook_api.auth.session import UserSession, get_current_user, require_csr
 from babybook_api.db.models import Asset, Delivery, DeliveryAsset, Partner, Voucher
 from babybook_api.deps import get_db_session
 from babybook_api.errors import AppError
+from babybook_api.pagination import keyset_page, split_page
 from babybook_api.rate_limit import enforce_rate_limit
 from babybook_api.request_ip import get_client_ip
 from babybook_api.schemas.deliveries import (
@@ -94,7 +95,7 @@ async def list_partner_deliveries(
     current_user: UserSession = Depends(get_current_user),
     db: AsyncSession = Depends(get_db_session),
     limit: int = Query(25, ge=1, le=100),
-    offset: int = Query(0, ge=0),
+    cursor: str | None = Query(default=None),
     status_filter: str | None = Query(None, alias="status"),
 ) -> PaginatedDeliveries:
     _require_admin(current_user)
@@ -116,22 +117,13 @@ async def list_partner_deliveries(
     total = total_result.scalar_one()
 
     # Fetch items
-    stmt = (
-        select(Delivery)
-        .where(Delivery.partner_id == partner_uuid)
-        .order_by(Delivery.created_at.desc())
-        .offset(offset)
-        .limit(limit)
-    )
+    stmt = select(Delivery).where(Delivery.partner_id == partner_uuid)
     if status_filter:
         stmt = stmt.where(Delivery.status == status_filter)
+    stmt = keyset_page(stmt, position=Delivery.created_at, row_id=Delivery.id, cursor=cursor, limit=limit)
 
-    result = await db.execute(stmt)
-    items = [_serialize_delivery(d) for d in result.scalars().all()]
-
-    next_cursor = None
-    if offset + limit < total:
-        next_cursor = str(offset + limit)
+    rows, next_cursor = split_page((await db.execute(stmt)).scalars().all(), limit)
+    items = [_serialize_delivery(d) for d in rows]
 
     return PaginatedDeliveries(items=items, total=total, next=next_cursor)
 
@@ -12,6 +12,7 @@ from babybook_api.auth.session import UserSession, get_current_user, require_csr
 from babybook_api.db.models import Asset, Child, GuestbookEntry, GuestbookInvite
 from babybook_api.deps import get_db_session
 from babybook_api.errors import AppError
+from babybook_api.pagination import keyset_page, split_page
 from babybook_api.rate_limit import enforce_rate_limit
 from babybook_api.request_ip import get_client_ip
 from babybook_api.schemas.guestbook import (
@@ -115,6 +116,7 @@ async def list_guestbook(
     db: AsyncSession = Depends(get_db_session),
     child_id: uuid.UUID | None = Query(default=None),
     limit: int = Query(25, ge=1, le=100),
+    cursor: str | None = Query(default=None),
 ) -> PaginatedGuestbook:
     stmt = select(GuestbookEntry).where(
         GuestbookEntry.account_id == uuid.UUID(current_user.account_id),
@@ -122,10 +124,9 @@ async def list_guestbook(
     )
     if child_id:
         stmt = stmt.where(GuestbookEntry.child_id == child_id)
-    stmt = stmt.order_by(GuestbookEntry.created_at.desc()).limit(limit)
-    result = await db.execute(stmt)
-    items = [_serialize_entry(entry) for entry in result.scalars().all()]
-    return PaginatedGuestbook(items=items, next=None)
+    stmt = keyset_page(stmt, position=GuestbookEntry.created_at, row_id=GuestbookEntry.id, cursor=cursor, limit=limit)
+    rows, next_cursor = split_page((await db.execute(stmt)).scalars().all(), limit)
+    return PaginatedGuestbook(items=[_serialize_entry(entry) for entry in rows], next=next_cursor)
 
 
 @router.post(
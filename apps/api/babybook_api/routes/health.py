@@ -1,4 +1,7 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
+
+from babybook_api.auth.service import require_service_auth
+from babybook_api.services.passwords import password_hasher
 
 router = APIRouter()
 
@@ -6,3 +9,9 @@ router = APIRouter()
 @router.get("/", summary="Health check")
 async def health() -> dict[str, str]:
     return {"status": "ok"}
+
+
+@router.get("/password-hashing", summary="Fila do pool de hash de senhas")
+async def password_hashing(_: None = Depends(require_service_auth)) -> dict[str, float | int]:
+    """Só para serviços internos: a fila revela a carga de autenticação."""
+    return password_hasher.stats()
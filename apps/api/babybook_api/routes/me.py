@@ -11,13 +11,14 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from babybook_api.auth.session import (
+    AuthenticatedSession,
     UserSession,
     get_current_session,
     get_current_user,
     require_csrf_token,
     validate_csrf_token_for_session,
 )
-from babybook_api.db.models import Session as SessionModel
+from babybook_api.auth.session_cache import invalidate_sessions
 from babybook_api.db.models import Account, Asset, Child, Delivery, Moment, Partner, PartnerLedger
 from babybook_api.deps import get_db_session
 from babybook_api.errors import AppError
@@ -170,6 +171,7 @@ async def patch_me(
         user.name = sanitize_html(payload.name)
     if payload.locale:
         user.locale = payload.locale
+    await invalidate_sessions(db, user_id=user_id)
     
     await db.commit()
     await db.refresh(user)
@@ -340,7 +342,7 @@ async def import_delivery(
     delivery_id: str,
     body: DeliveryImportRequest,
     current_user: UserSession = Depends(get_current_user),
-    session: SessionModel = Depends(get_current_session),
+    session: AuthenticatedSession = Depends(get_current_session),
     csrf_token: str | None = Header(default=None, alias="X-CSRF-Token"),
     db: AsyncSession = Depends(get_db_session),
     storage: PartnerStorageService = Depends(get_partner_storage),
@@ -15,28 +15,27 @@ from uuid import uuid4
 from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from babybook_api.auth.service import require_service_auth
 from babybook_api.auth.session import UserSession, get_current_user
+from babybook_api.db.models import ProcessingJob
 from babybook_api.deps import get_db
 from babybook_api.schemas.media_processing import (
     BatchProcessingRequest,
     BatchProcessingResponse,
     ImageOptimizeJobRequest,
+    ProcessingJobProgressUpdate,
     ProcessingJobResponse,
     ProcessingJobStatusResponse,
     ProcessingStatus,
     ThumbnailJobRequest,
     TranscodeJobRequest,
 )
+from babybook_api.services import processing_jobs
 from babybook_api.settings import settings
 
 router = APIRouter()
 
 
-# In-memory job store (replace with Redis/DB in production)
-# This is a simplified implementation - production would use a persistent store
-_job_store: dict[str, dict] = {}
-
-
 def _validate_callback_url(callback_url: Optional[str]) -> Optional[str]:
     """Valida callback_url para evitar SSRF.
 
@@ -93,6 +92,7 @@ def generate_job_id() -> str:
 
 
 async def queue_processing_job(
+    db: AsyncSession,
     job_id: str,
     job_type: str,
     asset_id: str,
@@ -103,48 +103,45 @@ async def queue_processing_job(
     user_id: str,
 ) -> int:
     """
-    Queue a processing job to Cloudflare Queues.
-    
-    In production, this would:
-    1. Publish message to Cloudflare Queue
-    2. Store job metadata in database
-    3. Return queue position
-    
-    For now, we store in memory and simulate queue position.
+    Persist a processing job and return its queue position.
+
+    Queue position is an indexed COUNT of pending jobs created up to this one.
     """
-    job_data = {
-        "job_id": job_id,
-        "job_type": job_type,
-        "asset_id": asset_id,
-        "source_key": source_key,
-        "options": options,
-        "priority": priority,
-        "callback_url": callback_url,
-        "user_id": user_id,
-        "status": ProcessingStatus.PENDING,
-        "progress": 0.0,
-        "stage": None,
-        "output_key": None,
-        "output_url": None,
-        "thumbnail_key": None,
-        "thumbnail_url": None,
-        "variants": None,
-        "error_message": None,
-        "processing_time_seconds": None,
-        "created_at": datetime.utcnow(),
-        "started_at": None,
-        "completed_at": None,
-    }
-    
-    _job_store[job_id] = job_data
-    
-    # Simulate queue position based on pending jobs
-    pending_count = sum(
-        1 for j in _job_store.values()
-        if j["status"] == ProcessingStatus.PENDING
+    job = await processing_jobs.create_processing_job(
+        db,
+        job_id=job_id,
+        job_type=job_type,
+        asset_id=asset_id,
+        source_key=source_key,
+        options=options,
+        priority=priority,
+        callback_url=callback_url,
+        user_id=user_id,
+    )
+    position = await processing_jobs.queue_position(db, job)
+    await db.commit()
+    return position
+
+
+def _to_status_response(job: ProcessingJob, queue_position: Optional[int]) -> ProcessingJobStatusResponse:
+    return ProcessingJobStatusResponse(
+        job_id=job.id,
+        asset_id=job.asset_id,
+        status=job.status,
+        progress=job.progress,
+        stage=job.stage,
+        queue_position=queue_position,
+        output_key=job.output_key,
+        output_url=job.output_url,
+        thumbnail_key=job.thumbnail_key,
+        thumbnail_url=job.thumbnail_url,
+        variants=job.variants,
+        error_message=job.error_message,
+        processing_time_seconds=job.processing_time_seconds,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        completed_at=job.completed_at,
     )
-    
-    return pending_count
 
 
 @router.post(
@@ -181,6 +178,7 @@ async def queue_transcode_job(
     }
     
     queue_position = await queue_processing_job(
+        db,
         job_id=job_id,
         job_type="transcode",
         asset_id=request.asset_id,
@@ -231,6 +229,7 @@ async def queue_image_optimize_job(
     }
     
     queue_position = await queue_processing_job(
+        db,
         job_id=job_id,
         job_type="optimize_image",
         asset_id=request.asset_id,
@@ -278,6 +277,7 @@ async def queue_thumbnail_job(
     }
     
     queue_position = await queue_processing_job(
+        db,
         job_id=job_id,
         job_type="thumbnail",
         asset_id=request.asset_id,
@@ -343,6 +343,7 @@ async def queue_batch_processing(
                 job_type = "optimize_image"
             
             queue_position = await queue_processing_job(
+                db,
                 job_id=job_id,
                 job_type=job_type,
                 asset_id=asset_id,
@@ -386,7 +387,7 @@ async def get_job_status(
 ) -> ProcessingJobStatusResponse:
     """Get the status of a processing job."""
     
-    job = _job_store.get(job_id)
+    job = await processing_jobs.get_processing_job(db, job_id)
     
     if not job:
         raise HTTPException(
@@ -395,7 +396,7 @@ async def get_job_status(
         )
     
     # Check ownership
-    if job["user_id"] != str(current_user.id):
+    if str(job.user_id) != str(current_user.id):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not authorized to view this job",
@@ -403,32 +404,42 @@ async def get_job_status(
     
     # Calculate current queue position for pending jobs
     queue_position = None
-    if job["status"] == ProcessingStatus.PENDING:
-        pending_jobs = [
-            j for j in _job_store.values()
-            if j["status"] == ProcessingStatus.PENDING
-            and j["created_at"] <= job["created_at"]
-        ]
-        queue_position = len(pending_jobs)
+    if job.status == ProcessingStatus.PENDING:
+        queue_position = await processing_jobs.queue_position(db, job)
     
-    return ProcessingJobStatusResponse(
-        job_id=job["job_id"],
-        asset_id=job["asset_id"],
-        status=job["status"],
-        progress=job["progress"],
-        stage=job["stage"],
-        queue_position=queue_position,
-        output_key=job["output_key"],
-        output_url=job["output_url"],
-        thumbnail_key=job["thumbnail_key"],
-        thumbnail_url=job["thumbnail_url"],
-        variants=job["variants"],
-        error_message=job["error_message"],
-        processing_time_seconds=job["processing_time_seconds"],
-        created_at=job["created_at"],
-        started_at=job["started_at"],
-        completed_at=job["completed_at"],
+    return _to_status_response(job, queue_position)
+
+
+@router.patch(
+    "/jobs/{job_id}/progress",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Report job progress (workers)",
+    include_in_schema=False,
+)
+async def report_job_progress(
+    job_id: str,
+    update: ProcessingJobProgressUpdate,
+    db: AsyncSession = Depends(get_db),
+    _: None = Depends(require_service_auth),
+) -> None:
+    """Store progress/stage pushed by a worker; read back by get_job_status."""
+
+    job = await processing_jobs.get_processing_job(db, job_id)
+
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job {job_id} not found",
+        )
+
+    processing_jobs.apply_progress(
+        job,
+        status=update.status,
+        progress=update.progress,
+        stage=update.stage,
+        error_message=update.error_message,
     )
+    await db.commit()
 
 
 @router.delete(
@@ -444,7 +455,7 @@ async def cancel_job(
 ) -> None:
     """Cancel a pending processing job."""
     
-    job = _job_store.get(job_id)
+    job = await processing_jobs.get_processing_job(db, job_id)
     
     if not job:
         raise HTTPException(
@@ -452,20 +463,21 @@ async def cancel_job(
             detail=f"Job {job_id} not found",
         )
     
-    if job["user_id"] != str(current_user.id):
+    if str(job.user_id) != str(current_user.id):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not authorized to cancel this job",
         )
     
-    if job["status"] != ProcessingStatus.PENDING:
+    if job.status != ProcessingStatus.PENDING:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Cannot cancel job in {job['status']} status",
+            detail=f"Cannot cancel job in {job.status} status",
         )
     
     # Remove from store
-    del _job_store[job_id]
+    await db.delete(job)
+    await db.commit()
 
 
 @router.get(
@@ -480,40 +492,13 @@ async def list_jobs(
     db: AsyncSession = Depends(get_db),
     current_user: UserSession = Depends(get_current_user),
 ) -> list[ProcessingJobStatusResponse]:
-    """List processing jobs for the current user."""
-    
-    user_jobs = [
-        j for j in _job_store.values()
-        if j["user_id"] == str(current_user.id)
-    ]
+    """List processing jobs for the current user (newest first)."""
     
-    if status_filter:
-        user_jobs = [j for j in user_jobs if j["status"] == status_filter]
-    
-    # Sort by created_at descending
-    user_jobs.sort(key=lambda j: j["created_at"], reverse=True)
-    
-    # Apply limit
-    user_jobs = user_jobs[:limit]
+    user_jobs = await processing_jobs.list_user_jobs(
+        db,
+        str(current_user.id),
+        status=status_filter.value if status_filter else None,
+        limit=limit,
+    )
     
-    return [
-        ProcessingJobStatusResponse(
-            job_id=j["job_id"],
-            asset_id=j["asset_id"],
-            status=j["status"],
-            progress=j["progress"],
-            stage=j["stage"],
-            queue_position=None,
-            output_key=j["output_key"],
-            output_url=j["output_url"],
-            thumbnail_key=j["thumbnail_key"],
-            thumbnail_url=j["thumbnail_url"],
-            variants=j["variants"],
-            error_message=j["error_message"],
-            processing_time_seconds=j["processing_time_seconds"],
-            created_at=j["created_at"],
-            started_at=j["started_at"],
-            completed_at=j["completed_at"],
-        )
-        for j in user_jobs
-    ]
+    return [_to_status_response(j, None) for j in user_jobs]
@@ -12,6 +12,7 @@ from babybook_api.auth.session import UserSession, get_current_user, require_csr
 from babybook_api.db.models import Child, Moment
 from babybook_api.deps import get_db_session
 from babybook_api.errors import AppError
+from babybook_api.pagination import keyset_page, split_page
 from babybook_api.rate_limit import enforce_rate_limit
 from babybook_api.request_ip import get_client_ip
 from babybook_api.schemas.moments import (
@@ -88,6 +89,7 @@ async def list_moments(
     status_filter: str | None = Query(default=None, alias="status"),
     child_id: uuid.UUID | None = Query(default=None),
     limit: int = Query(25, ge=1, le=100),
+    cursor: str | None = Query(default=None),
 ) -> PaginatedMoments:
     stmt = select(Moment).where(
         Moment.account_id == uuid.UUID(current_user.account_id),
@@ -97,10 +99,9 @@ async def list_moments(
         stmt = stmt.where(Moment.status == status_filter)
     if child_id:
         stmt = stmt.where(Moment.child_id == child_id)
-    stmt = stmt.order_by(Moment.created_at.desc()).limit(limit)
-    result = await db.execute(stmt)
-    items = [_moment_to_response(moment) for moment in result.scalars().all()]
-    return PaginatedMoments(items=items, next=None)
+    stmt = keyset_page(stmt, position=Moment.created_at, row_id=Moment.id, cursor=cursor, limit=limit)
+    rows, next_cursor = split_page((await db.execute(stmt)).scalars().all(), limit)
+    return PaginatedMoments(items=[_moment_to_response(moment) for moment in rows], next=next_cursor)
 
 
 @router.post(
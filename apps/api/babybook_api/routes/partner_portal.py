@@ -19,7 +19,7 @@ from typing import Optional
 from uuid import UUID, uuid4
 
 from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
-from sqlalchemy import and_, case, func, or_, select
+from sqlalchemy import and_, case, func, literal_column, or_, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
@@ -68,6 +68,7 @@ from babybook_api.schemas.partner_portal import (
     UploadInitResponse,
     VoucherCardResponse,
 )
+from babybook_api.services.delivery_aggregations import count_deliveries_by_status, delivery_aggregation_cache
 from babybook_api.settings import settings
 from babybook_api.utils.security import sanitize_html
 from babybook_api.storage import (
@@ -78,6 +79,23 @@ from babybook_api.storage import (
 
 router = APIRouter()
 
+# Texto pesquisável da entrega (busca `q`). Constantes inline (não bind params)
+# para casar com o índice trigram `ix_deliveries_search_trgm` (migração 0020);
+# o separador " " impede que um termo case atravessando dois campos.
+_SEARCH_EMPTY = literal_column("''")
+_SEARCH_SEPARATOR = literal_column("' '")
+_DELIVERY_SEARCH_TEXT = func.lower(
+    func.coalesce(Delivery.title, _SEARCH_EMPTY)
+    .op("||")(_SEARCH_SEPARATOR)
+    .op("||")(func.coalesce(Delivery.client_name, _SEARCH_EMPTY))
+    .op("||")(_SEARCH_SEPARATOR)
+    .op("||")(func.coalesce(Delivery.generated_voucher_code, _SEARCH_EMPTY))
+    .op("||")(_SEARCH_SEPARATOR)
+    .op("||")(func.coalesce(Delivery.target_email, _SEARCH_EMPTY))
+    .op("||")(_SEARCH_SEPARATOR)
+    .op("||")(func.coalesce(Delivery.beneficiary_email, _SEARCH_EMPTY))
+)
+
 
 # =============================================================================
 # Helpers
@@ -235,12 +253,12 @@ async def partner_onboarding(
         )
     
     # Cria User com role photographer
-    from babybook_api.services.auth import hash_password
-    
+    from babybook_api.services.passwords import password_hasher
+
     user = User(
         id=uuid4(),
         email=normalized_email,
-        password_hash=hash_password(request.password),
+        password_hash=await password_hasher.hash(request.password),
         name=request.name,
         role="photographer",
     )
@@ -905,6 +923,7 @@ async def create_delivery(
         )
     
     await db.commit()
+    delivery_aggregation_cache.invalidate_partner(partner.id)
     await db.refresh(delivery)
     
     return DeliveryResponse(
@@ -1007,19 +1026,9 @@ async def list_partner_deliveries(
     base_filters: list = [Delivery.partner_id == partner.id]
 
     # --- Busca (server-side, básica e consistente para total/paginação) ---
-    if q and q.strip():
-        tokens = [t for t in q.strip().lower().split() if t]
-        for tok in tokens:
-            like = f"%{tok}%"
-            base_filters.append(
-                or_(
-                    func.lower(func.coalesce(Delivery.title, "")).like(like),
-                    func.lower(func.coalesce(Delivery.client_name, "")).like(like),
-                    func.lower(func.coalesce(Delivery.generated_voucher_code, "")).like(like),
-                    func.lower(func.coalesce(Delivery.target_email, "")).like(like),
-                    func.lower(func.coalesce(Delivery.beneficiary_email, "")).like(like),
-                )
-            )
+    tokens = [t for t in (q or "").strip().lower().split() if t]
+    for tok in tokens:
+        base_filters.append(_DELIVERY_SEARCH_TEXT.like(f"%{tok}%"))
 
     # --- Filtros avançados ---
     if voucher == "with":
@@ -1058,32 +1067,31 @@ async def list_partner_deliveries(
         base_filters.append(Delivery.assets_transferred_at <= redeemed_end)
 
     # --- Agregações (coerentes com o subconjunto filtrado; independentes de status_filter/limit/offset) ---
-    total_all = (
-        (await db.execute(select(func.count(Delivery.id)).where(*base_filters))).scalar()
-        or 0
-    )
-    archived_count = (
-        (
-            await db.execute(
-                select(func.count(Delivery.id)).where(
-                    *base_filters, Delivery.archived_at.is_not(None)
-                )
-            )
-        ).scalar()
-        or 0
+    filters_key = (
+        tuple(tokens),
+        voucher,
+        redeemed,
+        credit,
+        view,
+        created,
+        created_from,
+        created_to,
+        redeemed_period,
+        redeemed_from,
+        redeemed_to,
     )
+    status_counts = delivery_aggregation_cache.get(partner.id, filters_key)
+    if status_counts is None:
+        status_counts = await count_deliveries_by_status(db, base_filters)
+        delivery_aggregation_cache.put(partner.id, filters_key, status_counts)
 
-    by_status_rows = (
-        await db.execute(
-            select(Delivery.status, func.count(Delivery.id))
-            .where(*base_filters, Delivery.archived_at.is_(None))
-            .group_by(Delivery.status)
-        )
-    ).all()
+    total_all = sum(row.total for row in status_counts)
+    archived_count = sum(row.archived for row in status_counts)
     by_status: dict[str, int] = {}
-    for raw_status, count in by_status_rows:
-        normalized = _normalize_partner_delivery_status(raw_status)
-        by_status[normalized] = by_status.get(normalized, 0) + int(count or 0)
+    for row in status_counts:
+        if row.active:
+            normalized = _normalize_partner_delivery_status(row.status)
+            by_status[normalized] = by_status.get(normalized, 0) + row.active
 
     # --- Listagem (respeita include_archived + status_filter + paginação/ordenação) ---
     list_filters = list(base_filters)
@@ -1102,7 +1110,8 @@ async def list_partner_deliveries(
         else:
             list_filters.append(Delivery.status == status_filter)
 
-    query = select(Delivery).where(*list_filters)
+    # Total filtrado na mesma leitura da página (janela sobre o resultado antes do LIMIT).
+    query = select(Delivery, func.count().over().label("total")).where(*list_filters)
 
     if sort == "oldest":
         query = query.order_by(Delivery.created_at.asc())
@@ -1127,14 +1136,15 @@ async def list_partner_deliveries(
 
     query = query.offset(safe_offset).limit(safe_limit)
 
-    result = await db.execute(query)
-    deliveries = result.scalars().all()
-    
-    # Conta total (respeitando filtros + include_archived + status_filter)
-    total = (
-        (await db.execute(select(func.count(Delivery.id)).where(*list_filters))).scalar()
-        or 0
-    )
+    rows = (await db.execute(query)).all()
+    deliveries = [row.Delivery for row in rows]
+    if rows:
+        total = rows[0].total
+    elif safe_offset:
+        # Página além do fim: sem linhas não há janela, então contamos à parte.
+        total = (await db.execute(select(func.count(Delivery.id)).where(*list_filters))).scalar() or 0
+    else:
+        total = 0
     
     return DeliveryListResponse(
         deliveries=[
@@ -1264,6 +1274,7 @@ async def update_delivery(
         delivery.event_date = body.event_date
 
     await db.commit()
+    delivery_aggregation_cache.invalidate_partner(partner.id)
     await db.refresh(delivery)
 
     return DeliveryResponse(
@@ -1346,6 +1357,7 @@ async def delete_delivery(
 
     await db.delete(delivery)
     await db.commit()
+    delivery_aggregation_cache.invalidate_partner(partner.id)
 
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
@@ -1392,6 +1404,7 @@ async def archive_delivery(
         delivery.archived_at = None
     
     await db.commit()
+    delivery_aggregation_cache.invalidate_partner(partner.id)
     
     return {
         "success": True,
@@ -1475,6 +1488,7 @@ async def init_upload(
     delivery.assets_payload = assets_payload
     
     await db.commit()
+    delivery_aggregation_cache.invalidate_partner(partner.id)
     
     return UploadInitResponse(
         upload_id=upload_info.upload_id,
@@ -1577,6 +1591,7 @@ async def complete_upload(
     delivery.assets_payload = assets_payload
     
     await db.commit()
+    delivery_aggregation_cache.invalidate_partner(partner.id)
     
     return {
         "success": True,
@@ -1639,6 +1654,7 @@ async def finalize_delivery(
         delivery.status = "ready"
         delivery.beneficiary_name = request.beneficiary_name
         await db.commit()
+        delivery_aggregation_cache.invalidate_partner(partner.id)
 
         import_url = f"{settings.frontend_url}/jornada/importar-entrega/{delivery.id}"
         if delivery.target_child_id is not None:
@@ -1681,6 +1697,7 @@ async def finalize_delivery(
     delivery.beneficiary_name = request.beneficiary_name
 
     await db.commit()
+    delivery_aggregation_cache.invalidate_partner(partner.id)
 
     # Retorna dados para gerar o cartão no frontend
     redeem_url = f"{settings.frontend_url}/resgatar?code={voucher_code}"
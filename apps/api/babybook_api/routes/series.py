@@ -10,6 +10,7 @@ from babybook_api.auth.session import UserSession, get_current_user
 from babybook_api.db.models import Series, SeriesOccurrence
 from babybook_api.deps import get_db_session
 from babybook_api.errors import AppError
+from babybook_api.pagination import keyset_page, split_page
 from babybook_api.schemas.series import (
     PaginatedOccurrences,
     PaginatedSeries,
@@ -64,15 +65,15 @@ async def list_series(
     current_user: UserSession = Depends(get_current_user),
     db: AsyncSession = Depends(get_db_session),
     limit: int = Query(25, ge=1, le=100),
+    cursor: str | None = Query(default=None),
 ) -> PaginatedSeries:
-    stmt = (
-        select(Series)
-        .where(Series.account_id == uuid.UUID(current_user.account_id), Series.deleted_at.is_(None))
-        .order_by(Series.created_at.desc())
-        .limit(limit)
+    stmt = select(Series).where(
+        Series.account_id == uuid.UUID(current_user.account_id),
+        Series.deleted_at.is_(None),
     )
-    items = [_serialize_series(row) for row in (await db.execute(stmt)).scalars().all()]
-    return PaginatedSeries(items=items, next=None)
+    stmt = keyset_page(stmt, position=Series.created_at, row_id=Series.id, cursor=cursor, limit=limit)
+    rows, next_cursor = split_page((await db.execute(stmt)).scalars().all(), limit)
+    return PaginatedSeries(items=[_serialize_series(row) for row in rows], next=next_cursor)
 
 
 @router.post(
@@ -109,13 +110,17 @@ async def list_occurrences(
     current_user: UserSession = Depends(get_current_user),
     db: AsyncSession = Depends(get_db_session),
     limit: int = Query(50, ge=1, le=200),
+    cursor: str | None = Query(default=None),
 ) -> PaginatedOccurrences:
     series = await _get_series(db, uuid.UUID(current_user.account_id), series_id)
-    stmt = (
-        select(SeriesOccurrence)
-        .where(SeriesOccurrence.series_id == series.id)
-        .order_by(SeriesOccurrence.scheduled_at.asc())
-        .limit(limit)
+    # Ocorrências seguem a agenda (mais próximas primeiro), não a criação.
+    stmt = keyset_page(
+        select(SeriesOccurrence).where(SeriesOccurrence.series_id == series.id),
+        position=SeriesOccurrence.scheduled_at,
+        row_id=SeriesOccurrence.id,
+        cursor=cursor,
+        limit=limit,
+        descending=False,
     )
-    rows = (await db.execute(stmt)).scalars().all()
-    return PaginatedOccurrences(items=[_serialize_occurrence(row) for row in rows], next=None)
+    rows, next_cursor = split_page((await db.execute(stmt)).scalars().all(), limit, position="scheduled_at")
+    return PaginatedOccurrences(items=[_serialize_occurrence(row) for row in rows], next=next_cursor)
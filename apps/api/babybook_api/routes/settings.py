@@ -8,17 +8,22 @@ from __future__ import annotations
 
 import uuid
 from datetime import datetime
+from pathlib import PurePosixPath
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from pydantic import BaseModel, EmailStr, Field
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from babybook_api.auth.session import UserSession, get_current_user, require_csrf_token
-from babybook_api.db.models import Account, Asset, Child, Moment, User
+from babybook_api.auth.session_cache import invalidate_sessions
+from babybook_api.db.models import Account, Asset, Child, DataExport, Moment, User
 from babybook_api.deps import get_db_session
 from babybook_api.errors import AppError
+from babybook_api.observability import get_trace_id
 from babybook_api.rate_limit import enforce_rate_limit
+from babybook_api.services.passwords import password_hasher
+from babybook_api.services.queue import QueuePublisher, get_queue_publisher
 
 router = APIRouter()
 
@@ -78,6 +83,18 @@ class DataExportResponse(BaseModel):
     message: str = "Sua solicitação foi recebida. Você receberá um email quando estiver pronta."
 
 
+class DataExportStatusResponse(BaseModel):
+    request_id: str
+    status: str
+    item_count: int = 0
+    items_done: int = 0
+    progress: float = 0.0
+    bytes_written: int = 0
+    error_message: str | None = None
+    created_at: datetime | None = None
+    completed_at: datetime | None = None
+
+
 class DeleteAccountRequest(BaseModel):
     confirmation: str = Field(..., description="Deve ser exatamente 'EXCLUIR MINHA CONTA'")
     password: str = Field(..., min_length=1)
@@ -202,6 +219,7 @@ async def remove_family_member(
         raise AppError(status_code=400, code="family.cannot_remove_owner", message="Não é possível remover o dono da conta.")
 
     await db.delete(member)
+    await invalidate_sessions(db, user_id=member.id)
     await db.commit()
 
     return {"success": True, "message": "Membro removido com sucesso."}
@@ -342,24 +360,98 @@ async def get_storage_stats(
 @router.post("/data/export", response_model=DataExportResponse, summary="Solicita exportação de dados")
 async def request_data_export(
     body: DataExportRequest,
+    request: Request,
     current_user: UserSession = Depends(get_current_user),
     db: AsyncSession = Depends(get_db_session),
+    queue: QueuePublisher = Depends(get_queue_publisher),
     _: None = Depends(require_csrf_token),
 ) -> DataExportResponse:
-    """Solicita exportação de todos os dados do usuário (GDPR/LGPD)."""
+    """Solicita exportação de todos os dados do usuário (GDPR/LGPD).
+
+    Enfileira um `export.zip` com os originais da conta; o progresso fica em
+    `GET /me/settings/data/export/{request_id}`.
+    """
     await enforce_rate_limit(bucket="data:export:user", limit="1/day", identity=current_user.id)
 
-    # TODO: Criar job em background para gerar o arquivo de exportação
-    # Por enquanto, apenas registra a solicitação
-    request_id = str(uuid.uuid4())
+    account_id = uuid.UUID(current_user.account_id)
+    stmt = (
+        select(Asset.id, Asset.kind, Asset.key_original)
+        .where(
+            Asset.account_id == account_id,
+            Asset.status == "ready",
+            Asset.key_original.is_not(None),
+        )
+        .order_by(Asset.created_at, Asset.id)
+    )
+    items = [
+        {"key": key, "filename": f"{kind}s/{asset_id}{PurePosixPath(key).suffix}", "scope": "uploads"}
+        for asset_id, kind, key in (await db.execute(stmt)).all()
+    ]
+    if not items:
+        raise AppError(
+            status_code=409,
+            code="data_export.empty",
+            message="Não há arquivos para exportar nesta conta.",
+        )
+
+    export = DataExport(
+        account_id=account_id,
+        user_id=uuid.UUID(current_user.id),
+        status="queued",
+        item_count=len(items),
+    )
+    db.add(export)
+    await db.flush()
+    await queue.publish(
+        kind="export.zip",
+        payload={
+            "export_id": str(export.id),
+            "account_id": str(account_id),
+            "items": items,
+        },
+        metadata={
+            "user_id": current_user.id,
+            "trace_id": get_trace_id(request),
+        },
+    )
+    await db.commit()
 
     return DataExportResponse(
-        request_id=request_id,
+        request_id=str(export.id),
         status="queued",
         message="Sua solicitação foi recebida. Você receberá um email quando o download estiver pronto.",
     )
 
 
+@router.get(
+    "/data/export/{request_id}",
+    response_model=DataExportStatusResponse,
+    summary="Progresso da exportação de dados",
+)
+async def get_data_export(
+    request_id: uuid.UUID,
+    current_user: UserSession = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db_session),
+) -> DataExportStatusResponse:
+    export = await db.get(DataExport, request_id)
+    if export is None or export.account_id != uuid.UUID(current_user.account_id):
+        raise AppError(status_code=404, code="data_export.not_found", message="Exportação não encontrada.")
+    progress = 100.0 if export.status == "completed" else 0.0
+    if export.item_count and export.status != "completed":
+        progress = round(100.0 * export.items_done / export.item_count, 1)
+    return DataExportStatusResponse(
+        request_id=str(export.id),
+        status=export.status,
+        item_count=export.item_count,
+        items_done=export.items_done,
+        progress=progress,
+        bytes_written=export.bytes_written,
+        error_message=export.error_message,
+        created_at=export.created_at,
+        completed_at=export.completed_at,
+    )
+
+
 # =============================================================================
 # Delete Account
 # =============================================================================
@@ -382,9 +474,6 @@ async def request_account_deletion(
             message="Confirmação inválida. Digite exatamente 'EXCLUIR MINHA CONTA'.",
         )
 
-    # Verifica senha
-    from babybook_api.auth.password import verify_password
-
     user_id = uuid.UUID(current_user.id)
     stmt = select(User).where(User.id == user_id)
     user = (await db.execute(stmt)).scalar_one_or_none()
@@ -392,7 +481,7 @@ async def request_account_deletion(
     if user is None:
         raise AppError(status_code=404, code="user.not_found", message="Usuário não encontrado.")
 
-    if not verify_password(body.password, user.password_hash):
+    if not await password_hasher.verify(body.password, user.password_hash):
         raise AppError(status_code=401, code="delete.password_invalid", message="Senha incorreta.")
 
     # TODO: Criar job em background para excluir dados
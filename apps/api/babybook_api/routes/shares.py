@@ -15,7 +15,7 @@ from babybook_api.deps import get_db_session
 from babybook_api.errors import AppError
 from babybook_api.schemas.guestbook import GuestbookCreate, GuestbookEntryResponse
 from babybook_api.schemas.shares import ShareCreate, ShareCreatedResponse
-from babybook_api.security import hash_password
+from babybook_api.services.passwords import password_hasher
 from babybook_api.settings import settings
 
 router = APIRouter()
@@ -96,7 +96,7 @@ async def share_moment(
     share = result_share.scalar_one_or_none()
     token = secrets.token_urlsafe(16)
 
-    password_hash = hash_password(payload.password) if payload.password else None
+    password_hash = await password_hasher.hash(payload.password) if payload.password else None
     if share:
         share.token = token
         share.password_hash = password_hash
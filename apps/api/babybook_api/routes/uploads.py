@@ -313,6 +313,7 @@ async def complete_upload(
             "kind": asset.kind,
             "mime": asset.mime,
             "scope": asset.scope,
+            "sha256": asset.sha256,
         },
         metadata={
             "upload_id": str(session.id),
@@ -10,6 +10,7 @@ from babybook_api.auth.session import UserSession, get_current_user
 from babybook_api.db.models import Asset, Child, VaultDocument
 from babybook_api.deps import get_db_session
 from babybook_api.errors import AppError
+from babybook_api.pagination import keyset_page, split_page
 from babybook_api.schemas.vault import (
     PaginatedVaultDocuments,
     VaultDocumentCreate,
@@ -59,13 +60,14 @@ async def list_vault_documents(
     current_user: UserSession = Depends(get_current_user),
     db: AsyncSession = Depends(get_db_session),
     limit: int = Query(50, ge=1, le=200),
+    cursor: str | None = Query(default=None),
 ) -> PaginatedVaultDocuments:
     stmt = select(VaultDocument).where(VaultDocument.account_id == uuid.UUID(current_user.account_id))
     if child_id:
         stmt = stmt.where(VaultDocument.child_id == child_id)
-    stmt = stmt.order_by(VaultDocument.created_at.desc()).limit(limit)
-    docs = (await db.execute(stmt)).scalars().all()
-    return PaginatedVaultDocuments(items=[_serialize_document(doc) for doc in docs], next=None)
+    stmt = keyset_page(stmt, position=VaultDocument.created_at, row_id=VaultDocument.id, cursor=cursor, limit=limit)
+    docs, next_cursor = split_page((await db.execute(stmt)).scalars().all(), limit)
+    return PaginatedVaultDocuments(items=[_serialize_document(doc) for doc in docs], next=next_cursor)
 
 
 @router.post(
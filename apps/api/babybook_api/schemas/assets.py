@@ -62,3 +62,12 @@ class AssetStatusUpdate(BaseModel):
     viewer_accessible: bool | None = None
     variants: list[AssetVariantInput] | None = None
     key_original: str | None = Field(default=None, max_length=255)
+
+
+class AssetStatusBatchItem(AssetStatusUpdate):
+    asset_id: UUID
+
+
+class AssetStatusBatch(BaseModel):
+    # Aplicadas em ordem: duas atualizações do mesmo asset valem como dois PATCHs.
+    updates: list[AssetStatusBatchItem] = Field(..., min_length=1, max_length=500)
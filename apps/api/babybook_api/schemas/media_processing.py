@@ -242,6 +242,17 @@ class ProcessingJobStatusResponse(BaseModel):
     completed_at: Optional[datetime] = None
 
 
+class ProcessingJobProgressUpdate(BaseModel):
+    """Progress pushed by workers while a job runs (service token only)."""
+
+    model_config = ConfigDict(use_enum_values=True)
+
+    status: Optional[ProcessingStatus] = None
+    progress: Optional[float] = Field(default=None, ge=0, le=100)
+    stage: Optional[str] = Field(default=None, max_length=40)
+    error_message: Optional[str] = Field(default=None, max_length=500)
+
+
 class BatchProcessingResponse(BaseModel):
     """Response for batch processing request."""
 
@@ -9,9 +9,18 @@ from passlib.context import CryptContext
 from babybook_api.errors import AppError
 from babybook_api.settings import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-
+# min = max = default: um hash com custo diferente é marcado para rehash no login.
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.password_bcrypt_rounds,
+    bcrypt__min_rounds=settings.password_bcrypt_rounds,
+    bcrypt__max_rounds=settings.password_bcrypt_rounds,
+)
+
+
+# Versões síncronas para scripts/seeds; rotas async usam
+# `babybook_api.services.passwords.password_hasher` (fora do event loop).
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
 
@@ -20,6 +29,29 @@ def verify_password(password: str, password_hash: str) -> bool:
     return pwd_context.verify(password, password_hash)
 
 
+def security_headers(*, hsts: bool) -> dict[str, str]:
+    """Cabeçalhos de segurança fixos, aplicados a toda resposta HTTP da API."""
+    headers = {
+        "X-Frame-Options": "DENY",
+        "X-Content-Type-Options": "nosniff",
+        "X-XSS-Protection": "1; mode=block",
+        "Referrer-Policy": "strict-origin-when-cross-origin",
+        # Para uma API purista, default-src 'none' seria o ideal.
+        # Como servimos Swagger e OAuth Mocks em dev, usamos 'self' para scripts/styles.
+        "Content-Security-Policy": (
+            "default-src 'self'; "
+            "img-src 'self' data: https:; "
+            "font-src 'self' https:; "
+            "frame-ancestors 'none'; "
+            "base-uri 'none'; "
+            "form-action 'self';"
+        ),
+    }
+    if hsts:
+        headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
+    return headers
+
+
 def _csrf_serializer() -> URLSafeTimedSerializer:
     return URLSafeTimedSerializer(settings.secret_key, salt="csrf-token")
 
@@ -7,14 +7,11 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from babybook_api.auth.constants import SESSION_COOKIE_NAME
+from babybook_api.auth.session_cache import invalidate_sessions
 from babybook_api.db.models import Session, User
 from babybook_api.errors import AppError
-from babybook_api.security import (
-    hash_password,
-    new_session_token,
-    validate_csrf_token,
-    verify_password,
-)
+from babybook_api.security import new_session_token, validate_csrf_token
+from babybook_api.services.passwords import password_hasher
 from babybook_api.settings import settings
 from babybook_api.time import utcnow
 
@@ -25,7 +22,7 @@ async def authenticate_user(db: AsyncSession, email: str, password: str) -> User
 
     if not user:
         # Prevent timing attacks by hashing a dummy password if user not found
-        verify_password(password, "dummy_hash")
+        await password_hasher.verify_dummy(password)
         raise AppError(status_code=401, code="auth.credentials.invalid", message="Credenciais invalidas.")
 
     # Check if account is locked
@@ -37,7 +34,8 @@ async def authenticate_user(db: AsyncSession, email: str, password: str) -> User
             message=f"Conta bloqueada temporariamente devido a multiplas tentativas falhas. Tente novamente em {lock_remaining + 1} minutos.",
         )
 
-    if not verify_password(password, user.password_hash):
+    verified, new_hash = await password_hasher.verify_and_update(password, user.password_hash)
+    if not verified:
         user.failed_login_attempts += 1
         if user.failed_login_attempts >= 5:
             user.locked_until = utcnow() + timedelta(minutes=15)
@@ -50,6 +48,9 @@ async def authenticate_user(db: AsyncSession, email: str, password: str) -> User
     user.failed_login_attempts = 0
     user.locked_until = None
     user.last_login_at = utcnow()
+    if new_hash is not None:
+        # Custo do bcrypt mudou (PASSWORD_BCRYPT_ROUNDS): regrava com a senha em mãos.
+        user.password_hash = new_hash
     
     # Audit log (foundation for the plan's audit trail)
     print(f"[audit] login_success user_id={user.id} email={user.email} timestamp={utcnow()}")
@@ -91,8 +92,11 @@ async def create_session(
     return session
 
 
-async def revoke_session(db: AsyncSession, session: Session) -> None:
-    session.revoked_at = utcnow()
+async def revoke_session(db: AsyncSession, session_id: uuid.UUID) -> None:
+    from sqlalchemy import update
+
+    await db.execute(update(Session).where(Session.id == session_id).values(revoked_at=utcnow()))
+    await invalidate_sessions(db, session_id=session_id)
     await db.flush()
 
 
@@ -116,6 +120,8 @@ async def revoke_all_user_sessions(
         stmt = stmt.where(Session.id != current_session_id)
 
     await db.execute(stmt)
+    # Invalida o usuário inteiro: a sessão mantida só é recarregada do banco.
+    await invalidate_sessions(db, user_id=user_id)
     await db.flush()
 
 
@@ -165,7 +171,7 @@ async def bootstrap_dev_user(db: AsyncSession, email: str, password: str, accoun
     user = User(
         account_id=account.id,
         email=email.lower(),
-        password_hash=hash_password(password),
+        password_hash=await password_hasher.hash(password),
         name=account_name,
         locale="pt-BR",
         role="owner",
@@ -201,7 +207,7 @@ async def create_user(db: AsyncSession, email: str, password: str, name: str) ->
     user = User(
         account_id=account.id,
         email=email.lower(),
-        password_hash=hash_password(password),
+        password_hash=await password_hasher.hash(password),
         name=name or (email.split("@")[0]),
         locale="pt-BR",
         role="owner",
@@ -228,7 +234,7 @@ async def get_or_create_user_by_email(db: AsyncSession, email: str, name: str |
     user = User(
         account_id=account.id,
         email=email.lower(),
-        password_hash=hash_password(""),
+        password_hash=await password_hasher.hash(""),
         name=name or (email.split("@")[0]),
         locale="pt-BR",
         role="owner",
@@ -274,7 +280,7 @@ async def bootstrap_dev_partner(
         user = User(
             account_id=account.id,
             email=email.lower(),
-            password_hash=hash_password(password),
+            password_hash=await password_hasher.hash(password),
             name=name,
             locale="pt-BR",
             role="photographer",
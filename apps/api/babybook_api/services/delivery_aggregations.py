@@ -0,0 +1,102 @@
+"""Agregações da listagem de entregas do portal do parceiro.
+
+A home do portal mostra, para o subconjunto filtrado, o total, as arquivadas
+e a contagem por status. Antes eram três COUNTs separados, cada um repetindo
+a busca LIKE. Agora um único `GROUP BY status` com `COUNT(...) FILTER` traz
+tudo numa leitura.
+
+O resultado fica em cache por parceiro + conjunto de filtros durante
+`PARTNER_DELIVERY_AGGREGATIONS_TTL_SECONDS`. Mutações feitas pelo próprio
+portal invalidam o parceiro na hora. Mudanças vindas de outros fluxos (resgate
+do voucher, outras réplicas) aparecem em até um TTL. A página em si nunca
+vem do cache.
+"""
+
+from __future__ import annotations
+
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Sequence
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from babybook_api.db.models import Delivery
+from babybook_api.settings import settings
+
+
+@dataclass(frozen=True, slots=True)
+class DeliveryStatusCount:
+    status: str
+    total: int
+    archived: int
+
+    @property
+    def active(self) -> int:
+        return self.total - self.archived
+
+
+async def count_deliveries_by_status(db: AsyncSession, filters: Sequence[Any]) -> list[DeliveryStatusCount]:
+    stmt = (
+        select(
+            Delivery.status,
+            func.count(Delivery.id),
+            func.count(Delivery.id).filter(Delivery.archived_at.is_not(None)),
+        )
+        .where(*filters)
+        .group_by(Delivery.status)
+    )
+    return [
+        DeliveryStatusCount(status=raw_status, total=int(total or 0), archived=int(archived or 0))
+        for raw_status, total, archived in (await db.execute(stmt)).all()
+    ]
+
+
+class DeliveryAggregationCache:
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float,
+        max_entries: int = 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict[tuple[uuid.UUID, Hashable], tuple[float, list[DeliveryStatusCount]]] = OrderedDict()
+
+    def get(self, partner_id: uuid.UUID, filters_key: Hashable) -> list[DeliveryStatusCount] | None:
+        if self.ttl_seconds <= 0:
+            return None
+        key = (partner_id, filters_key)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, counts = entry
+        if self._clock() - stored_at >= self.ttl_seconds:
+            del self._entries[key]
+            return None
+        return counts
+
+    def put(self, partner_id: uuid.UUID, filters_key: Hashable, counts: list[DeliveryStatusCount]) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        key = (partner_id, filters_key)
+        self._entries[key] = (self._clock(), counts)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate_partner(self, partner_id: uuid.UUID) -> None:
+        for key in [key for key in self._entries if key[0] == partner_id]:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+delivery_aggregation_cache = DeliveryAggregationCache(
+    ttl_seconds=settings.partner_delivery_aggregations_ttl_seconds,
+)
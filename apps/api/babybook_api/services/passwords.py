@@ -0,0 +1,136 @@
+"""Hash e verificação de senhas fora do event loop.
+
+bcrypt custa ~100-250ms de CPU por chamada; chamado direto nas rotas async,
+travava o loop do processo inteiro durante rajadas de login. Aqui as
+chamadas rodam num pool de threads dedicado (o bcrypt libera o GIL) com
+`PASSWORD_HASH_WORKERS` threads: o excedente espera na fila do pool sem
+ocupar o loop, e as outras rotas seguem atendendo.
+
+O tempo de fila (submissão → início do bcrypt) é medido; esperas acima de
+`PASSWORD_HASH_SLOW_QUEUE_MS` geram warning e o resumo fica em
+`GET /health/password-hashing` (exige `X-Service-Token`).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import secrets
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from passlib.context import CryptContext
+
+from babybook_api.security import pwd_context
+from babybook_api.settings import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Amostras recentes para o p95 do tempo de fila.
+_RECENT_WAITS = 512
+
+
+class PasswordHasher:
+    def __init__(self, context: CryptContext, *, workers: int, slow_queue_ms: float) -> None:
+        self._context = context
+        self._workers = max(1, workers)
+        self._slow_queue_ms = slow_queue_ms
+        self._pool: ThreadPoolExecutor | None = None
+        self._dummy_hash: str | None = None
+        self._calls = 0
+        self._in_flight = 0
+        self._wait_total_ms = 0.0
+        self._wait_max_ms = 0.0
+        self._recent_waits: deque[float] = deque(maxlen=_RECENT_WAITS)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self._context.hash, password)
+
+    async def verify(self, password: str, password_hash: str) -> bool:
+        return await self._run(self._verify, password, password_hash)
+
+    async def verify_and_update(self, password: str, password_hash: str) -> tuple[bool, str | None]:
+        """Verifica e, se o hash usa parâmetros antigos, devolve um novo hash para gravar."""
+        return await self._run(self._verify_and_update, password, password_hash)
+
+    async def verify_dummy(self, password: str) -> None:
+        """Gasta o mesmo tempo de um login real (e-mail inexistente), contra um hash válido."""
+        if self._dummy_hash is None:
+            self._dummy_hash = await self.hash(secrets.token_urlsafe(16))
+        await self.verify(password, self._dummy_hash)
+
+    def stats(self) -> dict[str, Any]:
+        waits = sorted(self._recent_waits)
+        p95 = waits[min(len(waits) - 1, int(len(waits) * 0.95))] if waits else 0.0
+        return {
+            "workers": self._workers,
+            "calls": self._calls,
+            "in_flight": self._in_flight,
+            "queued": max(0, self._in_flight - self._workers),
+            "queue_wait_ms_avg": round(self._wait_total_ms / self._calls, 1) if self._calls else 0.0,
+            "queue_wait_ms_p95": round(p95, 1),
+            "queue_wait_ms_max": round(self._wait_max_ms, 1),
+        }
+
+    def shutdown(self) -> None:
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _executor(self) -> ThreadPoolExecutor:
+        # Recriado sob demanda: o shutdown do app não impede um novo ciclo (ex.: testes).
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="password-hash")
+        return self._pool
+
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        submitted = time.perf_counter()
+
+        def _timed() -> tuple[T, float]:
+            waited_ms = (time.perf_counter() - submitted) * 1000
+            return func(*args), waited_ms
+
+        self._in_flight += 1
+        try:
+            result, waited_ms = await asyncio.get_running_loop().run_in_executor(self._executor(), _timed)
+        finally:
+            self._in_flight -= 1
+        self._record_wait(waited_ms)
+        return result
+
+    def _record_wait(self, waited_ms: float) -> None:
+        self._calls += 1
+        self._wait_total_ms += waited_ms
+        self._wait_max_ms = max(self._wait_max_ms, waited_ms)
+        self._recent_waits.append(waited_ms)
+        if waited_ms >= self._slow_queue_ms:
+            logger.warning(
+                "Hash de senha esperou %.0fms na fila (%s em andamento, %s threads)",
+                waited_ms,
+                self._in_flight,
+                self._workers,
+            )
+
+    def _verify(self, password: str, password_hash: str) -> bool:
+        try:
+            return self._context.verify(password, password_hash)
+        except ValueError:
+            # Hash em formato desconhecido (ex.: conta sem senha local) nunca confere.
+            return False
+
+    def _verify_and_update(self, password: str, password_hash: str) -> tuple[bool, str | None]:
+        try:
+            return self._context.verify_and_update(password, password_hash)
+        except ValueError:
+            return False, None
+
+
+password_hasher = PasswordHasher(
+    pwd_context,
+    workers=settings.password_hash_workers,
+    slow_queue_ms=settings.password_hash_slow_queue_ms,
+)
@@ -0,0 +1,164 @@
+"""Persistência dos jobs de processamento server-side (`/media/processing`).
+
+Substitui o dict em memória por linhas em `processing_jobs`, compartilhadas
+entre réplicas e preservadas em restarts. Todas as consultas quentes usam os
+índices da tabela: listagem por (user_id, status, created_at) e posição na
+fila via COUNT em (status, created_at).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from babybook_api.db.models import ProcessingJob
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+PROCESSING = "processing"
+FINISHED_STATUSES = ("completed", "failed")
+
+
+async def create_processing_job(
+    db: AsyncSession,
+    *,
+    job_id: str,
+    job_type: str,
+    asset_id: str,
+    source_key: str,
+    options: dict[str, Any],
+    priority: int,
+    callback_url: str | None,
+    user_id: str,
+) -> ProcessingJob:
+    job = ProcessingJob(
+        id=job_id,
+        user_id=uuid.UUID(user_id),
+        job_type=job_type,
+        asset_id=asset_id,
+        source_key=source_key,
+        options=options,
+        priority=priority,
+        callback_url=callback_url,
+        status=PENDING,
+        progress=0.0,
+    )
+    db.add(job)
+    await db.flush()
+    return job
+
+
+async def get_processing_job(db: AsyncSession, job_id: str) -> ProcessingJob | None:
+    return await db.get(ProcessingJob, job_id)
+
+
+async def queue_position(db: AsyncSession, job: ProcessingJob) -> int:
+    """Pendentes criados até `job` (inclusive); usa ix_processing_jobs_status_created."""
+    stmt = select(func.count()).select_from(ProcessingJob).where(
+        ProcessingJob.status == PENDING,
+        ProcessingJob.created_at <= job.created_at,
+    )
+    return int((await db.execute(stmt)).scalar_one())
+
+
+async def list_user_jobs(
+    db: AsyncSession,
+    user_id: str,
+    *,
+    status: str | None = None,
+    limit: int = 50,
+) -> list[ProcessingJob]:
+    stmt = select(ProcessingJob).where(ProcessingJob.user_id == uuid.UUID(user_id))
+    if status is not None:
+        stmt = stmt.where(ProcessingJob.status == status)
+    stmt = stmt.order_by(ProcessingJob.created_at.desc()).limit(limit)
+    return list((await db.execute(stmt)).scalars().all())
+
+
+def apply_progress(
+    job: ProcessingJob,
+    *,
+    status: str | None = None,
+    progress: float | None = None,
+    stage: str | None = None,
+    error_message: str | None = None,
+) -> None:
+    """Aplica um update de progresso vindo do worker."""
+    now = datetime.utcnow()
+    if status is not None:
+        if status == PROCESSING and job.status != PROCESSING:
+            # Primeiro report, ou retry da fila após uma tentativa com falha.
+            job.started_at = now
+            job.progress = 0.0
+            job.error_message = None
+        job.status = status
+        if status in FINISHED_STATUSES:
+            job.completed_at = now
+            if job.started_at is not None:
+                job.processing_time_seconds = (now - _naive(job.started_at)).total_seconds()
+    if progress is not None:
+        # Updates podem chegar fora de ordem; o progresso nunca regride.
+        job.progress = max(job.progress or 0.0, progress)
+    if stage is not None:
+        job.stage = stage
+    if error_message is not None:
+        job.error_message = error_message
+
+
+def _naive(value: datetime) -> datetime:
+    # Postgres devolve timestamptz com tzinfo; SQLite devolve naive.
+    return value.replace(tzinfo=None) if value.tzinfo is not None else value
+
+
+async def prune_finished_jobs(
+    db: AsyncSession,
+    *,
+    retention: timedelta,
+    batch_size: int = 500,
+) -> int:
+    """Remove jobs finalizados há mais que `retention`, em lotes pequenos."""
+    cutoff = datetime.utcnow() - retention
+    removed = 0
+    while True:
+        ids = (
+            await db.execute(
+                select(ProcessingJob.id)
+                .where(
+                    ProcessingJob.completed_at < cutoff,
+                    ProcessingJob.status.in_(FINISHED_STATUSES),
+                )
+                .limit(batch_size)
+            )
+        ).scalars().all()
+        if not ids:
+            return removed
+        await db.execute(delete(ProcessingJob).where(ProcessingJob.id.in_(ids)))
+        await db.commit()
+        removed += len(ids)
+        if len(ids) < batch_size:
+            return removed
+
+
+async def run_retention_sweeper(
+    sessionmaker: async_sessionmaker[AsyncSession],
+    *,
+    interval_seconds: int,
+    retention: timedelta,
+) -> None:
+    """Loop do sweeper; idempotente, pode rodar em todas as réplicas."""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            async with sessionmaker() as session:
+                removed = await prune_finished_jobs(session, retention=retention)
+            if removed:
+                logger.info("Sweeper removeu %s processing_jobs finalizados", removed)
+        except Exception:  # pragma: no cover - banco indisponível não derruba a API
+            logger.exception("Falha no sweeper de processing_jobs")
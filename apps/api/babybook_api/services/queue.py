@@ -6,9 +6,10 @@ from typing import Any, Protocol
 
 import httpx
 from fastapi import Depends
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from babybook_api.db.models import WorkerJob
+from babybook_api.db.models import WORKER_JOBS_CHANNEL, WorkerJob
 from babybook_api.deps import get_db_session
 from babybook_api.settings import settings
 
@@ -52,6 +53,17 @@ class DatabaseQueuePublisher:
             except ValueError:
                 logger.warning("account_id inv�lido no payload da fila: %s", account_id)
         self._session.add(job)
+        await self._notify_workers(kind)
+
+    async def _notify_workers(self, kind: str) -> None:
+        if self._session.get_bind().dialect.name != "postgresql":
+            return
+        # NOTIFY é transacional: o Postgres só entrega a notificação no COMMIT,
+        # quando o job já está visível para o SELECT ... SKIP LOCKED dos workers.
+        await self._session.execute(
+            text("SELECT pg_notify(:channel, :kind)"),
+            {"channel": WORKER_JOBS_CHANNEL, "kind": kind},
+        )
 
 
 class CloudflareQueuePublisher:
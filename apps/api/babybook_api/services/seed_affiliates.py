@@ -7,8 +7,8 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from babybook_api.db.models import Account, Affiliate, User
-from babybook_api.security import hash_password
 from babybook_api.services.affiliates import get_or_create_program_config
+from babybook_api.services.passwords import password_hasher
 
 
 def _code_for(name: str) -> str:
@@ -51,7 +51,7 @@ async def _get_or_create_user(
     user = User(
         account_id=account_id,
         email=email.lower(),
-        password_hash=hash_password(password),
+        password_hash=await password_hasher.hash(password),
         name=name,
         locale="pt-BR",
         role=role,
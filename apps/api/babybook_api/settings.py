@@ -40,6 +40,10 @@ class Settings(BaseSettings):
     cloudflare_api_token: str | None = None
     cloudflare_api_base_url: str = "https://api.cloudflare.com/client/v4"
     inline_worker_enabled: bool = Field(default=True, alias="INLINE_WORKER_ENABLED")
+    # Jobs de /media/processing finalizados são removidos após N dias.
+    # O sweeper roda a cada N segundos em cada réplica (0 desliga).
+    processing_job_retention_days: int = 7
+    processing_job_sweep_interval_seconds: int = 3600
     dev_user_email: str = "dev@babybook.dev"
     dev_user_password: str = "password"
 
@@ -76,6 +80,32 @@ class Settings(BaseSettings):
     # Desabilitado por padrão para não atrapalhar dev/test.
     # Em staging/produção, habilite via env: RATE_LIMIT_ENABLED=true
     rate_limit_enabled: bool = Field(default=False, alias="RATE_LIMIT_ENABLED")
+
+    # ======================================================================
+    # Senhas (bcrypt)
+    # ======================================================================
+    # Hash/verificação rodam num pool de threads fora do event loop
+    # (services/passwords.py); o excedente espera na fila do pool.
+    password_hash_workers: int = Field(default=4, alias="PASSWORD_HASH_WORKERS")
+    # Espera na fila acima disso gera warning (sinal para aumentar o pool/réplicas).
+    password_hash_slow_queue_ms: float = Field(default=250.0, alias="PASSWORD_HASH_SLOW_QUEUE_MS")
+    # Custo do bcrypt. Hashes com outro custo são regravados no próximo login.
+    password_bcrypt_rounds: int = Field(default=12, ge=4, le=31, alias="PASSWORD_BCRYPT_ROUNDS")
+
+    # ======================================================================
+    # Cache de sessões (auth/session_cache.py)
+    # ======================================================================
+    # Sessões validadas ficam em memória por até este tempo; logout e
+    # alterações de usuário invalidam na hora (NOTIFY entre réplicas).
+    # 0 desliga o cache.
+    session_cache_ttl_seconds: float = Field(default=30.0, ge=0, alias="SESSION_CACHE_TTL_SECONDS")
+    session_cache_max_entries: int = Field(default=10_000, ge=0, alias="SESSION_CACHE_MAX_ENTRIES")
+
+    # Portal do parceiro: contadores da listagem de entregas (total/arquivadas/
+    # por status) ficam em cache por parceiro + filtros. 0 desliga.
+    partner_delivery_aggregations_ttl_seconds: float = Field(
+        default=5.0, ge=0, alias="PARTNER_DELIVERY_AGGREGATIONS_TTL_SECONDS"
+    )
     
     # Storage - MinIO (local/dev)
     minio_endpoint: str = "http://localhost:9000"
@@ -15,6 +15,7 @@ sys.path.insert(0, str(PACKAGE_ROOT))
 
 from babybook_api.db.models import Account, Base, User
 from babybook_api.auth.constants import SESSION_COOKIE_NAME
+from babybook_api.auth.session_cache import session_cache
 from babybook_api.deps import get_db_session
 from babybook_api.main import app
 from babybook_api.security import hash_password
@@ -78,6 +79,7 @@ async def _fetch_default_account_id() -> UUID:
 
 @pytest.fixture(autouse=True)
 def setup_db() -> None:
+    session_cache.clear()
     asyncio.run(_reset_db())
     asyncio.run(_seed_default_user())
 
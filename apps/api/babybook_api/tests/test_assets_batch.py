@@ -0,0 +1,81 @@
+import asyncio
+import uuid
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+
+from babybook_api.db.models import Asset
+from babybook_api.settings import settings
+from babybook_api.tests.conftest import TestingSessionLocal
+
+
+def _service_headers() -> dict[str, str]:
+    return {"X-Service-Token": settings.service_api_token}
+
+
+async def _seed_assets(account_id: UUID, count: int) -> list[UUID]:
+    async with TestingSessionLocal() as session:
+        assets = [
+            Asset(
+                account_id=account_id,
+                kind="photo",
+                status="processing",
+                mime="image/jpeg",
+                size_bytes=10,
+                sha256=f"{index}" * 64,
+            )
+            for index in range(count)
+        ]
+        session.add_all(assets)
+        await session.commit()
+        return [asset.id for asset in assets]
+
+
+async def _fetch_assets(asset_ids: list[UUID]) -> dict[UUID, Asset]:
+    async with TestingSessionLocal() as session:
+        stmt = select(Asset).where(Asset.id.in_(asset_ids)).options(selectinload(Asset.variants))
+        return {asset.id: asset for asset in (await session.execute(stmt)).scalars()}
+
+
+def test_batch_applies_updates_in_one_request(client, default_account_id):
+    first, second = asyncio.run(_seed_assets(UUID(default_account_id), 2))
+    gone = uuid.uuid4()
+
+    resp = client.patch(
+        "/assets:batch",
+        json={
+            "updates": [
+                {"asset_id": str(first), "status": "processing", "viewer_accessible": False},
+                {
+                    "asset_id": str(first),
+                    "status": "ready",
+                    "viewer_accessible": True,
+                    "variants": [
+                        {"preset": "thumb", "key": f"t/{first}.webp", "size_bytes": 10, "kind": "photo"},
+                    ],
+                },
+                {"asset_id": str(second), "status": "failed", "error_code": "thumbnail_error"},
+                {"asset_id": str(gone), "status": "ready"},
+            ]
+        },
+        headers=_service_headers(),
+    )
+
+    assert resp.status_code == 200
+    assert resp.json()["missing"] == [str(gone)]
+    assets = asyncio.run(_fetch_assets([first, second]))
+    assert assets[first].status == "ready"
+    assert assets[first].viewer_accessible is True
+    assert [variant.preset for variant in assets[first].variants] == ["thumb"]
+    assert assets[second].status == "failed"
+    assert assets[second].error_code == "thumbnail_error"
+
+
+def test_batch_requires_service_token(client):
+    resp = client.patch(
+        "/assets:batch",
+        json={"updates": [{"asset_id": str(uuid.uuid4()), "status": "ready"}]},
+        headers={"X-Service-Token": "wrong"},
+    )
+    assert resp.status_code == 401
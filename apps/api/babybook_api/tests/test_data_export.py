@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+from uuid import UUID
+
+from fastapi.testclient import TestClient
+
+from babybook_api.db.models import Asset, DataExport
+from babybook_api.main import app
+from babybook_api.services.queue import get_queue_publisher
+
+from .conftest import TestingSessionLocal
+
+
+class _RecordingPublisher:
+    def __init__(self) -> None:
+        self.jobs: list[dict[str, Any]] = []
+
+    async def publish(self, *, kind: str, payload: dict[str, Any], metadata: dict[str, Any] | None = None) -> None:
+        self.jobs.append({"kind": kind, "payload": payload, "metadata": metadata})
+
+
+async def _seed_assets(account_id: UUID) -> list[UUID]:
+    async with TestingSessionLocal() as session:
+        assets = [
+            Asset(
+                account_id=account_id,
+                kind="photo",
+                status="ready",
+                mime="image/jpeg",
+                size_bytes=10,
+                sha256=f"{index}" * 64,
+                key_original=f"u/{account_id}/assets/{index}/original.jpg",
+            )
+            for index in range(2)
+        ]
+        # Ainda processando: fora da exportação.
+        assets.append(
+            Asset(
+                account_id=account_id,
+                kind="video",
+                status="processing",
+                mime="video/mp4",
+                size_bytes=10,
+                sha256="f" * 64,
+                key_original=f"u/{account_id}/assets/pending/original.mp4",
+            )
+        )
+        session.add_all(assets)
+        await session.commit()
+        return [asset.id for asset in assets[:2]]
+
+
+async def _record_progress(export_id: UUID, *, items_done: int, bytes_written: int) -> None:
+    async with TestingSessionLocal() as session:
+        export = await session.get(DataExport, export_id)
+        assert export is not None
+        export.status = "running"
+        export.items_done = items_done
+        export.bytes_written = bytes_written
+        await session.commit()
+
+
+def test_data_export_enqueues_job_and_reports_progress(
+    client: TestClient, login: None, default_account_id: str
+) -> None:
+    publisher = _RecordingPublisher()
+    app.dependency_overrides[get_queue_publisher] = lambda: publisher
+    try:
+        asset_ids = asyncio.run(_seed_assets(UUID(default_account_id)))
+
+        resp = client.post("/me/settings/data/export", json={})
+        assert resp.status_code == 200
+        request_id = resp.json()["request_id"]
+
+        [job] = publisher.jobs
+        assert job["kind"] == "export.zip"
+        assert job["payload"]["export_id"] == request_id
+        assert job["payload"]["account_id"] == default_account_id
+        assert sorted(item["filename"] for item in job["payload"]["items"]) == sorted(
+            f"photos/{asset_id}.jpg" for asset_id in asset_ids
+        )
+        assert all(item["scope"] == "uploads" for item in job["payload"]["items"])
+
+        status = client.get(f"/me/settings/data/export/{request_id}").json()
+        assert status["status"] == "queued"
+        assert status["item_count"] == 2
+        assert status["progress"] == 0.0
+
+        # O worker grava o progresso na mesma linha.
+        asyncio.run(_record_progress(UUID(request_id), items_done=1, bytes_written=512))
+        status = client.get(f"/me/settings/data/export/{request_id}").json()
+        assert status["status"] == "running"
+        assert status["items_done"] == 1
+        assert status["progress"] == 50.0
+        assert status["bytes_written"] == 512
+    finally:
+        app.dependency_overrides.pop(get_queue_publisher, None)
+
+
+def test_data_export_without_files_is_rejected(client: TestClient, login: None) -> None:
+    publisher = _RecordingPublisher()
+    app.dependency_overrides[get_queue_publisher] = lambda: publisher
+    try:
+        resp = client.post("/me/settings/data/export", json={})
+        assert resp.status_code == 409
+        assert publisher.jobs == []
+    finally:
+        app.dependency_overrides.pop(get_queue_publisher, None)
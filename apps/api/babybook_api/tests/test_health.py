@@ -1,5 +1,16 @@
+from babybook_api.settings import settings
+
+
 def test_health_returns_ok(client):
     response = client.get("/health/")
     assert response.status_code == 200
     assert response.json() == {"status": "ok"}
     assert "X-Trace-Id" in response.headers
+
+
+def test_password_hashing_stats_require_service_token(client):
+    assert client.get("/health/password-hashing", headers={"X-Service-Token": "wrong"}).status_code == 401
+
+    response = client.get("/health/password-hashing", headers={"X-Service-Token": settings.service_api_token})
+    assert response.status_code == 200
+    assert "queue_wait_ms_p95" in response.json()
@@ -0,0 +1,84 @@
+import asyncio
+from datetime import timedelta
+
+from babybook_api.services import processing_jobs
+from babybook_api.settings import settings
+from babybook_api.tests.conftest import TestingSessionLocal
+
+
+def _service_headers() -> dict[str, str]:
+    return {"X-Service-Token": settings.service_api_token}
+
+
+def _queue_transcode(client) -> str:
+    resp = client.post(
+        "/media/processing/transcode",
+        json={"asset_id": "asset_progress", "source_key": "u/some-user/m/some-moment/video.mp4"},
+    )
+    assert resp.status_code == 202
+    return resp.json()["job_id"]
+
+
+def test_worker_progress_is_visible_in_job_status(client, login):
+    job_id = _queue_transcode(client)
+
+    resp = client.patch(
+        f"/media/processing/jobs/{job_id}/progress",
+        json={"status": "processing", "progress": 42.5, "stage": "transcoding"},
+        headers=_service_headers(),
+    )
+    assert resp.status_code == 204
+    # Stale update arriving late must not move progress backwards.
+    client.patch(
+        f"/media/processing/jobs/{job_id}/progress",
+        json={"progress": 30.0},
+        headers=_service_headers(),
+    )
+
+    body = client.get(f"/media/processing/jobs/{job_id}").json()
+    assert body["status"] == "processing"
+    assert body["stage"] == "transcoding"
+    assert body["progress"] == 42.5
+    assert body["started_at"] is not None
+
+
+def test_progress_endpoint_requires_service_token(client, login):
+    job_id = _queue_transcode(client)
+
+    resp = client.patch(
+        f"/media/processing/jobs/{job_id}/progress",
+        json={"progress": 10.0},
+        headers={"X-Service-Token": "wrong"},
+    )
+
+    assert resp.status_code == 401
+
+
+def test_jobs_are_persisted_with_indexed_queue_position(client, login):
+    first = _queue_transcode(client)
+    second = _queue_transcode(client)
+
+    assert client.get(f"/media/processing/jobs/{second}").json()["queue_position"] == 2
+    assert client.delete(f"/media/processing/jobs/{first}").status_code == 204
+    assert client.get(f"/media/processing/jobs/{second}").json()["queue_position"] == 1
+
+    listed = client.get("/media/processing/jobs").json()
+    assert [job["job_id"] for job in listed] == [second]
+
+
+def test_retention_sweeper_prunes_only_old_finished_jobs(client, login):
+    finished = _queue_transcode(client)
+    pending = _queue_transcode(client)
+    client.patch(
+        f"/media/processing/jobs/{finished}/progress",
+        json={"status": "completed", "progress": 100.0},
+        headers=_service_headers(),
+    )
+
+    async def _prune() -> int:
+        async with TestingSessionLocal() as session:
+            return await processing_jobs.prune_finished_jobs(session, retention=timedelta(seconds=-1))
+
+    assert asyncio.run(_prune()) == 1
+    assert client.get(f"/media/processing/jobs/{finished}").status_code == 404
+    assert client.get(f"/media/processing/jobs/{pending}").status_code == 200
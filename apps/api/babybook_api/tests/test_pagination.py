@@ -0,0 +1,56 @@
+import asyncio
+import uuid
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+
+from babybook_api.db.models import Moment
+from babybook_api.tests.conftest import TestingSessionLocal
+
+
+async def _insert_moments(account_id: str, child_id: str, count: int) -> None:
+    # Mesmo created_at em todas: o id precisa desempatar sem repetir nem pular linhas.
+    created_at = datetime(2026, 1, 1, 12, 0, 0)
+    async with TestingSessionLocal() as db:
+        for index in range(count):
+            db.add(
+                Moment(
+                    account_id=uuid.UUID(account_id),
+                    child_id=uuid.UUID(child_id),
+                    title=f"Momento {index}",
+                    created_at=created_at,
+                )
+            )
+        await db.commit()
+
+
+def test_moments_are_paged_with_cursor_without_gaps(client: TestClient, login, default_account_id) -> None:
+    child_id = client.post("/children", json={"name": "Bia"}).json()["id"]
+    asyncio.run(_insert_moments(default_account_id, child_id, 5))
+
+    seen: list[str] = []
+    cursor = None
+    pages = 0
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        body = client.get("/moments", params=params).json()
+        seen.extend(item["id"] for item in body["items"])
+        pages += 1
+        cursor = body["next"]
+        if cursor is None:
+            break
+
+    assert pages == 3
+    assert len(seen) == len(set(seen)) == 5
+
+
+def test_tampered_cursor_is_rejected(client: TestClient, login, default_account_id) -> None:
+    child_id = client.post("/children", json={"name": "Bia"}).json()["id"]
+    asyncio.run(_insert_moments(default_account_id, child_id, 3))
+    cursor = client.get("/moments", params={"limit": 1}).json()["next"]
+    assert cursor
+
+    response = client.get("/moments", params={"limit": 1, "cursor": cursor[:-2] + "xx"})
+
+    assert response.status_code == 400
+    assert response.json()["error"]["code"] == "pagination.cursor.invalid"
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import asyncio
+import uuid
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+
+from babybook_api.db.models import Delivery
+from babybook_api.main import app
+from babybook_api.services.delivery_aggregations import delivery_aggregation_cache
+
+from .conftest import TestingSessionLocal
+from .test_direct_import import _create_partner_user, _login
+
+
+async def _add_delivery(partner_id: uuid.UUID, *, client_name: str, status: str, archived: bool = False) -> None:
+    async with TestingSessionLocal() as session:
+        session.add(
+            Delivery(
+                partner_id=partner_id,
+                title=f"Ensaio {client_name}",
+                client_name=client_name,
+                status=status,
+                archived_at=datetime.utcnow() if archived else None,
+            )
+        )
+        await session.commit()
+
+
+def _partner_client() -> tuple[TestClient, uuid.UUID]:
+    user, partner, password = asyncio.run(_create_partner_user())
+    client = TestClient(app)
+    _login(client, email=user.email, password=password)
+    return client, partner.id
+
+
+def test_list_returns_page_total_and_aggregations() -> None:
+    client, partner_id = _partner_client()
+    asyncio.run(_add_delivery(partner_id, client_name="Joana Silva", status="ready"))
+    asyncio.run(_add_delivery(partner_id, client_name="Joana Prado", status="draft"))
+    asyncio.run(_add_delivery(partner_id, client_name="Joana Lima", status="ready", archived=True))
+    asyncio.run(_add_delivery(partner_id, client_name="Pedro", status="ready"))
+
+    body = client.get("/partner/deliveries", params={"q": "joana", "limit": 1}).json()
+
+    assert len(body["deliveries"]) == 1
+    assert body["total"] == 2
+    assert body["aggregations"] == {"total": 3, "archived": 1, "by_status": {"ready": 1, "draft": 1}}
+
+    # Página além do fim ainda informa o total filtrado.
+    beyond = client.get("/partner/deliveries", params={"q": "joana", "offset": 10}).json()
+    assert beyond["deliveries"] == []
+    assert beyond["total"] == 2
+
+
+def test_search_does_not_match_across_fields() -> None:
+    client, partner_id = _partner_client()
+    asyncio.run(_add_delivery(partner_id, client_name="Ana", status="ready"))
+
+    # Título "Ensaio Ana" + cliente "Ana": "anaana" só existiria colando campos.
+    body = client.get("/partner/deliveries", params={"q": "anaana"}).json()
+
+    assert body["total"] == 0
+
+
+def test_aggregations_are_cached_until_portal_mutation() -> None:
+    client, partner_id = _partner_client()
+    asyncio.run(_add_delivery(partner_id, client_name="Joana", status="ready"))
+    assert client.get("/partner/deliveries").json()["aggregations"]["total"] == 1
+
+    # Escrita fora do portal: contadores vêm do cache, a página não.
+    asyncio.run(_add_delivery(partner_id, client_name="Pedro", status="ready"))
+    body = client.get("/partner/deliveries").json()
+    assert body["aggregations"]["total"] == 1
+    assert body["total"] == 2
+
+    delivery_aggregation_cache.invalidate_partner(partner_id)
+    assert client.get("/partner/deliveries").json()["aggregations"]["total"] == 2
@@ -0,0 +1,85 @@
+import asyncio
+import time
+
+import pytest
+from passlib.context import CryptContext
+from sqlalchemy import select
+
+from babybook_api.db.models import User
+from babybook_api.security import pwd_context
+from babybook_api.services.passwords import PasswordHasher
+from babybook_api.tests.conftest import DEFAULT_EMAIL, DEFAULT_PASSWORD, TestingSessionLocal
+
+_FAST = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4)
+
+
+def _login(client, email: str, password: str):
+    csrf = client.get("/auth/csrf").json()["csrf_token"]
+    return client.post("/auth/login", json={"email": email, "password": password, "csrf_token": csrf})
+
+
+async def _set_password_hash(password_hash: str) -> None:
+    async with TestingSessionLocal() as session:
+        user = (await session.execute(select(User).where(User.email == DEFAULT_EMAIL))).scalar_one()
+        user.password_hash = password_hash
+        await session.commit()
+
+
+async def _get_password_hash() -> str:
+    async with TestingSessionLocal() as session:
+        return (await session.execute(select(User.password_hash).where(User.email == DEFAULT_EMAIL))).scalar_one()
+
+
+def test_hashing_runs_off_the_event_loop():
+    hasher = PasswordHasher(pwd_context, workers=2, slow_queue_ms=10_000)
+
+    async def scenario() -> float:
+        password_hash = await hasher.hash("segredo-123")
+        stalls: list[float] = []
+
+        async def ticker() -> None:
+            for _ in range(20):
+                started = time.perf_counter()
+                await asyncio.sleep(0.005)
+                stalls.append(time.perf_counter() - started)
+
+        results = await asyncio.gather(
+            ticker(),
+            *(hasher.verify("segredo-123", password_hash) for _ in range(6)),
+        )
+        assert results[1:] == [True] * 6
+        return max(stalls)
+
+    try:
+        # Um bcrypt de custo 12 bloquearia o loop por ~100ms+ se rodasse nele.
+        assert asyncio.run(scenario()) < 0.08
+        stats = hasher.stats()
+        assert stats["calls"] == 7
+        assert stats["in_flight"] == 0
+        assert stats["queue_wait_ms_max"] > 0
+    finally:
+        hasher.shutdown()
+
+
+def test_verify_treats_unknown_hash_format_as_mismatch():
+    hasher = PasswordHasher(pwd_context, workers=1, slow_queue_ms=10_000)
+    try:
+        assert asyncio.run(hasher.verify("qualquer", "nao-e-um-hash")) is False
+    finally:
+        hasher.shutdown()
+
+
+def test_login_rehashes_password_with_outdated_cost(client):
+    asyncio.run(_set_password_hash(_FAST.hash(DEFAULT_PASSWORD)))
+
+    assert _login(client, DEFAULT_EMAIL, DEFAULT_PASSWORD).status_code == 204
+
+    new_hash = asyncio.run(_get_password_hash())
+    assert pwd_context.identify(new_hash) == "bcrypt"
+    assert not pwd_context.needs_update(new_hash)
+    assert pwd_context.verify(DEFAULT_PASSWORD, new_hash)
+
+
+@pytest.mark.parametrize("email", [DEFAULT_EMAIL, "ninguem@example.com"])
+def test_login_with_wrong_credentials_is_rejected(client, email):
+    assert _login(client, email, "senha-errada").status_code == 401
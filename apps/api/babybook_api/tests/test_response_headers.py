@@ -0,0 +1,27 @@
+from fastapi.testclient import TestClient
+
+
+def test_every_response_carries_trace_security_and_timing_headers(client: TestClient) -> None:
+    response = client.get("/health/")
+
+    assert response.headers["X-Trace-Id"].startswith("bb-trace-")
+    assert response.headers["X-Frame-Options"] == "DENY"
+    assert response.headers["X-Content-Type-Options"] == "nosniff"
+    assert "frame-ancestors 'none'" in response.headers["Content-Security-Policy"]
+    assert response.headers["Server-Timing"].startswith("app;dur=")
+    # Cabeçalhos fixos aparecem uma única vez.
+    assert len(response.headers.get_list("X-Frame-Options")) == 1
+
+
+def test_error_body_and_header_share_the_request_trace_id(client: TestClient) -> None:
+    response = client.get("/me")
+
+    assert response.status_code == 401
+    assert response.headers.get_list("X-Trace-Id") == [response.json()["error"]["trace_id"]]
+
+
+def test_trace_ids_are_unique_per_request(client: TestClient) -> None:
+    first = client.get("/health/").headers["X-Trace-Id"]
+    second = client.get("/health/").headers["X-Trace-Id"]
+
+    assert first != second
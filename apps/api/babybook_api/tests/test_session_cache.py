@@ -0,0 +1,76 @@
+import asyncio
+import uuid
+
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+
+from babybook_api.auth.constants import SESSION_COOKIE_NAME
+from babybook_api.auth.session_cache import SessionCache, session_cache
+from babybook_api.db.models import Session as SessionModel
+from babybook_api.tests.conftest import TestingSessionLocal
+from babybook_api.time import utcnow
+
+
+async def _revoke_out_of_band() -> None:
+    async with TestingSessionLocal() as db:
+        await db.execute(update(SessionModel).values(revoked_at=utcnow()))
+        await db.commit()
+
+
+def test_cached_session_skips_database_until_invalidated(client: TestClient, login) -> None:
+    assert client.get("/me").status_code == 200
+    assert len(session_cache) == 1
+
+    # Revogação direta no banco (sem passar pela API): o cache ainda responde.
+    asyncio.run(_revoke_out_of_band())
+    assert client.get("/me").status_code == 200
+
+    session_cache.clear()
+    assert client.get("/me").status_code == 401
+
+
+def test_logout_invalidates_cached_session(client: TestClient, login) -> None:
+    token = client.cookies[SESSION_COOKIE_NAME]
+    assert client.get("/me").status_code == 200
+
+    assert client.post("/auth/logout").status_code == 204
+    assert len(session_cache) == 0
+
+    client.cookies.set(SESSION_COOKIE_NAME, token)
+    assert client.get("/me").status_code == 401
+
+
+def test_patch_me_is_visible_on_next_request(client: TestClient, login) -> None:
+    etag = client.get("/me").headers["ETag"]
+
+    response = client.patch("/me", json={"name": "Ana Maria"}, headers={"If-Match": etag})
+    assert response.status_code == 200
+
+    me = client.get("/me")
+    assert me.json()["name"] == "Ana Maria"
+    assert me.headers["ETag"] == response.headers["ETag"]
+
+
+def test_session_cache_ttl_lru_and_notifications() -> None:
+    now = [0.0]
+    cache = SessionCache(max_entries=2, ttl_seconds=10, clock=lambda: now[0])
+    user_a, user_b = uuid.uuid4(), uuid.uuid4()
+    session_a, session_b, session_c = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+
+    cache.put("a", "A", session_id=session_a, user_id=user_a)
+    cache.put("b", "B", session_id=session_b, user_id=user_b)
+    assert cache.get("a") == "A"
+    # "b" é o menos usado e sai quando "c" entra.
+    cache.put("c", "C", session_id=session_c, user_id=user_a)
+    assert cache.get("b") is None
+
+    cache.apply_notification(f"user:{user_a}")
+    assert len(cache) == 0
+
+    cache.put("b", "B", session_id=session_b, user_id=user_b)
+    now[0] = 10.0
+    assert cache.get("b") is None
+
+    cache.put("b", "B", session_id=session_b, user_id=user_b)
+    cache.apply_notification("lixo")
+    assert len(cache) == 0
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import Iterable
+import weakref
+from typing import Any, Iterable
 from uuid import UUID
 
 import httpx
@@ -12,6 +14,144 @@ from .types import VariantData
 logger = logging.getLogger(__name__)
 
 
+class AssetUpdateError(RuntimeError):
+    """A API não aplicou a atualização (asset inexistente)."""
+
+
+class _AssetBatcher:
+    """Junta os PATCHs de status feitos numa janela curta em um `PATCH /assets:batch`.
+
+    Cada chamador continua aguardando a própria atualização: o status está
+    gravado na API quando `patch_asset` retorna, como antes.
+    """
+
+    def __init__(self, client: httpx.AsyncClient, *, window_seconds: float, max_batch: int) -> None:
+        self._client = client
+        self._window_seconds = window_seconds
+        self._max_batch = max(1, max_batch)
+        self._pending: list[tuple[UUID, dict[str, object], asyncio.Future[None]]] = []
+        self._full = asyncio.Event()
+        self._flusher: asyncio.Task[None] | None = None
+
+    async def submit(self, asset_id: UUID, body: dict[str, object]) -> None:
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._pending.append((asset_id, body, future))
+        if len(self._pending) >= self._max_batch:
+            self._full.set()
+        if self._flusher is None:
+            self._flusher = asyncio.create_task(self._flush_after_window())
+        await future
+
+    async def drain(self) -> None:
+        """Envia o que estiver pendente (shutdown do worker)."""
+        while self._flusher is not None:
+            self._full.set()
+            await self._flusher
+
+    async def _flush_after_window(self) -> None:
+        try:
+            await asyncio.wait_for(self._full.wait(), timeout=self._window_seconds)
+        except TimeoutError:
+            pass
+        # Sem await entre a troca da lista e o reset: submits seguintes abrem nova janela.
+        batch, self._pending = self._pending[: self._max_batch], self._pending[self._max_batch :]
+        if len(self._pending) < self._max_batch:
+            self._full.clear()
+        self._flusher = asyncio.create_task(self._flush_after_window()) if self._pending else None
+        await self._send(batch)
+
+    async def _send(self, batch: list[tuple[UUID, dict[str, object], asyncio.Future[None]]]) -> None:
+        try:
+            response = await self._client.patch(
+                "/assets:batch",
+                json={"updates": [{"asset_id": str(asset_id), **body} for asset_id, body, _ in batch]},
+            )
+            response.raise_for_status()
+            missing = set(response.json().get("missing") or [])
+        except httpx.HTTPStatusError as exc:
+            status_code = exc.response.status_code
+            if len(batch) > 1 and 400 <= status_code < 500 and status_code != 404:
+                # Um item malformado (ex.: 422) derruba o lote inteiro: reenvia um a um
+                # para que só o chamador do item rejeitado receba o erro.
+                logger.warning("Lote de %s assets rejeitado (%s); reenviando individualmente", len(batch), status_code)
+                await asyncio.gather(*(self._send_one(*item) for item in batch))
+                return
+            self._fail(batch, exc)
+            return
+        except Exception as exc:
+            self._fail(batch, exc)
+            return
+        for asset_id, _, future in batch:
+            if future.done():
+                continue
+            if str(asset_id) in missing:
+                future.set_exception(AssetUpdateError(f"Asset {asset_id} não encontrado na API"))
+            else:
+                future.set_result(None)
+
+    async def _send_one(self, asset_id: UUID, body: dict[str, object], future: asyncio.Future[None]) -> None:
+        try:
+            response = await self._client.patch(f"/assets/{asset_id}", json=body)
+            if response.status_code == 404:
+                raise AssetUpdateError(f"Asset {asset_id} não encontrado na API")
+            response.raise_for_status()
+        except Exception as exc:
+            self._fail([(asset_id, body, future)], exc)
+            return
+        if not future.done():
+            future.set_result(None)
+
+    @staticmethod
+    def _fail(batch: list[tuple[UUID, dict[str, object], asyncio.Future[None]]], exc: Exception) -> None:
+        logger.warning("Falha ao atualizar %s assets na API: %s", len(batch), exc)
+        for _, _, future in batch:
+            if not future.done():
+                future.set_exception(exc)
+
+
+class _LoopApi:
+    def __init__(self) -> None:
+        settings = get_settings()
+        # Um cliente (pool de conexões keep-alive) para todas as chamadas do loop.
+        self.client = httpx.AsyncClient(
+            base_url=settings.api_base_url,
+            timeout=10.0,
+            headers={"X-Service-Token": settings.service_api_token},
+        )
+        self.assets = _AssetBatcher(
+            self.client,
+            window_seconds=settings.api_batch_window_ms / 1000,
+            max_batch=settings.api_batch_max_size,
+        )
+
+
+# httpx.AsyncClient fica preso ao loop em que abriu as conexões.
+_APIS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopApi]" = weakref.WeakKeyDictionary()
+
+
+def _api() -> _LoopApi:
+    loop = asyncio.get_running_loop()
+    api = _APIS.get(loop)
+    if api is None:
+        api = _APIS[loop] = _LoopApi()
+    return api
+
+
+async def start_api_client() -> None:
+    _api()
+
+
+async def close_api_client() -> None:
+    """Envia atualizações pendentes e fecha o pool do loop atual."""
+    api = _APIS.pop(asyncio.get_running_loop(), None)
+    if api is None:
+        return
+    try:
+        await api.assets.drain()
+    finally:
+        await api.client.aclose()
+
+
 async def patch_asset(
     asset_id: UUID,
     *,
@@ -22,7 +162,6 @@ async def patch_asset(
     key_original: str | None = None,
     variants: Iterable[VariantData] | None = None,
 ) -> None:
-    settings = get_settings()
     body: dict[str, object] = {}
     if status is not None:
         body["status"] = status
@@ -38,15 +177,35 @@ async def patch_asset(
         body["variants"] = [variant.to_payload() for variant in variants]
     if not body:
         return
-    async with httpx.AsyncClient(base_url=settings.api_base_url, timeout=10.0) as client:
-        response = await client.patch(
-            f"/assets/{asset_id}",
-            json=body,
-            headers={"X-Service-Token": settings.service_api_token},
-        )
-        try:
-            response.raise_for_status()
-        except httpx.HTTPError:
-            logger.exception("Falha ao atualizar asset %s na API", asset_id)
-            raise
+    try:
+        await _api().assets.submit(asset_id, body)
+    except (httpx.HTTPError, AssetUpdateError):
+        logger.exception("Falha ao atualizar asset %s na API", asset_id)
+        raise
+
 
+async def patch_processing_job(
+    job_id: str,
+    *,
+    status: str | None = None,
+    progress: float | None = None,
+    stage: str | None = None,
+    error_message: str | None = None,
+) -> None:
+    body: dict[str, Any] = {}
+    if status is not None:
+        body["status"] = status
+    if progress is not None:
+        body["progress"] = round(progress, 1)
+    if stage is not None:
+        body["stage"] = stage
+    if error_message is not None:
+        body["error_message"] = error_message
+    if not body:
+        return
+    response = await _api().client.patch(
+        f"/media/processing/jobs/{job_id}/progress",
+        json=body,
+        timeout=5.0,
+    )
+    response.raise_for_status()
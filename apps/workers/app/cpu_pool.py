@@ -0,0 +1,74 @@
+"""Pool de processos para trabalho CPU-bound dos handlers.
+
+Resize/encode com Pillow dentro de `asyncio.to_thread` disputa o GIL com o
+loop e com os outros jobs do mesmo processo, limitando o worker a ~1 core.
+Aqui o trabalho roda num `ProcessPoolExecutor` dimensionado pelos cores
+disponíveis. Argumentos e resultados devem ser pequenos e picklable: passe
+caminhos de arquivo (`Path`), nunca bytes da imagem.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, TypeVar
+
+from .settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_EXECUTOR: ProcessPoolExecutor | None = None
+
+
+def get_cpu_executor() -> ProcessPoolExecutor | None:
+    """Retorna o pool compartilhado (criado sob demanda) ou None se desabilitado."""
+    global _EXECUTOR
+    settings = get_settings()
+    if settings.cpu_pool_size <= 0:
+        return None
+    if _EXECUTOR is None:
+        # `max_tasks_per_child` recicla os processos periodicamente para conter
+        # fragmentação/vazamentos de memória do Pillow; exige spawn/forkserver.
+        _EXECUTOR = ProcessPoolExecutor(
+            max_workers=settings.cpu_pool_size,
+            mp_context=multiprocessing.get_context("spawn"),
+            max_tasks_per_child=settings.cpu_pool_max_tasks_per_child or None,
+        )
+        logger.info(
+            "Pool de CPU iniciado (%s processos, reciclagem a cada %s tarefas)",
+            settings.cpu_pool_size,
+            settings.cpu_pool_max_tasks_per_child or "∞",
+        )
+    return _EXECUTOR
+
+
+async def run_cpu_bound(func: Callable[..., T], *args: Any) -> T:
+    """Executa `func(*args)` no pool de processos (ou numa thread, se desabilitado).
+
+    `func` precisa ser importável no nível de módulo para ser enviada ao pool.
+    """
+    executor = get_cpu_executor()
+    if executor is None:
+        return await asyncio.to_thread(func, *args)
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(executor, functools.partial(func, *args))
+    except BrokenProcessPool:
+        # Um filho morreu (ex.: OOM kill). O pool quebrado não aceita mais
+        # tarefas; descartamos para o próximo job criar um novo.
+        logger.error("Pool de CPU quebrado; recriando no próximo job")
+        shutdown_cpu_executor(wait=False)
+        raise
+
+
+def shutdown_cpu_executor(*, wait: bool = True) -> None:
+    global _EXECUTOR
+    executor, _EXECUTOR = _EXECUTOR, None
+    if executor is not None:
+        executor.shutdown(wait=wait, cancel_futures=not wait)
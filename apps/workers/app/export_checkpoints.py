@@ -0,0 +1,111 @@
+"""Progresso e checkpoint das exportações (`data_exports`).
+
+A API cria a linha ao enfileirar o `export.zip`; o worker registra aqui o
+multipart em andamento (`upload_id`), as partes já enviadas e o estado do
+`ZipStreamWriter`. Um retry do job lê o checkpoint e continua do último item
+gravado, em vez de recomeçar o ZIP do zero.
+"""
+
+from __future__ import annotations
+
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from babybook_api.db.models import DataExport
+
+
+@dataclass(slots=True)
+class ExportProgress:
+    status: str
+    upload_id: str | None
+    checkpoint: dict[str, Any] | None
+    items_done: int
+    bytes_written: int
+
+
+class ExportCheckpointStore:
+    def __init__(self, database_url: str) -> None:
+        self._database_url = database_url
+        self._sessionmaker: async_sessionmaker[AsyncSession] | None = None
+
+    def _sessions(self) -> async_sessionmaker[AsyncSession]:
+        # Engine sob demanda: importar o módulo não deve abrir conexão.
+        if self._sessionmaker is None:
+            engine = create_async_engine(self._database_url, future=True)
+            self._sessionmaker = async_sessionmaker(engine, expire_on_commit=False)
+        return self._sessionmaker
+
+    async def load(self, export_id: uuid.UUID) -> ExportProgress | None:
+        """Estado atual, ou None quando a exportação não tem linha (job avulso)."""
+        async with self._sessions()() as session:
+            export = await session.get(DataExport, export_id)
+            if export is None:
+                return None
+            return ExportProgress(
+                status=export.status,
+                upload_id=export.upload_id,
+                checkpoint=export.checkpoint,
+                items_done=export.items_done,
+                bytes_written=export.bytes_written,
+            )
+
+    async def begin(self, export_id: uuid.UUID, *, upload_id: str, checkpoint: dict[str, Any]) -> None:
+        await self._update(
+            export_id,
+            status="running",
+            upload_id=upload_id,
+            checkpoint=checkpoint,
+            items_done=0,
+            bytes_written=0,
+            error_message=None,
+            started_at=datetime.now(timezone.utc),
+        )
+
+    async def save(
+        self,
+        export_id: uuid.UUID,
+        *,
+        items_done: int,
+        bytes_written: int,
+        checkpoint: dict[str, Any] | None = None,
+    ) -> None:
+        """Atualiza o progresso; o checkpoint só muda quando informado."""
+        values: dict[str, Any] = {"status": "running", "items_done": items_done, "bytes_written": bytes_written}
+        if checkpoint is not None:
+            values["checkpoint"] = checkpoint
+        await self._update(export_id, **values)
+
+    async def complete(self, export_id: uuid.UUID, *, result_key: str, items_done: int, bytes_written: int) -> None:
+        await self._update(
+            export_id,
+            status="completed",
+            result_key=result_key,
+            items_done=items_done,
+            bytes_written=bytes_written,
+            upload_id=None,
+            checkpoint=None,
+            error_message=None,
+            completed_at=datetime.now(timezone.utc),
+        )
+
+    async def fail(self, export_id: uuid.UUID, *, message: str) -> None:
+        # Mantém upload_id/checkpoint: o próximo retry continua de onde parou.
+        # Na última tentativa o handler aborta o multipart e chama `reset` antes.
+        await self._update(export_id, status="failed", error_message=message[:2000])
+
+    async def reset(self, export_id: uuid.UUID) -> None:
+        """Descarta o checkpoint (ex.: o multipart expirou no storage)."""
+        await self._update(export_id, upload_id=None, checkpoint=None, items_done=0, bytes_written=0)
+
+    async def _update(self, export_id: uuid.UUID, **values: Any) -> None:
+        async with self._sessions()() as session:
+            export = await session.get(DataExport, export_id)
+            if export is None:
+                return
+            for field, value in values.items():
+                setattr(export, field, value)
+            await session.commit()
@@ -4,63 +4,266 @@ import asyncio
 import logging
 import shutil
 import tempfile
+import time
+from collections import deque
+from contextlib import aclosing
+from datetime import datetime
 from pathlib import Path
-from typing import Any
-from zipfile import ZIP_DEFLATED, ZipFile
+from typing import Any, AsyncGenerator, BinaryIO
 
+from .export_checkpoints import ExportCheckpointStore
 from .settings import WorkerSettings, get_settings
 from .storage import StorageClient
-from .types import ExportJobPayload, log_prefix
+from .types import ExportItem, ExportJobPayload, log_prefix
+from .zip_stream import ZipStreamWriter
 
 logger = logging.getLogger(__name__)
 _SETTINGS: WorkerSettings = get_settings()
 _STORAGE = StorageClient(_SETTINGS)
+_CHECKPOINTS = ExportCheckpointStore(_SETTINGS.database_url)
+
+_MB = 1024 * 1024
+# Mínimo do S3 para partes (exceto a última).
+_MIN_PART_BYTES = 5 * _MB
+_READ_CHUNK_BYTES = _MB
 
 
 async def build_export_zip(payload: dict[str, Any], metadata: dict[str, Any]) -> None:
+    """Monta o ZIP em streaming direto para um multipart upload.
+
+    Os itens são baixados com concorrência limitada (janela à frente do item
+    sendo compactado) e cada um vai para o ZIP assim que chega; o disco só
+    guarda a janela de downloads, nunca o ZIP inteiro.
+
+    Exportações registradas em `data_exports` gravam checkpoints (partes
+    enviadas + estado do ZIP) entre itens; um retry retoma o mesmo multipart
+    a partir do último checkpoint. Na última tentativa o multipart é abortado:
+    sem retry, as partes ficariam cobradas no bucket para sempre.
+    """
     job = ExportJobPayload.parse(payload, metadata)
     prefix = log_prefix(job.trace_id)
     settings = _SETTINGS
     storage = _STORAGE
-    tmpdir = Path(tempfile.mkdtemp(dir=settings.tmp_dir, prefix="export-"))
-    try:
-        downloaded = await _download_items(tmpdir, storage, settings.bucket_derivatives, job)
-        archive_path = tmpdir / f"{job.export_id}.zip"
-        await _create_zip(archive_path, downloaded)
-        dest_key = f"exports/{job.account_id}/{job.export_id}.zip"
-        await storage.upload_file(
+    checkpoints = _CHECKPOINTS
+    dest_key = f"exports/{job.account_id}/{job.export_id}.zip"
+    part_size = max(_MIN_PART_BYTES, settings.export_part_mb * _MB)
+
+    progress = await checkpoints.load(job.export_id)
+    tracked = progress is not None
+    if progress is not None and progress.status == "completed":
+        logger.info("%sExport %s já concluída; nada a fazer", prefix, job.export_id)
+        return
+    if progress is not None and progress.upload_id and progress.checkpoint:
+        upload_id = progress.upload_id
+        state = progress.checkpoint
+        writer = ZipStreamWriter.from_state(state["zip"], date_time=datetime.fromisoformat(state["date_time"]))
+        parts = [(int(number), str(etag)) for number, etag in state["parts"]]
+        skip = int(state["items"])
+        logger.info("%sRetomando export %s no item %s/%s", prefix, job.export_id, skip, len(job.items))
+    else:
+        upload_id = await storage.create_multipart_upload(
             bucket=settings.bucket_exports,
             key=dest_key,
-            source=archive_path,
             content_type="application/zip",
         )
-        logger.info("%sExport %s pronta (%s arquivos)", prefix, job.export_id, len(downloaded))
-    except Exception:
+        writer = ZipStreamWriter(date_time=datetime.utcnow().replace(microsecond=0))
+        parts = []
+        skip = 0
+        if tracked:
+            await checkpoints.begin(job.export_id, upload_id=upload_id, checkpoint=_checkpoint(writer, parts, 0))
+
+    sink = MultipartSink(
+        storage,
+        bucket=settings.bucket_exports,
+        key=dest_key,
+        upload_id=upload_id,
+        part_size=part_size,
+        parts=parts,
+    )
+    tmpdir = Path(tempfile.mkdtemp(dir=settings.tmp_dir, prefix="export-"))
+    try:
+        items_done = skip
+        last_saved = time.monotonic()
+        downloads = _download_items(tmpdir, storage, job.items[skip:], settings)
+        async with aclosing(downloads):
+            async for item, path in downloads:
+                await sink.write(writer.start_entry(item.filename))
+                with path.open("rb") as source:
+                    while (encoded := await asyncio.to_thread(_read_encoded, source, writer)) is not None:
+                        await sink.write(encoded)
+                await sink.write(writer.end_entry())
+                path.unlink()
+                items_done += 1
+                if tracked and time.monotonic() - last_saved >= settings.export_checkpoint_seconds:
+                    last_saved = time.monotonic()
+                    checkpoint = None
+                    # Checkpoint só com o buffer vazio: tudo até `writer.offset` já está em partes.
+                    # Com menos de 5MB pendentes, grava só o progresso e tenta no próximo item.
+                    if sink.buffered >= _MIN_PART_BYTES:
+                        await sink.flush()
+                        checkpoint = _checkpoint(writer, sink.parts, items_done)
+                    await checkpoints.save(
+                        job.export_id,
+                        items_done=items_done,
+                        bytes_written=writer.offset,
+                        checkpoint=checkpoint,
+                    )
+        await sink.write(writer.finish())
+        await sink.complete()
+        if tracked:
+            await checkpoints.complete(
+                job.export_id,
+                result_key=dest_key,
+                items_done=items_done,
+                bytes_written=writer.offset,
+            )
+        logger.info(
+            "%sExport %s pronta (%s arquivos, %s partes, %s MB)",
+            prefix,
+            job.export_id,
+            len(job.items),
+            len(sink.parts),
+            writer.offset // _MB,
+        )
+    except Exception as exc:
         logger.exception("%sFalha ao construir export %s", prefix, job.export_id)
+        if not tracked or job.final_attempt:
+            await _abort_upload(storage, settings.bucket_exports, dest_key, upload_id, prefix=prefix)
+        if tracked:
+            if job.final_attempt or _error_code(exc) == "NoSuchUpload":
+                # Multipart abortado (ou expirado no storage): nada a retomar.
+                await checkpoints.reset(job.export_id)
+            await checkpoints.fail(job.export_id, message=str(exc) or exc.__class__.__name__)
         raise
     finally:
         shutil.rmtree(tmpdir, ignore_errors=True)
 
 
+async def _abort_upload(storage: StorageClient, bucket: str, key: str, upload_id: str, *, prefix: str) -> None:
+    try:
+        await storage.abort_multipart_upload(bucket=bucket, key=key, upload_id=upload_id)
+    except Exception:
+        logger.warning("%sNão foi possível abortar o multipart %s de %s", prefix, upload_id, key)
+
+
+def _checkpoint(writer: ZipStreamWriter, parts: list[tuple[int, str]], items_done: int) -> dict[str, Any]:
+    return {
+        "items": items_done,
+        "parts": [list(part) for part in parts],
+        "zip": writer.state(),
+        "date_time": writer.date_time.isoformat(),
+    }
+
+
+def _error_code(exc: BaseException) -> str | None:
+    response = getattr(exc, "response", None)
+    if isinstance(response, dict):
+        return response.get("Error", {}).get("Code")
+    return None
+
+
+class MultipartSink:
+    """Acumula a saída do ZIP e envia partes de `part_size` assim que completam."""
+
+    def __init__(
+        self,
+        storage: StorageClient,
+        *,
+        bucket: str,
+        key: str,
+        upload_id: str,
+        part_size: int,
+        parts: list[tuple[int, str]] | None = None,
+    ) -> None:
+        self._storage = storage
+        self.bucket = bucket
+        self.key = key
+        self.upload_id = upload_id
+        self.part_size = part_size
+        # Partes de um checkpoint; as seguintes sobrescrevem as enviadas depois dele.
+        self.parts: list[tuple[int, str]] = list(parts or [])
+        self._buffer = bytearray()
+
+    @property
+    def buffered(self) -> int:
+        return len(self._buffer)
+
+    async def write(self, data: bytes) -> None:
+        self._buffer += data
+        while len(self._buffer) >= self.part_size:
+            await self._upload(self.part_size)
+
+    async def flush(self) -> None:
+        """Envia o buffer como parte (precisa ter ao menos 5MB, salvo a última)."""
+        if self._buffer:
+            await self._upload(len(self._buffer))
+
+    async def complete(self) -> None:
+        if self._buffer or not self.parts:
+            await self._upload(len(self._buffer))
+        await self._storage.complete_multipart_upload(
+            bucket=self.bucket,
+            key=self.key,
+            upload_id=self.upload_id,
+            parts=self.parts,
+        )
+
+    async def _upload(self, size: int) -> None:
+        body = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        part_number = len(self.parts) + 1
+        etag = await self._storage.upload_part(
+            bucket=self.bucket,
+            key=self.key,
+            upload_id=self.upload_id,
+            part_number=part_number,
+            body=body,
+        )
+        self.parts.append((part_number, etag))
+
+
 async def _download_items(
     tmpdir: Path,
     storage: StorageClient,
-    bucket: str,
-    job: ExportJobPayload,
-) -> list[tuple[Path, str]]:
-    files: list[tuple[Path, str]] = []
-    for item in job.items:
-        local_path = tmpdir / item.filename
-        local_path.parent.mkdir(parents=True, exist_ok=True)
+    items: list[ExportItem],
+    settings: WorkerSettings,
+) -> AsyncGenerator[tuple[ExportItem, Path], None]:
+    """Entrega (item, arquivo local) na ordem, com até N downloads à frente."""
+    window = max(1, settings.export_download_concurrency)
+    pending: deque[tuple[ExportItem, asyncio.Task[Path]]] = deque()
+    upcoming = iter(enumerate(items))
+
+    async def _fetch(index: int, item: ExportItem) -> Path:
+        # Nome local pelo índice: `filename` vem do payload e não deve virar caminho no disco.
+        local_path = tmpdir / f"{index:06d}"
+        bucket = settings.bucket_uploads if item.scope == "uploads" else settings.bucket_derivatives
         await storage.download_file(bucket=bucket, key=item.key, destination=local_path)
-        files.append((local_path, item.filename))
-    return files
+        return local_path
+
+    def _schedule() -> None:
+        upcoming_item = next(upcoming, None)
+        if upcoming_item is not None:
+            index, item = upcoming_item
+            pending.append((item, asyncio.create_task(_fetch(index, item))))
 
+    try:
+        for _ in range(window):
+            _schedule()
+        while pending:
+            item, task = pending.popleft()
+            path = await task
+            _schedule()
+            yield item, path
+    finally:
+        for _, task in pending:
+            task.cancel()
+        await asyncio.gather(*(task for _, task in pending), return_exceptions=True)
 
-async def _create_zip(archive: Path, files: list[tuple[Path, str]]) -> None:
-    def _write() -> None:
-        with ZipFile(archive, "w", ZIP_DEFLATED) as zip_file:
-            for path, arcname in files:
-                zip_file.write(path, arcname=arcname)
 
-    await asyncio.to_thread(_write)
+def _read_encoded(source: BinaryIO, writer: ZipStreamWriter) -> bytes | None:
+    """Lê um bloco do item e devolve os bytes já comprimidos (None no fim)."""
+    data = source.read(_READ_CHUNK_BYTES)
+    if not data:
+        return None
+    # Deflate pode devolver b"" enquanto acumula; por isso o fim é sinalizado com None.
+    return writer.write(data)
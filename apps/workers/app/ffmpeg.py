@@ -1,28 +1,47 @@
 from __future__ import annotations
 
-import asyncio
 import json
 import logging
 import shutil
 import tempfile
+from functools import partial
 from pathlib import Path
 from typing import Any
 
 from .api_client import patch_asset
-from .file_validation import validate_file_on_disk
+from .ffmpeg_runner import run_ffmpeg
+from .file_validation import validate_magic_bytes
 from .settings import WorkerSettings, get_settings
+from .source_cache import get_source_cache
+from .source_fetch import SourceRejected, fetch_source, reject_source
 from .storage import StorageClient
-from .types import AssetJobPayload, VariantData, log_prefix
+from .types import AssetJobPayload, log_prefix
+from .uploads import PendingUpload, upload_derivatives
+from .video_plan import (
+    FFmpegReport,
+    PresetPlan,
+    VideoTarget,
+    copy_output_args,
+    parse_ffmpeg_report,
+    plan_transcode,
+    probe_source,
+)
+from .video_segments import SegmentedOutput, should_segment, transcode_segmented
 
 logger = logging.getLogger(__name__)
 _SETTINGS: WorkerSettings = get_settings()
 _STORAGE = StorageClient(_SETTINGS)
 
-VIDEO_PRESETS: list[tuple[str, int]] = [
-    ("video_1080p", 1920),
-    ("video_720p", 1280),
+# Presets em ordem decrescente; `max_bitrate` (bps) é o teto para remux sem re-encode.
+VIDEO_PRESETS: list[VideoTarget] = [
+    VideoTarget("video_1080p", 1920, max_bitrate=10_000_000),
+    VideoTarget("video_720p", 1280, max_bitrate=5_000_000),
 ]
 
+_X264_ARGS = ["-c:v", "libx264", "-preset", "fast", "-crf", "22"]
+_AAC_ARGS = ["-c:a", "aac", "-b:a", "128k"]
+_FASTSTART_ARGS = ["-movflags", "+faststart"]
+
 
 async def transcode_video(payload: dict[str, Any], metadata: dict[str, Any]) -> None:
     job = AssetJobPayload.parse(payload, metadata)
@@ -32,34 +51,44 @@ async def transcode_video(payload: dict[str, Any], metadata: dict[str, Any]) ->
     tmpdir = Path(tempfile.mkdtemp(dir=settings.tmp_dir, prefix="video-"))
     try:
         source_path = tmpdir / "source"
-        await storage.download_file(bucket=settings.bucket_uploads, key=job.key, destination=source_path)
-
-        # Validação de assinatura (magic bytes) antes de transcodificar.
+        # Assinatura (magic bytes) validada por range GET antes do download.
         try:
-            validate_file_on_disk(path=source_path, declared_content_type=job.mime or "application/octet-stream")
-        except Exception as exc:
-            logger.warning(
-                "%sArquivo com assinatura inválida para asset %s (mime=%s): %s",
-                prefix,
-                job.asset_id,
-                job.mime,
-                exc,
+            await fetch_source(
+                storage,
+                bucket=settings.bucket_uploads,
+                key=job.key,
+                destination=source_path,
+                check_header=partial(
+                    validate_magic_bytes,
+                    declared_content_type=job.mime or "application/octet-stream",
+                ),
+                expected_sha256=job.sha256,
+                cache=get_source_cache(),
+            )
+        except SourceRejected as exc:
+            await reject_source(
+                storage,
+                bucket=settings.bucket_uploads,
+                key=job.key,
+                asset_id=job.asset_id,
+                exc=exc,
+                prefix=prefix,
             )
-            await patch_asset(job.asset_id, status="failed", error_code="invalid_file_signature", viewer_accessible=False)
-            try:
-                await storage.delete_object(bucket=settings.bucket_uploads, key=job.key)
-            except Exception:
-                pass
             return
 
         original_key = _canonical_original_key(job)
-        await storage.upload_file(
-            bucket=settings.bucket_derivatives,
+        original = PendingUpload(
             key=original_key,
             source=source_path,
             content_type=job.mime or "application/octet-stream",
         )
-        variants, duration_ms = await _transcode_variants(tmpdir, source_path, job, settings, storage)
+        rendered, duration_ms = await _transcode_variants(tmpdir, source_path, job, settings)
+        variants = await upload_derivatives(
+            storage,
+            settings.bucket_derivatives,
+            [original, *rendered],
+            settings=settings,
+        )
         await patch_asset(
             job.asset_id,
             status="ready",
@@ -87,97 +116,97 @@ async def _transcode_variants(
     source: Path,
     job: AssetJobPayload,
     settings,
-    storage: StorageClient,
-) -> tuple[list[VariantData], int]:
-    variants: list[VariantData] = []
-    duration_ms = 0
-    for preset, max_width in VIDEO_PRESETS:
-        output_path = tmpdir / f"{preset}.mp4"
-        await _run_ffmpeg(
+) -> tuple[list[PendingUpload], int]:
+    probe = await probe_source(settings.ffprobe_path, source)
+    plan = plan_transcode(probe, VIDEO_PRESETS)
+    logger.info(
+        "%sPlano de transcode do asset %s: %s",
+        log_prefix(job.trace_id),
+        job.asset_id,
+        json.dumps(plan.as_dict(), sort_keys=True),
+    )
+    outputs = [(item, tmpdir / f"{item.preset}.mp4") for item in plan.outputs]
+    encoded = [(index, item, path) for index, (item, path) in enumerate(outputs) if item.action == "encode"]
+    if encoded and should_segment(probe.duration_ms, settings):
+        copied = [(item, path) for item, path in outputs if item.action == "copy"]
+        if copied:
+            await run_ffmpeg(settings.ffmpeg_path, _ladder_args(source, copied))
+        segmented = await transcode_segmented(
+            run_ffmpeg,
             settings.ffmpeg_path,
+            source,
+            tmpdir / "segments",
             [
-                "-y",
-                "-hide_banner",
-                "-i",
-                str(source),
-                "-vf",
-                f"scale=min({max_width},iw):-2",
-                "-c:v",
-                "libx264",
-                "-preset",
-                "fast",
-                "-crf",
-                "22",
-                "-movflags",
-                "+faststart",
-                "-c:a",
-                "aac",
-                "-b:a",
-                "128k",
-                str(output_path),
+                SegmentedOutput(
+                    path=path,
+                    video_filter=item.target.scale_filter(),
+                    video_args=_X264_ARGS,
+                    audio_args=_AAC_ARGS,
+                    container_args=_FASTSTART_ARGS,
+                )
+                for _, item, path in encoded
             ],
+            duration_ms=probe.duration_ms,
+            has_audio=probe.audio_codec is not None,
+            rotation=probe.rotation,
         )
-        width, height, duration_ms = await _probe_video(settings.ffprobe_path, output_path)
-        dest_key = f"u/{job.account_id}/assets/{job.asset_id}/{preset}.mp4"
-        await storage.upload_file(
-            bucket=settings.bucket_derivatives,
-            key=dest_key,
-            source=output_path,
-            content_type="video/mp4",
-        )
-        variants.append(
-            VariantData(
-                preset=preset,
-                key=dest_key,
-                size_bytes=output_path.stat().st_size,
-                width_px=width,
-                height_px=height,
+        # Reindexa as dimensões pela posição na lista completa de saídas.
+        report = FFmpegReport(duration_ms=segmented.duration_ms)
+        for position, (index, _, _) in enumerate(encoded):
+            if position in segmented.output_sizes:
+                report.output_sizes[index] = segmented.output_sizes[position]
+    else:
+        stderr = await run_ffmpeg(settings.ffmpeg_path, _ladder_args(source, outputs))
+        report = parse_ffmpeg_report(stderr)
+
+    rendered: list[PendingUpload] = []
+    for index, (item, output_path) in enumerate(outputs):
+        if item.action == "copy":
+            width, height = probe.width, probe.height
+        else:
+            width, height = report.output_sizes.get(index, (0, 0))
+        rendered.append(
+            PendingUpload(
+                key=f"u/{job.account_id}/assets/{job.asset_id}/{item.preset}.mp4",
+                source=output_path,
+                content_type="video/mp4",
+                preset=item.preset,
                 kind="video",
+                width_px=width or None,
+                height_px=height or None,
             )
         )
-    return variants, duration_ms
-
-
-async def _run_ffmpeg(executable: str, args: list[str]) -> None:
-    process = await asyncio.create_subprocess_exec(
-        executable,
-        *args,
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
-    )
-    stdout, stderr = await process.communicate()
-    if process.returncode != 0:
-        raise RuntimeError(
-            f"ffmpeg exit {process.returncode}: {stderr.decode() or stdout.decode()}".strip()
-        )
-
-
-async def _probe_video(executable: str, path: Path) -> tuple[int, int, int]:
-    process = await asyncio.create_subprocess_exec(
-        executable,
-        "-v",
-        "error",
-        "-select_streams",
-        "v:0",
-        "-show_entries",
-        "stream=width,height",
-        "-show_entries",
-        "format=duration",
-        "-print_format",
-        "json",
-        str(path),
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
-    )
-    stdout, stderr = await process.communicate()
-    if process.returncode != 0:
-        raise RuntimeError(f"ffprobe exit {process.returncode}: {stderr.decode()}")
-    data = json.loads(stdout.decode() or "{}")
-    width = int((data.get("streams") or [{}])[0].get("width") or 0)
-    height = int((data.get("streams") or [{}])[0].get("height") or 0)
-    duration_raw = data.get("format", {}).get("duration")
-    duration_ms = int(float(duration_raw) * 1000) if duration_raw else 0
-    return width, height, duration_ms
+    return rendered, probe.duration_ms or report.duration_ms
+
+
+def _ladder_args(source: Path, outputs: list[tuple[PresetPlan, Path]]) -> list[str]:
+    """Monta uma única invocação do ffmpeg: decodifica uma vez e divide (split) para N encoders.
+
+    Saídas com `action == "copy"` só remuxam os streams da origem.
+    """
+    args = ["-y", "-hide_banner", "-i", str(source)]
+    encoded = [(f"v{index}", item) for index, (item, _) in enumerate(outputs) if item.action == "encode"]
+    if encoded:
+        graph = [f"[0:v]split={len(encoded)}" + "".join(f"[{label}]" for label, _ in encoded)]
+        for label, item in encoded:
+            graph.append(f"[{label}]{item.target.scale_filter()}[{label}out]")
+        args += ["-filter_complex", ";".join(graph)]
+
+    for index, (item, output_path) in enumerate(outputs):
+        if item.action == "copy":
+            args += copy_output_args(output_path)
+            continue
+        args += [
+            "-map",
+            f"[v{index}out]",
+            "-map",
+            "0:a?",
+            *_X264_ARGS,
+            *_FASTSTART_ARGS,
+            *_AAC_ARGS,
+            str(output_path),
+        ]
+    return args
 
 
 def _canonical_original_key(job: AssetJobPayload) -> str:
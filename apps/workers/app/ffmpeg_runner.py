@@ -0,0 +1,134 @@
+"""Execução do ffmpeg com progresso incremental.
+
+`-progress pipe:1` faz o ffmpeg escrever blocos `chave=valor` no stdout a
+cada ~0,5s; lemos em streaming e repassamos `out_time` para um callback.
+Com o progresso vindo do pipe, `-nostats` tira as linhas de stats periódicas
+do stderr (o relatório final continua). O stderr fica num buffer limitado:
+o cabeçalho inteiro (`Duration:`, todos os `Output #N`, que o
+`parse_ffmpeg_report` lê) até a primeira linha de stats, e um ring com as
+últimas linhas, usado na mensagem de erro.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import codecs
+import re
+from collections import deque
+from typing import Awaitable, Callable, Protocol
+
+# Callback síncrono com o tempo de mídia já processado, em ms.
+TimeCallback = Callable[[int], None]
+
+# Teto de memória do cabeçalho; na prática ele termina bem antes, na primeira
+# linha de stats. Uma .mov com muitos streams/metadados passa fácil de 100 linhas.
+STDERR_HEAD_MAX_LINES = 2000
+STDERR_TAIL_LINES = 200
+
+_LINE_SPLIT_RE = re.compile(r"[\r\n]")
+# Linha de stats/relatório: `frame=... time=...` (vídeo) ou `size=... time=...` (só áudio).
+_STATS_LINE_RE = re.compile(r"^(?:frame|size)=")
+
+
+class FFmpegRunner(Protocol):
+    def __call__(
+        self,
+        executable: str,
+        args: list[str],
+        *,
+        on_time: TimeCallback | None = None,
+    ) -> Awaitable[str]: ...
+
+
+class StderrBuffer:
+    """Guarda o cabeçalho e as últimas linhas do stderr, com memória limitada.
+
+    O cabeçalho vai até a primeira linha de stats (ou `head` linhas, o que
+    vier antes); o resto passa pelo ring de `tail` linhas.
+    """
+
+    def __init__(self, head: int = STDERR_HEAD_MAX_LINES, tail: int = STDERR_TAIL_LINES) -> None:
+        self._head_limit = head
+        self._head_done = False
+        self.head: list[str] = []
+        self.tail: deque[str] = deque(maxlen=tail)
+        self.dropped = 0
+        self._partial = ""
+
+    def feed(self, chunk: str) -> None:
+        parts = _LINE_SPLIT_RE.split(self._partial + chunk)
+        self._partial = parts.pop()
+        for line in parts:
+            if line:
+                self._append(line)
+
+    def close(self) -> None:
+        if self._partial:
+            self._append(self._partial)
+            self._partial = ""
+
+    def _append(self, line: str) -> None:
+        if not self._head_done and (_STATS_LINE_RE.match(line) or len(self.head) >= self._head_limit):
+            self._head_done = True
+        if not self._head_done:
+            self.head.append(line)
+            return
+        if len(self.tail) == self.tail.maxlen:
+            self.dropped += 1
+        self.tail.append(line)
+
+    def text(self) -> str:
+        lines = list(self.head)
+        if self.dropped:
+            lines.append(f"[... {self.dropped} linhas omitidas ...]")
+        lines.extend(self.tail)
+        return "\n".join(lines)
+
+
+async def run_ffmpeg(
+    executable: str,
+    args: list[str],
+    *,
+    on_time: TimeCallback | None = None,
+) -> str:
+    """Roda o ffmpeg e devolve o stderr (limitado); levanta RuntimeError se falhar."""
+    process = await asyncio.create_subprocess_exec(
+        executable,
+        "-progress",
+        "pipe:1",
+        "-nostats",
+        *args,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    assert process.stdout is not None and process.stderr is not None
+    stderr = StderrBuffer()
+    await asyncio.gather(
+        _read_progress(process.stdout, on_time),
+        _read_stderr(process.stderr, stderr),
+    )
+    returncode = await process.wait()
+    stderr.close()
+    if returncode != 0:
+        raise RuntimeError(f"ffmpeg exit {returncode}: {stderr.text()}".strip())
+    return stderr.text()
+
+
+async def _read_progress(stream: asyncio.StreamReader, on_time: TimeCallback | None) -> None:
+    while line := await stream.readline():
+        key, _, value = line.decode(errors="replace").strip().partition("=")
+        # `out_time_ms` é, apesar do nome, em microssegundos (igual a `out_time_us`).
+        if key in ("out_time_us", "out_time_ms") and on_time is not None:
+            try:
+                elapsed_us = int(value)
+            except ValueError:  # "N/A" antes do primeiro frame
+                continue
+            on_time(max(0, elapsed_us) // 1000)
+
+
+async def _read_stderr(stream: asyncio.StreamReader, buffer: StderrBuffer) -> None:
+    # Linhas de stats usam `\r`: lemos em blocos para não estourar o limite do readline.
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    while chunk := await stream.read(4096):
+        buffer.feed(decoder.decode(chunk))
+    buffer.feed(decoder.decode(b"", final=True))
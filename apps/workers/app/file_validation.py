@@ -105,6 +105,10 @@ def validate_file_prefix_on_disk(
     """
     with path.open("rb") as f:
         header = f.read(header_bytes)
+    return validate_header_prefix(header=header, allowed_prefixes=allowed_prefixes)
+
+
+def validate_header_prefix(*, header: bytes, allowed_prefixes: tuple[str, ...]) -> tuple[str, ...]:
     detected = detect_content_types_from_header(header)
     if not detected:
         raise ValueError("assinatura do arquivo desconhecida")
@@ -1,19 +1,24 @@
 from __future__ import annotations
 
-import asyncio
 import logging
 import shutil
 import tempfile
+from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
 from typing import Any
 
-from PIL import Image, ImageOps
+from PIL import ExifTags, Image, ImageOps, features
 
 from .api_client import patch_asset
-from .file_validation import validate_file_on_disk
+from .cpu_pool import run_cpu_bound
+from .file_validation import validate_magic_bytes
 from .settings import WorkerSettings, get_settings
+from .source_cache import get_source_cache
+from .source_fetch import SourceRejected, fetch_source, reject_source
 from .storage import StorageClient
-from .types import AssetJobPayload, VariantData, log_prefix
+from .types import AssetJobPayload, log_prefix
+from .uploads import PendingUpload, upload_derivatives
 
 logger = logging.getLogger(__name__)
 _SETTINGS: WorkerSettings = get_settings()
@@ -26,6 +31,84 @@ IMAGE_PRESETS: list[tuple[str, int]] = [
 ]
 
 
+@dataclass(frozen=True, slots=True)
+class EncoderProfile:
+    """Formato e esforço de encode de um preset.
+
+    `effort` segue a escala do `method` do WebP (0 = mais rápido, 6 = menor
+    arquivo). No AVIF vira `speed = 10 - effort`.
+    """
+
+    format: str
+    quality: int
+    effort: int
+
+    @property
+    def extension(self) -> str:
+        return self.format
+
+    @property
+    def content_type(self) -> str:
+        return f"image/{self.format}"
+
+    def save_kwargs(self) -> dict[str, Any]:
+        if self.format == "avif":
+            return {"format": "AVIF", "quality": self.quality, "speed": max(0, 10 - self.effort)}
+        return {"format": "WEBP", "quality": self.quality, "method": self.effort}
+
+
+_WEBP_THUMB = EncoderProfile("webp", quality=80, effort=4)
+_WEBP_CARD = EncoderProfile("webp", quality=82, effort=4)
+
+# Perfis por preset. Escolha via WORKER_IMAGE_ENCODER_PROFILE ou
+# `encoder_profile` no payload do job; compare com
+# `scripts/bench_image_encoders.py` antes de mudar o default.
+ENCODER_PROFILES: dict[str, dict[str, EncoderProfile]] = {
+    # Comportamento histórico: CPU máxima em todos os presets.
+    "max": {preset: EncoderProfile("webp", quality=90, effort=6) for preset, _ in IMAGE_PRESETS},
+    "balanced": {
+        "thumb": _WEBP_THUMB,
+        "card": _WEBP_CARD,
+        "full": EncoderProfile("webp", quality=85, effort=5),
+    },
+    "fast": {
+        "thumb": EncoderProfile("webp", quality=78, effort=2),
+        "card": EncoderProfile("webp", quality=80, effort=2),
+        "full": EncoderProfile("webp", quality=82, effort=3),
+    },
+    # AVIF só no `full`, que é o preset que mais pesa em egress.
+    "avif": {
+        "thumb": _WEBP_THUMB,
+        "card": _WEBP_CARD,
+        "full": EncoderProfile("avif", quality=60, effort=4),
+    },
+}
+
+
+def resolve_encoder_profiles(name: str | None) -> dict[str, EncoderProfile]:
+    """Perfis do nome pedido, com fallback para o default configurado."""
+    default_name = _SETTINGS.image_encoder_profile
+    profiles = ENCODER_PROFILES.get(name or default_name)
+    if profiles is None:
+        logger.warning("Perfil de encoder desconhecido %r; usando %r", name, default_name)
+        profiles = ENCODER_PROFILES.get(default_name, ENCODER_PROFILES["balanced"])
+    if any(profile.format == "avif" for profile in profiles.values()) and not features.check("avif"):
+        logger.warning("Pillow sem suporte a AVIF; usando WebP no lugar")
+        profiles = {
+            preset: ENCODER_PROFILES["balanced"][preset] if profile.format == "avif" else profile
+            for preset, profile in profiles.items()
+        }
+    return profiles
+
+
+# Orientações EXIF (5-8) que trocam largura/altura ao aplicar o transpose.
+_ORIENTATIONS_SWAPPING_AXES = frozenset({5, 6, 7, 8})
+# Folga da decodificação reduzida (draft) sobre o maior preset: mantém a
+# qualidade do LANCZOS final e ainda corta ~4x os pixels decodificados.
+_DRAFT_GAP = 2
+_REDUCING_GAP = 3.0
+
+
 async def create_thumbnail(payload: dict[str, Any], metadata: dict[str, Any]) -> None:
     job = AssetJobPayload.parse(payload, metadata)
     prefix = log_prefix(job.trace_id)
@@ -34,35 +117,45 @@ async def create_thumbnail(payload: dict[str, Any], metadata: dict[str, Any]) ->
     tmpdir = Path(tempfile.mkdtemp(dir=settings.tmp_dir, prefix="thumb-"))
     try:
         source_path = tmpdir / "original"
-        await storage.download_file(bucket=settings.bucket_uploads, key=job.key, destination=source_path)
-
-        # Validação de assinatura (magic bytes) antes de processar.
-        # Evita que arquivos maliciosos/inesperados cheguem ao PIL.
+        # Assinatura (magic bytes) validada por range GET antes do download:
+        # arquivos maliciosos/inesperados não chegam ao disco nem ao PIL.
         try:
-            validate_file_on_disk(path=source_path, declared_content_type=job.mime or "application/octet-stream")
-        except Exception as exc:
-            logger.warning(
-                "%sArquivo com assinatura inválida para asset %s (mime=%s): %s",
-                prefix,
-                job.asset_id,
-                job.mime,
-                exc,
+            await fetch_source(
+                storage,
+                bucket=settings.bucket_uploads,
+                key=job.key,
+                destination=source_path,
+                check_header=partial(
+                    validate_magic_bytes,
+                    declared_content_type=job.mime or "application/octet-stream",
+                ),
+                expected_sha256=job.sha256,
+                cache=get_source_cache(),
+            )
+        except SourceRejected as exc:
+            await reject_source(
+                storage,
+                bucket=settings.bucket_uploads,
+                key=job.key,
+                asset_id=job.asset_id,
+                exc=exc,
+                prefix=prefix,
             )
-            await patch_asset(job.asset_id, status="failed", error_code="invalid_file_signature", viewer_accessible=False)
-            try:
-                await storage.delete_object(bucket=settings.bucket_uploads, key=job.key)
-            except Exception:
-                pass
             return
 
         original_key = _canonical_original_key(job)
-        await storage.upload_file(
-            bucket=settings.bucket_derivatives,
+        original = PendingUpload(
             key=original_key,
             source=source_path,
             content_type=job.mime or "application/octet-stream",
         )
-        variants = await _generate_variants(tmpdir, source_path, job, storage, settings)
+        rendered = await _generate_variants(source_path, job)
+        variants = await upload_derivatives(
+            storage,
+            settings.bucket_derivatives,
+            [original, *rendered],
+            settings=settings,
+        )
         await patch_asset(
             job.asset_id,
             status="ready",
@@ -79,51 +172,81 @@ async def create_thumbnail(payload: dict[str, Any], metadata: dict[str, Any]) ->
         shutil.rmtree(tmpdir, ignore_errors=True)
 
 
-async def _generate_variants(
-    tmpdir: Path,
-    source: Path,
-    job: AssetJobPayload,
-    storage: StorageClient,
-    settings,
-) -> list[VariantData]:
-    processed = await asyncio.to_thread(_resize_variants, source)
-    variants: list[VariantData] = []
-    for preset, resized_path, width, height in processed:
-        dest_key = f"u/{job.account_id}/assets/{job.asset_id}/{preset}.webp"
-        await storage.upload_file(
-            bucket=settings.bucket_derivatives,
-            key=dest_key,
+async def _generate_variants(source: Path, job: AssetJobPayload) -> list[PendingUpload]:
+    profiles = resolve_encoder_profiles(job.encoder_profile)
+    processed = await run_cpu_bound(_resize_variants, source, profiles)
+    return [
+        PendingUpload(
+            key=f"u/{job.account_id}/assets/{job.asset_id}/{resized_path.name}",
             source=resized_path,
-            content_type="image/webp",
+            content_type=profiles[preset].content_type,
+            preset=preset,
+            kind="photo",
+            width_px=width,
+            height_px=height,
         )
-        variants.append(
-            VariantData(
-                preset=preset,
-                key=dest_key,
-                size_bytes=resized_path.stat().st_size,
-                width_px=width,
-                height_px=height,
-                kind="photo",
-            )
-        )
-    return variants
-
-
-def _resize_variants(source: Path) -> list[tuple[str, Path, int, int]]:
-    image = Image.open(source)
-    image = ImageOps.exif_transpose(image)
-    image = image.convert("RGB")
-    results: list[tuple[str, Path, int, int]] = []
-    for preset, max_width in IMAGE_PRESETS:
-        variant = image.copy()
-        variant.thumbnail((max_width, max_width * 2), Image.Resampling.LANCZOS)
-        width, height = variant.size
-        dest = source.parent / f"{preset}.webp"
-        variant.save(dest, format="WEBP", quality=90, method=6)
-        results.append((preset, dest, width, height))
+        for preset, resized_path, width, height in processed
+    ]
+
+
+def _resize_variants(
+    source: Path,
+    profiles: dict[str, EncoderProfile] | None = None,
+) -> list[tuple[str, Path, int, int]]:
+    """Gera os presets em pirâmide a partir de uma única decodificação.
+
+    - JPEG: `draft()` decodifica direto na escala DCT (1/2, 1/4, 1/8) mais
+      próxima que ainda cobre o maior preset com folga para o LANCZOS.
+    - Cada preset deriva do imediatamente maior (full -> card -> thumb), com
+      `reducing_gap` aplicando `reduce()` inteiro antes da reamostragem.
+    - Cada nível é liberado assim que o próximo menor é gerado.
+    """
+    profiles = profiles or resolve_encoder_profiles(None)
+    with Image.open(source) as image:
+        orientation = image.getexif().get(ExifTags.Base.Orientation, 1)
+        swaps_axes = orientation in _ORIENTATIONS_SWAPPING_AXES
+        width, height = image.size
+        if swaps_axes:
+            width, height = height, width
+        targets = [
+            (preset, _fit_within((width, height), (max_width, max_width * 2)))
+            for preset, max_width in sorted(IMAGE_PRESETS, key=lambda item: item[1], reverse=True)
+        ]
+
+        draft_width, draft_height = (dim * _DRAFT_GAP for dim in targets[0][1])
+        if swaps_axes:
+            draft_width, draft_height = draft_height, draft_width
+        image.draft("RGB", (draft_width, draft_height))
+        ImageOps.exif_transpose(image, in_place=True)
+        level = image if image.mode == "RGB" else image.convert("RGB")
+
+        results: list[tuple[str, Path, int, int]] = []
+        for preset, size in targets:
+            if level.size != size:
+                resized = level.resize(size, Image.Resampling.LANCZOS, reducing_gap=_REDUCING_GAP)
+                level.close()
+                level = resized
+            profile = profiles[preset]
+            dest = source.parent / f"{preset}.{profile.extension}"
+            level.save(dest, **profile.save_kwargs())
+            results.append((preset, dest, size[0], size[1]))
+        level.close()
+
+    order = {preset: index for index, (preset, _) in enumerate(IMAGE_PRESETS)}
+    results.sort(key=lambda item: order[item[0]])
     return results
 
 
+def _fit_within(size: tuple[int, int], box: tuple[int, int]) -> tuple[int, int]:
+    """Mesmo contrato de `Image.thumbnail`: cabe na caixa, nunca amplia."""
+    width, height = size
+    max_width, max_height = box
+    if width <= max_width and height <= max_height:
+        return size
+    scale = min(max_width / width, max_height / height)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
 def _canonical_original_key(job: AssetJobPayload) -> str:
     suffix = Path(job.key).suffix or ".bin"
     return f"u/{job.account_id}/assets/{job.asset_id}/original{suffix}"
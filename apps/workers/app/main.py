@@ -1,20 +1,52 @@
 import asyncio
 import logging
 import os
+import signal
+from typing import Callable
 
-from .queue import QueueConsumer
+from .cpu_pool import shutdown_cpu_executor
+from .queue import JobLane, QueueConsumer
 
-logging.basicConfig(
-    level=os.getenv("LOG_LEVEL", "INFO"),
-    format="%(asctime)s %(levelname)s [%(name)s] %(message)s",
-)
 
+def configure_logging(process_name: str | None = None) -> None:
+    # Com o supervisor, cada linha indica o processo (worker-N / supervisor).
+    process = f" {process_name}" if process_name else ""
+    logging.basicConfig(
+        level=os.getenv("LOG_LEVEL", "INFO"),
+        format=f"%(asctime)s %(levelname)s{process} [%(name)s] %(message)s",
+    )
 
-async def main() -> None:
+
+async def _heartbeat_loop(heartbeat: Callable[[], None], interval: float) -> None:
+    # Roda no próprio loop: um loop travado para de bater e o supervisor reinicia o processo.
+    while True:
+        heartbeat()
+        await asyncio.sleep(interval)
+
+
+async def main(
+    *,
+    lanes: list[JobLane] | None = None,
+    heartbeat: Callable[[], None] | None = None,
+    heartbeat_interval: float = 5.0,
+) -> None:
     concurrency = int(os.getenv("WORKER_CONCURRENCY", "2"))
-    consumer = QueueConsumer(concurrency=concurrency)
-    await consumer.run()
+    consumer = QueueConsumer(concurrency=concurrency, lanes=lanes)
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        try:
+            loop.add_signal_handler(sig, consumer.stop)
+        except NotImplementedError:  # pragma: no cover - Windows
+            pass
+    beat = asyncio.create_task(_heartbeat_loop(heartbeat, heartbeat_interval)) if heartbeat else None
+    try:
+        await consumer.run()
+    finally:
+        if beat is not None:
+            beat.cancel()
+        shutdown_cpu_executor()
 
 
 if __name__ == "__main__":
+    configure_logging()
     asyncio.run(main())
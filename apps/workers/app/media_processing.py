@@ -13,34 +13,65 @@ Supports:
 
 from __future__ import annotations
 
-import asyncio
+import json
 import logging
 import shutil
 import tempfile
 from datetime import datetime
+from functools import partial
 from pathlib import Path
-from typing import Any
+from typing import Any, TypedDict
+
+from PIL import Image, ImageOps
 
 from .api_client import patch_asset
-from .file_validation import validate_file_prefix_on_disk
+from .cpu_pool import run_cpu_bound
+from .ffmpeg_runner import run_ffmpeg
+from .file_validation import validate_header_prefix
+from .progress import JobProgress
 from .settings import WorkerSettings, get_settings
+from .source_cache import get_source_cache
+from .source_fetch import SourceRejected, fetch_source, reject_source
 from .storage import StorageClient
 from .types import VariantData
+from .uploads import PendingUpload, upload_derivatives
+from .video_plan import (
+    VideoTarget,
+    copy_output_args,
+    parse_ffmpeg_report,
+    plan_transcode,
+    probe_source,
+)
+from .video_segments import SegmentedOutput, should_segment, transcode_segmented
 
 logger = logging.getLogger(__name__)
 _SETTINGS: WorkerSettings = get_settings()
 _STORAGE = StorageClient(_SETTINGS)
 
 
-# Resolution presets matching client-side options
-RESOLUTION_PRESETS = {
-    "480p": {"width": 854, "height": 480, "bitrate": "1500k", "crf": 28},
-    "720p": {"width": 1280, "height": 720, "bitrate": "2500k", "crf": 23},
-    "1080p": {"width": 1920, "height": 1080, "bitrate": "5000k", "crf": 20},
+class ResolutionPreset(TypedDict):
+    width: int
+    height: int
+    bitrate: str
+    crf: int
+    max_copy_bitrate: int
+
+
+# Resolution presets matching client-side options.
+# Sources above `max_copy_bitrate` (bps) are re-encoded even when compatible.
+RESOLUTION_PRESETS: dict[str, ResolutionPreset] = {
+    "480p": {"width": 854, "height": 480, "bitrate": "1500k", "crf": 28, "max_copy_bitrate": 2_500_000},
+    "720p": {"width": 1280, "height": 720, "bitrate": "2500k", "crf": 23, "max_copy_bitrate": 5_000_000},
+    "1080p": {"width": 1920, "height": 1080, "bitrate": "5000k", "crf": 20, "max_copy_bitrate": 10_000_000},
 }
 
+class QualityPreset(TypedDict):
+    crf: int
+    preset: str
+
+
 # Quality presets
-QUALITY_PRESETS = {
+QUALITY_PRESETS: dict[str, QualityPreset] = {
     "low": {"crf": 28, "preset": "fast"},
     "medium": {"crf": 23, "preset": "medium"},
     "high": {"crf": 18, "preset": "slow"},
@@ -86,105 +117,141 @@ async def process_transcode_job(payload: dict[str, Any], metadata: dict[str, Any
     
     tmpdir = Path(tempfile.mkdtemp(dir=settings.tmp_dir, prefix=f"transcode-{job_id[:8]}-"))
     start_time = datetime.utcnow()
+    progress = JobProgress(payload.get("job_id"))
     
     try:
         logger.info("%sStarting transcode job %s for asset %s", prefix, job_id, asset_id)
         
         # Download source file
+        await progress.set_stage("downloading", 0.0)
         source_path = tmpdir / "source"
-        await storage.download_file(
-            bucket=settings.bucket_uploads,
-            key=source_key,
-            destination=source_path,
-        )
-        logger.info("%sDownloaded source file for job %s", prefix, job_id)
-
         try:
-            # O payload deste handler não traz o MIME com confiabilidade.
-            # Ainda assim, validar assinatura ajuda a bloquear casos óbvios.
-            validate_file_prefix_on_disk(path=source_path, allowed_prefixes=("video/",))
-        except Exception as exc:
-            logger.warning("%sArquivo com assinatura inválida (fallback transcode) asset=%s: %s", prefix, asset_id, exc)
-            await patch_asset(
-                asset_id,
-                status="failed",
-                error_code="invalid_file_signature",
-                viewer_accessible=False,
+            # O payload deste handler não traz o MIME com confiabilidade;
+            # o prefixo do tipo já bloqueia os casos óbvios antes do download.
+            await fetch_source(
+                storage,
+                bucket=settings.bucket_uploads,
+                key=source_key,
+                destination=source_path,
+                check_header=partial(validate_header_prefix, allowed_prefixes=("video/",)),
+                cache=get_source_cache(),
+            )
+        except SourceRejected as exc:
+            await reject_source(
+                storage,
+                bucket=settings.bucket_uploads,
+                key=source_key,
+                asset_id=asset_id,
+                exc=exc,
+                progress=progress,
+                prefix=prefix,
             )
-            try:
-                await storage.delete_object(bucket=settings.bucket_uploads, key=source_key)
-            except Exception:
-                pass
             return
+        logger.info("%sDownloaded source file for job %s", prefix, job_id)
         
         # Get resolution and quality settings
         res_config = RESOLUTION_PRESETS.get(resolution, RESOLUTION_PRESETS["720p"])
         quality_config = QUALITY_PRESETS.get(quality, QUALITY_PRESETS["medium"])
-        
+
+        # Probe once and decide between remux (copy) and re-encode.
+        await progress.set_stage("probing", 5.0)
+        probe = await probe_source(settings.ffprobe_path, source_path)
+        target = VideoTarget(
+            f"video_{resolution}",
+            res_config["width"],
+            res_config["height"],
+            max_bitrate=res_config["max_copy_bitrate"],
+        )
+        plan = plan_transcode(probe, [target], container=format_type)
+        output_plan = plan.outputs[0]
+        logger.info(
+            "%sTranscode plan for job %s: %s",
+            prefix, job_id, json.dumps(plan.as_dict(), sort_keys=True)
+        )
+
         # Build output filename
         output_filename = f"transcoded.{format_type}"
         output_path = tmpdir / output_filename
-        
+
         # Build ffmpeg command
-        args = [
-            "-y",
-            "-hide_banner",
-            "-i", str(source_path),
-            "-vf", f"scale={res_config['width']}:{res_config['height']}:force_original_aspect_ratio=decrease,pad={res_config['width']}:{res_config['height']}:(ow-iw)/2:(oh-ih)/2",
-        ]
-        
         if format_type == "webm":
-            args.extend([
+            video_args = [
                 "-c:v", "libvpx-vp9",
                 "-crf", str(quality_config["crf"]),
                 "-b:v", res_config["bitrate"],
-                "-c:a", "libopus",
-                "-b:a", "128k",
-            ])
+            ]
+            audio_args = ["-c:a", "libopus", "-b:a", "128k"]
+            container_args: list[str] = []
         else:  # mp4
-            args.extend([
+            video_args = [
                 "-c:v", "libx264",
                 "-preset", quality_config["preset"],
                 "-crf", str(quality_config["crf"]),
-                "-movflags", "+faststart",
-                "-c:a", "aac",
-                "-b:a", "128k",
-            ])
-        
-        args.append(str(output_path))
-        
-        # Run ffmpeg
-        await _run_ffmpeg(settings.ffmpeg_path, args)
-        logger.info("%sTranscoding complete for job %s", prefix, job_id)
-        
-        # Upload transcoded file
-        dest_key = f"media/processed/{asset_id}/transcoded_{resolution}.{format_type}"
+            ]
+            audio_args = ["-c:a", "aac", "-b:a", "128k"]
+            container_args = ["-movflags", "+faststart"]
+
+        # Run ffmpeg (long sources are split into chunks encoded in parallel)
+        await progress.set_stage("remuxing" if output_plan.action == "copy" else "transcoding")
+        on_time = progress.media_callback(probe.duration_ms, 5.0, 90.0)
+        if output_plan.action == "copy":
+            args = ["-y", "-hide_banner", "-i", str(source_path), *copy_output_args(output_path)]
+            report = parse_ffmpeg_report(await run_ffmpeg(settings.ffmpeg_path, args, on_time=on_time))
+        elif should_segment(probe.duration_ms, settings):
+            report = await transcode_segmented(
+                run_ffmpeg,
+                settings.ffmpeg_path,
+                source_path,
+                tmpdir / "segments",
+                [
+                    SegmentedOutput(
+                        path=output_path,
+                        video_filter=target.scale_filter(),
+                        video_args=video_args,
+                        audio_args=audio_args,
+                        container_args=container_args,
+                    )
+                ],
+                duration_ms=probe.duration_ms,
+                has_audio=probe.audio_codec is not None,
+                rotation=probe.rotation,
+                on_time=on_time,
+            )
+        else:
+            args = [
+                "-y", "-hide_banner",
+                "-i", str(source_path),
+                "-vf", target.scale_filter(),
+                *video_args,
+                *container_args,
+                *audio_args,
+                str(output_path),
+            ]
+            report = parse_ffmpeg_report(await run_ffmpeg(settings.ffmpeg_path, args, on_time=on_time))
+        logger.info("%sTranscoding complete for job %s (%s)", prefix, job_id, output_plan.action)
+
+        if output_plan.action == "copy":
+            width, height = probe.width, probe.height
+        else:
+            width, height = report.output_sizes.get(0, (0, 0))
+        duration_ms = probe.duration_ms or report.duration_ms
+
         content_type = "video/webm" if format_type == "webm" else "video/mp4"
-        
-        await storage.upload_file(
-            bucket=settings.bucket_derivatives,
-            key=dest_key,
-            source=output_path,
-            content_type=content_type,
-        )
-        
-        # Probe video for metadata
-        width, height, duration_ms = await _probe_video(settings.ffprobe_path, output_path)
-        
-        variants = [
-            VariantData(
+        uploads = [
+            PendingUpload(
+                key=f"media/processed/{asset_id}/transcoded_{resolution}.{format_type}",
+                source=output_path,
+                content_type=content_type,
                 preset=f"video_{resolution}",
-                key=dest_key,
-                size_bytes=output_path.stat().st_size,
-                width_px=width,
-                height_px=height,
                 kind="video",
+                width_px=width or None,
+                height_px=height or None,
             )
         ]
-        
+
         # Generate thumbnail if requested
-        thumbnail_key = None
         if generate_thumbnail:
+            await progress.set_stage("thumbnail", 85.0)
             thumb_path = tmpdir / "thumbnail.jpg"
             await _extract_thumbnail(
                 settings.ffmpeg_path,
@@ -194,26 +261,22 @@ async def process_transcode_job(payload: dict[str, Any], metadata: dict[str, Any
                 width=320,
                 height=180,
             )
-            
-            thumbnail_key = f"media/processed/{asset_id}/thumbnail.jpg"
-            await storage.upload_file(
-                bucket=settings.bucket_derivatives,
-                key=thumbnail_key,
-                source=thumb_path,
-                content_type="image/jpeg",
-            )
-            
-            variants.append(
-                VariantData(
+            uploads.append(
+                PendingUpload(
+                    key=f"media/processed/{asset_id}/thumbnail.jpg",
+                    source=thumb_path,
+                    content_type="image/jpeg",
                     preset="thumbnail",
-                    key=thumbnail_key,
-                    size_bytes=thumb_path.stat().st_size,
+                    kind="photo",
                     width_px=320,
                     height_px=180,
-                    kind="image",
                 )
             )
-        
+
+        # Vídeo e thumbnail sobem em paralelo
+        await progress.set_stage("uploading", 90.0)
+        variants = await upload_derivatives(storage, settings.bucket_derivatives, uploads, settings=settings)
+
         processing_time = (datetime.utcnow() - start_time).total_seconds()
         
         # Update asset with results
@@ -223,16 +286,18 @@ async def process_transcode_job(payload: dict[str, Any], metadata: dict[str, Any
             duration_ms=duration_ms,
             viewer_accessible=True,
             key_original=source_key,
-            variants=[v.__dict__ for v in variants],
+            variants=variants,
         )
         
+        await progress.complete()
         logger.info(
             "%sTranscode job %s completed in %.2fs for asset %s",
             prefix, job_id, processing_time, asset_id
         )
         
-    except Exception:
+    except Exception as exc:
         logger.exception("%sFailed transcode job %s for asset %s", prefix, job_id, asset_id)
+        await progress.fail(str(exc))
         await patch_asset(
             asset_id,
             status="failed",
@@ -285,109 +350,74 @@ async def process_image_optimize_job(payload: dict[str, Any], metadata: dict[str
     
     tmpdir = Path(tempfile.mkdtemp(dir=settings.tmp_dir, prefix=f"optimize-{job_id[:8]}-"))
     start_time = datetime.utcnow()
+    progress = JobProgress(payload.get("job_id"))
     
     try:
         logger.info("%sStarting image optimize job %s for asset %s", prefix, job_id, asset_id)
         
         # Download source file
+        await progress.set_stage("downloading", 0.0)
         source_path = tmpdir / "source"
-        await storage.download_file(
-            bucket=settings.bucket_uploads,
-            key=source_key,
-            destination=source_path,
-        )
-
         try:
-            validate_file_prefix_on_disk(path=source_path, allowed_prefixes=("image/",))
-        except Exception as exc:
-            logger.warning("%sArquivo com assinatura inválida (image optimize) asset=%s: %s", prefix, asset_id, exc)
-            await patch_asset(
-                asset_id,
-                status="failed",
-                error_code="invalid_file_signature",
-                viewer_accessible=False,
+            # Assinatura validada por range GET antes do download.
+            await fetch_source(
+                storage,
+                bucket=settings.bucket_uploads,
+                key=source_key,
+                destination=source_path,
+                check_header=partial(validate_header_prefix, allowed_prefixes=("image/",)),
+                cache=get_source_cache(),
+            )
+        except SourceRejected as exc:
+            await reject_source(
+                storage,
+                bucket=settings.bucket_uploads,
+                key=source_key,
+                asset_id=asset_id,
+                exc=exc,
+                progress=progress,
+                prefix=prefix,
             )
-            try:
-                await storage.delete_object(bucket=settings.bucket_uploads, key=source_key)
-            except Exception:
-                pass
             return
         
-        variants: list[VariantData] = []
-        
-        # Generate main optimized version
-        main_output = tmpdir / f"optimized.{format_type}"
-        await _optimize_image(
-            settings.ffmpeg_path,
+        # Main optimized version + size variants, all from a single decode,
+        # rendered in the CPU process pool (files are passed by path).
+        outputs: list[tuple[str, int, int]] = [("optimized", max_width, max_height)]
+        if generate_variants:
+            for vw in variant_widths:
+                if vw >= max_width:
+                    continue  # Skip variants larger than main
+                outputs.append((f"variant_{vw}", vw, int(vw * (max_height / max_width))))
+
+        await progress.set_stage("optimizing", 10.0)
+        rendered = await run_cpu_bound(
+            _optimize_image_variants,
             source_path,
-            main_output,
-            max_width,
-            max_height,
+            tmpdir,
+            outputs,
             quality,
             format_type,
         )
-        
-        main_key = f"media/processed/{asset_id}/optimized.{format_type}"
+
+        await progress.set_stage("uploading", 80.0)
         content_type = _get_image_content_type(format_type)
-        
-        await storage.upload_file(
-            bucket=settings.bucket_derivatives,
-            key=main_key,
-            source=main_output,
-            content_type=content_type,
-        )
-        
-        # Get dimensions
-        width, height = await _get_image_dimensions(settings.ffprobe_path, main_output)
-        
-        variants.append(
-            VariantData(
-                preset="optimized",
-                key=main_key,
-                size_bytes=main_output.stat().st_size,
-                width_px=width,
-                height_px=height,
-                kind="image",
-            )
-        )
-        
-        # Generate size variants if requested
-        if generate_variants:
-            for vw in variant_widths:
-                if vw >= max_width:
-                    continue  # Skip variants larger than main
-                
-                variant_output = tmpdir / f"variant_{vw}.{format_type}"
-                await _optimize_image(
-                    settings.ffmpeg_path,
-                    source_path,
-                    variant_output,
-                    vw,
-                    int(vw * (max_height / max_width)),
-                    quality,
-                    format_type,
-                )
-                
-                variant_key = f"media/processed/{asset_id}/variant_{vw}.{format_type}"
-                await storage.upload_file(
-                    bucket=settings.bucket_derivatives,
-                    key=variant_key,
-                    source=variant_output,
+        variants = await upload_derivatives(
+            storage,
+            settings.bucket_derivatives,
+            [
+                PendingUpload(
+                    key=f"media/processed/{asset_id}/{preset}.{format_type}",
+                    source=output_path,
                     content_type=content_type,
+                    preset=preset,
+                    kind="photo",
+                    width_px=vwidth,
+                    height_px=vheight,
                 )
-                
-                vwidth, vheight = await _get_image_dimensions(settings.ffprobe_path, variant_output)
-                
-                variants.append(
-                    VariantData(
-                        preset=f"variant_{vw}",
-                        key=variant_key,
-                        size_bytes=variant_output.stat().st_size,
-                        width_px=vwidth,
-                        height_px=vheight,
-                        kind="image",
-                    )
-                )
+                for preset, output_path, vwidth, vheight in rendered
+            ],
+            settings=settings,
+        )
         
         processing_time = (datetime.utcnow() - start_time).total_seconds()
         
@@ -396,16 +426,18 @@ async def process_image_optimize_job(payload: dict[str, Any], metadata: dict[str
             status="ready",
             viewer_accessible=True,
             key_original=source_key,
-            variants=[v.__dict__ for v in variants],
+            variants=variants,
         )
         
+        await progress.complete()
         logger.info(
             "%sImage optimize job %s completed in %.2fs for asset %s with %d variants",
             prefix, job_id, processing_time, asset_id, len(variants)
         )
         
-    except Exception:
+    except Exception as exc:
         logger.exception("%sFailed image optimize job %s for asset %s", prefix, job_id, asset_id)
+        await progress.fail(str(exc))
         await patch_asset(
             asset_id,
             status="failed",
@@ -453,33 +485,36 @@ async def process_thumbnail_job(payload: dict[str, Any], metadata: dict[str, Any
     format_type = options.get("format", "jpeg")
     
     tmpdir = Path(tempfile.mkdtemp(dir=settings.tmp_dir, prefix=f"thumb-{job_id[:8]}-"))
+    progress = JobProgress(payload.get("job_id"))
     
     try:
         logger.info("%sStarting thumbnail job %s for asset %s", prefix, job_id, asset_id)
         
+        await progress.set_stage("downloading", 0.0)
         source_path = tmpdir / "source"
-        await storage.download_file(
-            bucket=settings.bucket_uploads,
-            key=source_key,
-            destination=source_path,
-        )
-
         try:
-            validate_file_prefix_on_disk(path=source_path, allowed_prefixes=("video/",))
-        except Exception as exc:
-            logger.warning("%sArquivo com assinatura inválida (thumbnail) asset=%s: %s", prefix, asset_id, exc)
-            await patch_asset(
-                asset_id,
-                status="failed",
-                error_code="invalid_file_signature",
-                viewer_accessible=False,
+            # Assinatura validada por range GET antes do download.
+            await fetch_source(
+                storage,
+                bucket=settings.bucket_uploads,
+                key=source_key,
+                destination=source_path,
+                check_header=partial(validate_header_prefix, allowed_prefixes=("video/",)),
+                cache=get_source_cache(),
+            )
+        except SourceRejected as exc:
+            await reject_source(
+                storage,
+                bucket=settings.bucket_uploads,
+                key=source_key,
+                asset_id=asset_id,
+                exc=exc,
+                progress=progress,
+                prefix=prefix,
             )
-            try:
-                await storage.delete_object(bucket=settings.bucket_uploads, key=source_key)
-            except Exception:
-                pass
             return
         
+        await progress.set_stage("extracting", 30.0)
         output_path = tmpdir / f"thumbnail.{format_type}"
         await _extract_thumbnail(
             settings.ffmpeg_path,
@@ -504,20 +539,24 @@ async def process_thumbnail_job(payload: dict[str, Any], metadata: dict[str, Any
             asset_id,
             status="ready",
             viewer_accessible=True,
-            variants=[{
-                "preset": "thumbnail",
-                "key": thumbnail_key,
-                "size_bytes": output_path.stat().st_size,
-                "width_px": width,
-                "height_px": height,
-                "kind": "image",
-            }],
+            variants=[
+                VariantData(
+                    preset="thumbnail",
+                    key=thumbnail_key,
+                    size_bytes=output_path.stat().st_size,
+                    kind="photo",
+                    width_px=width,
+                    height_px=height,
+                )
+            ],
         )
         
+        await progress.complete()
         logger.info("%sThumbnail job %s completed for asset %s", prefix, job_id, asset_id)
         
-    except Exception:
+    except Exception as exc:
         logger.exception("%sFailed thumbnail job %s for asset %s", prefix, job_id, asset_id)
+        await progress.fail(str(exc))
         await patch_asset(
             asset_id,
             status="failed",
@@ -533,72 +572,6 @@ async def process_thumbnail_job(payload: dict[str, Any], metadata: dict[str, Any
 # Helper Functions
 # ============================================================
 
-async def _run_ffmpeg(executable: str, args: list[str]) -> None:
-    """Run ffmpeg with given arguments."""
-    process = await asyncio.create_subprocess_exec(
-        executable,
-        *args,
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
-    )
-    stdout, stderr = await process.communicate()
-    if process.returncode != 0:
-        raise RuntimeError(
-            f"ffmpeg exit {process.returncode}: {stderr.decode() or stdout.decode()}".strip()
-        )
-
-
-async def _probe_video(executable: str, path: Path) -> tuple[int, int, int]:
-    """Probe video for dimensions and duration."""
-    import json
-    
-    process = await asyncio.create_subprocess_exec(
-        executable,
-        "-v", "error",
-        "-select_streams", "v:0",
-        "-show_entries", "stream=width,height",
-        "-show_entries", "format=duration",
-        "-print_format", "json",
-        str(path),
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
-    )
-    stdout, stderr = await process.communicate()
-    if process.returncode != 0:
-        raise RuntimeError(f"ffprobe exit {process.returncode}: {stderr.decode()}")
-    
-    data = json.loads(stdout.decode() or "{}")
-    width = int((data.get("streams") or [{}])[0].get("width") or 0)
-    height = int((data.get("streams") or [{}])[0].get("height") or 0)
-    duration_raw = data.get("format", {}).get("duration")
-    duration_ms = int(float(duration_raw) * 1000) if duration_raw else 0
-    return width, height, duration_ms
-
-
-async def _get_image_dimensions(executable: str, path: Path) -> tuple[int, int]:
-    """Get image dimensions using ffprobe."""
-    import json
-    
-    process = await asyncio.create_subprocess_exec(
-        executable,
-        "-v", "error",
-        "-select_streams", "v:0",
-        "-show_entries", "stream=width,height",
-        "-print_format", "json",
-        str(path),
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
-    )
-    stdout, stderr = await process.communicate()
-    if process.returncode != 0:
-        raise RuntimeError(f"ffprobe exit {process.returncode}: {stderr.decode()}")
-    
-    data = json.loads(stdout.decode() or "{}")
-    width = int((data.get("streams") or [{}])[0].get("width") or 0)
-    height = int((data.get("streams") or [{}])[0].get("height") or 0)
-    return width, height
-
-
 async def _extract_thumbnail(
     executable: str,
     source: Path,
@@ -608,7 +581,7 @@ async def _extract_thumbnail(
     height: int,
 ) -> None:
     """Extract a thumbnail from a video."""
-    await _run_ffmpeg(executable, [
+    await run_ffmpeg(executable, [
         "-ss", str(time_seconds),
         "-i", str(source),
         "-vf", f"scale={width}:{height}:force_original_aspect_ratio=decrease",
@@ -618,32 +591,39 @@ async def _extract_thumbnail(
     ])
 
 
-async def _optimize_image(
-    executable: str,
+def _optimize_image_variants(
     source: Path,
-    output: Path,
-    max_width: int,
-    max_height: int,
+    output_dir: Path,
+    outputs: list[tuple[str, int, int]],
     quality: int,
     format_type: str,
-) -> None:
-    """Optimize an image with resize and compression."""
-    # Quality mapping (1-100 to ffmpeg scale)
-    q_value = max(1, min(31, int((100 - quality) / 3) + 1))
-    
-    args = [
-        "-i", str(source),
-        "-vf", f"scale='min({max_width},iw)':min'({max_height},ih)':force_original_aspect_ratio=decrease",
-    ]
-    
-    if format_type == "webp":
-        args.extend(["-quality", str(quality)])
-    else:
-        args.extend(["-q:v", str(q_value)])
-    
-    args.extend(["-y", str(output)])
-    
-    await _run_ffmpeg(executable, args)
+) -> list[tuple[str, Path, int, int]]:
+    """Resize and compress one image into several bounding boxes.
+
+    Runs inside the CPU process pool: decodes the source once and never
+    upscales (same semantics as ffmpeg's force_original_aspect_ratio=decrease).
+    """
+    image: Image.Image = Image.open(source)
+    image = ImageOps.exif_transpose(image)
+    if image.mode not in ("RGB", "RGBA"):
+        has_alpha = "A" in image.getbands() or "transparency" in image.info
+        image = image.convert("RGBA" if has_alpha else "RGB")
+    if format_type in ("jpeg", "jpg") and image.mode == "RGBA":
+        image = image.convert("RGB")
+
+    results: list[tuple[str, Path, int, int]] = []
+    for preset, box_width, box_height in outputs:
+        variant = image.copy()
+        variant.thumbnail((box_width, box_height), Image.Resampling.LANCZOS)
+        dest = output_dir / f"{preset}.{format_type}"
+        if format_type == "webp":
+            variant.save(dest, format="WEBP", quality=quality, method=4)
+        elif format_type == "png":
+            variant.save(dest, format="PNG", optimize=True)
+        else:
+            variant.save(dest, format="JPEG", quality=quality, optimize=True, progressive=True)
+        results.append((preset, dest, variant.width, variant.height))
+    return results
 
 
 def _get_image_content_type(format_type: str) -> str:
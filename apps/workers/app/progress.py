@@ -0,0 +1,100 @@
+"""Progresso de jobs de processamento (`media.*`) enviado para a API.
+
+O ffmpeg reporta `out_time` várias vezes por segundo; aqui isso vira um
+percentual por etapa e é enviado no máximo a cada
+`WORKER_PROGRESS_INTERVAL_SECONDS` (mudanças de etapa saem na hora). Falhas
+ao enviar só geram log: progresso nunca derruba o job.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable
+
+from .api_client import patch_processing_job
+from .ffmpeg_runner import TimeCallback
+from .settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+ProgressSender = Callable[..., Awaitable[None]]
+
+
+class JobProgress:
+    def __init__(
+        self,
+        job_id: str | None,
+        *,
+        min_interval: float | None = None,
+        sender: ProgressSender = patch_processing_job,
+    ) -> None:
+        self.job_id = job_id
+        self.stage: str | None = None
+        self.progress = 0.0
+        self._min_interval = get_settings().progress_interval_seconds if min_interval is None else min_interval
+        self._sender = sender
+        self._last_sent_at = 0.0
+        self._sent: tuple[str | None, float] | None = None
+        self._inflight: asyncio.Task[None] | None = None
+
+    async def set_stage(self, stage: str, progress: float | None = None) -> None:
+        self.stage = stage
+        if progress is not None:
+            self.progress = max(self.progress, min(100.0, progress))
+        await self._push(status="processing")
+
+    def observe(self, progress: float) -> None:
+        """Atualiza o percentual; envia em background se o intervalo já passou."""
+        self.progress = max(self.progress, min(100.0, progress))
+        if self.job_id is None or (self._inflight is not None and not self._inflight.done()):
+            return
+        if time.monotonic() - self._last_sent_at < self._min_interval:
+            return
+        self._inflight = asyncio.ensure_future(self._push(status="processing"))
+
+    def media_callback(self, duration_ms: int, start: float, end: float) -> TimeCallback | None:
+        """Converte o `out_time` do ffmpeg para a faixa [start, end] do job."""
+        if self.job_id is None or duration_ms <= 0:
+            return None
+
+        def _on_time(elapsed_ms: int) -> None:
+            self.observe(start + (end - start) * min(1.0, elapsed_ms / duration_ms))
+
+        return _on_time
+
+    async def complete(self) -> None:
+        await self._drain()
+        self.stage = "completed"
+        self.progress = 100.0
+        await self._push(status="completed")
+
+    async def fail(self, error_message: str) -> None:
+        await self._drain()
+        await self._push(status="failed", error_message=error_message[:500])
+
+    async def _drain(self) -> None:
+        if self._inflight is not None:
+            await asyncio.gather(self._inflight, return_exceptions=True)
+            self._inflight = None
+
+    async def _push(self, *, status: str, error_message: str | None = None) -> None:
+        if self.job_id is None:
+            return
+        state = (self.stage, round(self.progress, 1))
+        if status == "processing" and state == self._sent:
+            return
+        self._last_sent_at = time.monotonic()
+        try:
+            await self._sender(
+                self.job_id,
+                status=status,
+                progress=self.progress,
+                stage=self.stage,
+                error_message=error_message,
+            )
+        except Exception:  # pragma: no cover - API fora do ar não derruba o job
+            logger.warning("Falha ao reportar progresso do job %s", self.job_id, exc_info=True)
+            return
+        self._sent = state
@@ -14,6 +14,13 @@ def _env_bool(name: str, default: bool) -> bool:
     return raw.strip().lower() in {"1", "true", "yes", "on"}
 
 
+def _available_cpus() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # pragma: no cover - macOS/Windows
+        return os.cpu_count() or 1
+
+
 def _env(name: str, *fallbacks: str, default: str | None = None) -> str | None:
     candidates = (name, *fallbacks)
     for candidate in candidates:
@@ -41,6 +48,27 @@ class WorkerSettings:
     tmp_dir: Path
     ffmpeg_path: str
     ffprobe_path: str
+    cpu_pool_size: int
+    cpu_pool_max_tasks_per_child: int
+    image_encoder_profile: str
+    video_segment_min_seconds: int
+    video_segment_threads: int
+    video_thread_budget: int
+    progress_interval_seconds: float
+    storage_max_pool_connections: int
+    storage_multipart_chunk_mb: int
+    upload_job_concurrency: int
+    upload_process_concurrency: int
+    source_cache_mb: int
+    source_cache_min_free_mb: int
+    export_part_mb: int
+    export_download_concurrency: int
+    export_checkpoint_seconds: float
+    api_batch_window_ms: int
+    api_batch_max_size: int
+    worker_processes: int
+    worker_stall_seconds: float
+    worker_health_file: Path
 
 
 @lru_cache(maxsize=1)
@@ -78,6 +106,9 @@ def get_settings() -> WorkerSettings:
     tmp_base.mkdir(parents=True, exist_ok=True)
     ffmpeg_path = os.getenv("FFMPEG_PATH", "ffmpeg")
     ffprobe_path = os.getenv("FFPROBE_PATH", "ffprobe")
+    # 0 desliga o pool de processos (trabalho CPU-bound volta para threads).
+    cpu_pool_size = int(os.getenv("WORKER_CPU_POOL_SIZE", str(_available_cpus())))
+    cpu_pool_max_tasks_per_child = int(os.getenv("WORKER_CPU_POOL_MAX_TASKS_PER_CHILD", "50"))
     return WorkerSettings(
         database_url=database_url or "",
         api_base_url=api_base_url,
@@ -93,6 +124,27 @@ def get_settings() -> WorkerSettings:
         tmp_dir=tmp_base,
         ffmpeg_path=ffmpeg_path,
         ffprobe_path=ffprobe_path,
+        cpu_pool_size=cpu_pool_size,
+        cpu_pool_max_tasks_per_child=cpu_pool_max_tasks_per_child,
+        image_encoder_profile=os.getenv("WORKER_IMAGE_ENCODER_PROFILE", "balanced"),
+        video_segment_min_seconds=int(os.getenv("WORKER_VIDEO_SEGMENT_MIN_SECONDS", "300")),
+        video_segment_threads=int(os.getenv("WORKER_VIDEO_SEGMENT_THREADS", "2")),
+        video_thread_budget=int(os.getenv("WORKER_VIDEO_THREAD_BUDGET", str(_available_cpus()))),
+        progress_interval_seconds=float(os.getenv("WORKER_PROGRESS_INTERVAL_SECONDS", "2")),
+        storage_max_pool_connections=int(os.getenv("WORKER_STORAGE_MAX_POOL_CONNECTIONS", "32")),
+        storage_multipart_chunk_mb=int(os.getenv("WORKER_STORAGE_MULTIPART_CHUNK_MB", "16")),
+        upload_job_concurrency=int(os.getenv("WORKER_UPLOAD_JOB_CONCURRENCY", "4")),
+        upload_process_concurrency=int(os.getenv("WORKER_UPLOAD_PROCESS_CONCURRENCY", "16")),
+        source_cache_mb=int(os.getenv("WORKER_SOURCE_CACHE_MB", "2048")),
+        source_cache_min_free_mb=int(os.getenv("WORKER_SOURCE_CACHE_MIN_FREE_MB", "1024")),
+        export_part_mb=int(os.getenv("WORKER_EXPORT_PART_MB", "64")),
+        export_download_concurrency=int(os.getenv("WORKER_EXPORT_DOWNLOAD_CONCURRENCY", "4")),
+        export_checkpoint_seconds=float(os.getenv("WORKER_EXPORT_CHECKPOINT_SECONDS", "30")),
+        api_batch_window_ms=int(os.getenv("WORKER_API_BATCH_WINDOW_MS", "50")),
+        api_batch_max_size=int(os.getenv("WORKER_API_BATCH_MAX_SIZE", "100")),
+        worker_processes=int(os.getenv("WORKER_PROCESSES", str(_available_cpus()))),
+        worker_stall_seconds=float(os.getenv("WORKER_STALL_SECONDS", "120")),
+        worker_health_file=Path(os.getenv("WORKER_HEALTH_FILE", str(tmp_base / "worker-health.json"))),
     )
 
 
@@ -0,0 +1,145 @@
+"""Cache local (LRU em disco) dos originais baixados pelos workers.
+
+`image.thumbnail`, `media.optimize_image` e `media.thumbnail` de um mesmo
+asset, além dos retries, baixavam o mesmo original várias vezes. As
+entradas ficam em `WORKER_TMP_DIR/source-cache`, com chave bucket/key/ETag
+(um objeto sobrescrito ganha outra ETag e outra entrada). Os jobs recebem
+um hardlink no próprio tmpdir: apagar o tmpdir ou despejar a entrada não
+afeta o outro lado. Entradas são somente leitura para que nenhum job
+altere o arquivo compartilhado.
+
+O despejo remove as entradas menos usadas (mtime, tocado a cada hit) até o
+total caber em `WORKER_SOURCE_CACHE_MB` e o disco ter ao menos
+`WORKER_SOURCE_CACHE_MIN_FREE_MB` livres.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+import shutil
+import stat
+import time
+import uuid
+import weakref
+from pathlib import Path
+
+from .settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+_MB = 1024 * 1024
+_SHA_SUFFIX = ".sha256"
+_STAGING_DIR = ".staging"
+# Restos de downloads interrompidos (crash do processo) mais velhos que isso são apagados.
+_STALE_STAGING_SECONDS = 3600
+
+
+class SourceCache:
+    def __init__(self, root: Path, *, max_bytes: int, min_free_bytes: int) -> None:
+        self.root = root
+        self.max_bytes = max_bytes
+        self.min_free_bytes = min_free_bytes
+        self._locks: weakref.WeakValueDictionary[str, asyncio.Lock] = weakref.WeakValueDictionary()
+        staging = root / _STAGING_DIR
+        staging.mkdir(parents=True, exist_ok=True)
+        cutoff = time.time() - _STALE_STAGING_SECONDS
+        for leftover in staging.iterdir():
+            try:
+                if leftover.stat().st_mtime < cutoff:
+                    leftover.unlink()
+            except FileNotFoundError:
+                pass
+
+    @staticmethod
+    def entry_name(bucket: str, key: str, etag: str) -> str:
+        return hashlib.sha256(f"{bucket}\0{key}\0{etag}".encode()).hexdigest()
+
+    def accepts(self, size_bytes: int) -> bool:
+        return 0 < size_bytes <= self.max_bytes
+
+    def lock(self, name: str) -> asyncio.Lock:
+        # Só serializa jobs do mesmo processo; entre processos o rename atômico basta.
+        lock = self._locks.get(name)
+        if lock is None:
+            lock = self._locks[name] = asyncio.Lock()
+        return lock
+
+    def lookup(self, name: str) -> tuple[Path, str] | None:
+        """Entrada e sha256 do conteúdo, ou None; um hit a torna a mais recente."""
+        path = self.root / name
+        try:
+            sha256 = (self.root / f"{name}{_SHA_SUFFIX}").read_text().strip()
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path, sha256
+
+    def staging_path(self) -> Path:
+        return self.root / _STAGING_DIR / uuid.uuid4().hex
+
+    def store(self, name: str, staged: Path, sha256: str) -> Path:
+        path = self.root / name
+        staged.chmod(stat.S_IRUSR | stat.S_IRGRP)
+        # Sidecar antes do arquivo: uma entrada visível sempre tem o hash.
+        sidecar = self.staging_path()
+        sidecar.write_text(sha256)
+        os.replace(sidecar, self.root / f"{name}{_SHA_SUFFIX}")
+        os.replace(staged, path)
+        return path
+
+    def hand_out(self, entry: Path, destination: Path) -> None:
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.link(entry, destination)
+        except OSError:
+            # Outro filesystem (WORKER_TMP_DIR montado em outro volume) ou sem suporte a hardlink.
+            shutil.copyfile(entry, destination)
+
+    def evict(self) -> int:
+        """Remove as entradas mais antigas até respeitar orçamento e folga de disco."""
+        entries: list[tuple[float, int, Path]] = []
+        for path in self.root.iterdir():
+            if path.name == _STAGING_DIR or path.name.endswith(_SHA_SUFFIX):
+                continue
+            try:
+                info = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((info.st_mtime, info.st_size, path))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in entries:
+            if total <= self.max_bytes and shutil.disk_usage(self.root).free >= self.min_free_bytes:
+                break
+            for victim in (path, path.with_name(f"{path.name}{_SHA_SUFFIX}")):
+                try:
+                    victim.unlink()
+                except FileNotFoundError:
+                    pass
+            total -= size
+            removed += 1
+        if removed:
+            logger.info("Cache de originais: %s entradas despejadas (%s MB restantes)", removed, total // _MB)
+        return removed
+
+
+_CACHE: SourceCache | None = None
+
+
+def get_source_cache() -> SourceCache | None:
+    """Cache do processo; None quando `WORKER_SOURCE_CACHE_MB=0`."""
+    global _CACHE
+    settings = get_settings()
+    if settings.source_cache_mb <= 0:
+        return None
+    if _CACHE is None:
+        _CACHE = SourceCache(
+            settings.tmp_dir / "source-cache",
+            max_bytes=settings.source_cache_mb * _MB,
+            min_free_bytes=settings.source_cache_min_free_mb * _MB,
+        )
+    return _CACHE
@@ -0,0 +1,183 @@
+"""Download da origem com rejeição antecipada e sha256 incremental.
+
+Antes, o arquivo inteiro era baixado e só então os primeiros 512 bytes eram
+validados: um upload de 2GB com assinatura falsa consumia o download todo.
+Aqui o cabeçalho vem por range GET e é validado antes de qualquer outro
+byte; o restante do corpo é transmitido direto para o disco (a partir do
+fim do cabeçalho, sem reler) enquanto o sha256 é calculado, e comparado ao
+`Asset.sha256` declarado no upload.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import re
+import uuid
+from pathlib import Path
+from typing import Any, BinaryIO, Callable
+
+from .api_client import patch_asset
+from .progress import JobProgress
+from .source_cache import SourceCache
+from .storage import StorageClient
+
+logger = logging.getLogger(__name__)
+
+HEADER_BYTES = 512
+
+_SHA256_HEX_RE = re.compile(r"^[0-9a-fA-F]{64}$")
+
+
+class SourceRejected(ValueError):
+    """Origem recusada; `code` vira o `error_code` do asset."""
+
+    def __init__(self, code: str, message: str) -> None:
+        super().__init__(message)
+        self.code = code
+
+    @property
+    def discards_source(self) -> bool:
+        """Só assinatura inválida apaga o upload; checksum divergente pode vir de um download corrompido."""
+        return self.code == "invalid_file_signature"
+
+
+async def reject_source(
+    storage: StorageClient,
+    *,
+    bucket: str,
+    key: str,
+    asset_id: uuid.UUID,
+    exc: SourceRejected,
+    progress: JobProgress | None = None,
+    prefix: str = "",
+) -> None:
+    """Marca o asset como falho com `exc.code` e apaga o upload se a origem não tem salvação."""
+    logger.warning("%sOrigem recusada para asset %s (%s, key=%s): %s", prefix, asset_id, exc.code, key, exc)
+    if progress is not None:
+        await progress.fail(exc.code)
+    await patch_asset(asset_id, status="failed", error_code=exc.code, viewer_accessible=False)
+    if exc.discards_source:
+        try:
+            await storage.delete_object(bucket=bucket, key=key)
+        except Exception:
+            logger.warning("%sNão foi possível apagar o upload recusado %s", prefix, key, exc_info=True)
+
+
+async def fetch_source(
+    storage: StorageClient,
+    *,
+    bucket: str,
+    key: str,
+    destination: Path,
+    check_header: Callable[..., object],
+    expected_sha256: str | None = None,
+    cache: SourceCache | None = None,
+) -> str:
+    """Valida o cabeçalho, baixa o objeto e devolve o sha256 (hex) do conteúdo.
+
+    `check_header(header=...)` recebe os primeiros `HEADER_BYTES` e levanta
+    para recusar (ex.: `partial(validate_magic_bytes, declared_content_type=...)`).
+    Levanta `SourceRejected` (assinatura, ou checksum que diverge também num
+    segundo download); erros de storage sobem
+    como estão, para a fila tentar de novo. Com `cache`, um original já
+    baixado (mesma ETag) é entregue por hardlink, sem ler o storage.
+    """
+    if cache is None:
+        return await _download(storage, bucket, key, destination, check_header, expected_sha256)
+
+    head = await storage.head_object(bucket=bucket, key=key)
+    if not cache.accepts(head.size):
+        return await _download(storage, bucket, key, destination, check_header, expected_sha256)
+
+    name = cache.entry_name(bucket, key, head.etag)
+    async with cache.lock(name):
+        hit = await asyncio.to_thread(cache.lookup, name)
+        if hit is not None:
+            entry, sha256 = hit
+            # Os checks dependem do job (MIME declarado, hash esperado): repete sobre a cópia local.
+            _check_header(check_header, await asyncio.to_thread(_read_header, entry))
+            _check_sha256(key, sha256, expected_sha256)
+            await asyncio.to_thread(cache.hand_out, entry, destination)
+            logger.info("Original de %s servido pelo cache local", key)
+            return sha256
+
+        staged = cache.staging_path()
+        try:
+            sha256 = await _download(storage, bucket, key, staged, check_header, expected_sha256)
+        except BaseException:
+            staged.unlink(missing_ok=True)
+            raise
+        entry = await asyncio.to_thread(cache.store, name, staged, sha256)
+        await asyncio.to_thread(cache.hand_out, entry, destination)
+    await asyncio.to_thread(cache.evict)
+    return sha256
+
+
+async def _download(
+    storage: StorageClient,
+    bucket: str,
+    key: str,
+    destination: Path,
+    check_header: Callable[..., object],
+    expected_sha256: str | None,
+) -> str:
+    header = await storage.read_range(bucket=bucket, key=key, start=0, end=HEADER_BYTES - 1)
+    _check_header(check_header, header)
+
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    sha256 = await _stream_body(storage, bucket, key, destination, header)
+    if not _sha256_matches(sha256, expected_sha256):
+        # Um stream truncado/corrompido também diverge: baixa o objeto inteiro de novo antes de recusar.
+        logger.warning("sha256 divergente para %s; baixando novamente", key)
+        header = await storage.read_range(bucket=bucket, key=key, start=0, end=HEADER_BYTES - 1)
+        sha256 = await _stream_body(storage, bucket, key, destination, header)
+    _check_sha256(key, sha256, expected_sha256)
+    return sha256
+
+
+async def _stream_body(storage: StorageClient, bucket: str, key: str, destination: Path, header: bytes) -> str:
+    digest = hashlib.sha256()
+    with destination.open("wb") as target:
+        await asyncio.to_thread(_write_chunk, target, digest, header)
+        if len(header) == HEADER_BYTES:
+            async for chunk in storage.iter_object(bucket=bucket, key=key, start=HEADER_BYTES):
+                # Hash e escrita fora do loop: blocos de 1MB em disco lento travariam os outros jobs.
+                await asyncio.to_thread(_write_chunk, target, digest, chunk)
+    return digest.hexdigest()
+
+
+def _check_header(check_header: Callable[..., object], header: bytes) -> None:
+    try:
+        check_header(header=header)
+    except Exception as exc:
+        raise SourceRejected("invalid_file_signature", str(exc)) from exc
+
+
+def _sha256_matches(sha256: str, expected_sha256: str | None) -> bool:
+    if not expected_sha256 or not _SHA256_HEX_RE.match(expected_sha256):
+        return True
+    return expected_sha256.lower() == sha256
+
+
+def _check_sha256(key: str, sha256: str, expected_sha256: str | None) -> None:
+    if not expected_sha256:
+        return
+    if not _SHA256_HEX_RE.match(expected_sha256):
+        logger.debug("sha256 declarado fora do formato hex; verificação ignorada para %s", key)
+    elif expected_sha256.lower() != sha256:
+        raise SourceRejected(
+            "checksum_mismatch",
+            f"sha256 não confere (declarado {expected_sha256.lower()}, recebido {sha256})",
+        )
+
+
+def _read_header(path: Path) -> bytes:
+    with path.open("rb") as source:
+        return source.read(HEADER_BYTES)
+
+
+def _write_chunk(target: BinaryIO, digest: Any, chunk: bytes) -> None:
+    digest.update(chunk)
+    target.write(chunk)
@@ -1,40 +1,144 @@
 from __future__ import annotations
 
+import asyncio
 import logging
-from contextlib import asynccontextmanager
+import math
+import weakref
+from contextlib import AsyncExitStack
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, AsyncIterator
 
 import aioboto3
+from boto3.s3.transfer import TransferConfig
 from botocore.config import Config
+from botocore.exceptions import ClientError
 
 from .settings import WorkerSettings, get_settings
 
 logger = logging.getLogger(__name__)
 
+_MB = 1024 * 1024
+# Limite do S3 para partes de um multipart upload.
+_MAX_MULTIPART_PARTS = 10_000
+# Partes enviadas em paralelo por arquivo (dentro do multipart).
+_MULTIPART_PART_CONCURRENCY = 4
+
+
+@dataclass(frozen=True, slots=True)
+class ObjectHead:
+    size: int
+    etag: str
+
+
+class _LoopClient:
+    """Cliente S3 aberto uma vez e reaproveitado por todos os jobs de um loop."""
+
+    def __init__(self, stack: AsyncExitStack, client: Any) -> None:
+        self.stack = stack
+        self.client = client
+
+
+# Um cliente por (event loop, credenciais): aiobotocore não é seguro entre
+# loops, mas dentro do loop o pool de conexões é compartilhado pelos jobs.
+_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[tuple[Any, ...], asyncio.Task[_LoopClient]]]" = (
+    weakref.WeakKeyDictionary()
+)
+
 
 class StorageClient:
     def __init__(self, settings: WorkerSettings | None = None) -> None:
         self._settings = settings or get_settings()
         self._session = aioboto3.Session()
+        s3_config: dict[str, Any] = {"addressing_style": "path"} if self._settings.force_path_style else {}
         self._client_kwargs = {
             "endpoint_url": self._settings.storage_endpoint,
             "region_name": self._settings.storage_region,
             "aws_access_key_id": self._settings.storage_access_key,
             "aws_secret_access_key": self._settings.storage_secret_key,
-            "config": Config(s3={"addressing_style": "path"}) if self._settings.force_path_style else None,
+            "config": Config(
+                s3=s3_config,
+                max_pool_connections=self._settings.storage_max_pool_connections,
+                tcp_keepalive=True,
+                retries={"max_attempts": 5, "mode": "standard"},
+            ),
         }
+        self._key = (
+            self._settings.storage_endpoint,
+            self._settings.storage_region,
+            self._settings.storage_access_key,
+            self._settings.force_path_style,
+            self._settings.storage_max_pool_connections,
+        )
 
-    @asynccontextmanager
-    async def _client(self) -> AsyncIterator[Any]:
-        async with self._session.client("s3", **{k: v for k, v in self._client_kwargs.items() if v is not None}) as client:
-            yield client
+    async def _client(self) -> Any:
+        loop = asyncio.get_running_loop()
+        clients = _CLIENTS.setdefault(loop, {})
+        opening = clients.get(self._key)
+        if opening is None or (opening.done() and opening.exception() is not None):
+            # Task compartilhada: chamadas concorrentes aguardam a mesma abertura.
+            opening = clients[self._key] = loop.create_task(self._open())
+        return (await asyncio.shield(opening)).client
+
+    async def _open(self) -> _LoopClient:
+        stack = AsyncExitStack()
+        kwargs = {k: v for k, v in self._client_kwargs.items() if v is not None}
+        client = await stack.enter_async_context(self._session.client("s3", **kwargs))
+        logger.info(
+            "Cliente S3 aberto (%s, pool de %s conexões)",
+            self._settings.storage_endpoint,
+            self._settings.storage_max_pool_connections,
+        )
+        return _LoopClient(stack, client)
+
+    async def start(self) -> None:
+        """Abre o cliente do loop atual antes do primeiro job."""
+        await self._client()
 
     async def download_file(self, *, bucket: str, key: str, destination: Path) -> None:
         destination.parent.mkdir(parents=True, exist_ok=True)
         logger.debug("Downloading s3://%s/%s -> %s", bucket, key, destination)
-        async with self._client() as client:
-            await client.download_file(bucket, key, str(destination))
+        client = await self._client()
+        await client.download_file(bucket, key, str(destination))
+
+    async def head_object(self, *, bucket: str, key: str) -> ObjectHead:
+        client = await self._client()
+        response = await client.head_object(Bucket=bucket, Key=key)
+        return ObjectHead(size=int(response["ContentLength"]), etag=str(response["ETag"]).strip('"'))
+
+    async def read_range(self, *, bucket: str, key: str, start: int, end: int) -> bytes:
+        """Lê os bytes [start, end] (inclusivo); objeto vazio devolve b""."""
+        client = await self._client()
+        try:
+            response = await client.get_object(Bucket=bucket, Key=key, Range=f"bytes={start}-{end}")
+        except ClientError as exc:
+            if exc.response.get("Error", {}).get("Code") == "InvalidRange":
+                return b""
+            raise
+        async with response["Body"] as body:
+            return await body.read()
+
+    async def iter_object(
+        self,
+        *,
+        bucket: str,
+        key: str,
+        start: int = 0,
+        chunk_size: int = 1024 * 1024,
+    ) -> AsyncIterator[bytes]:
+        """Corpo do objeto em blocos, a partir do byte `start`."""
+        client = await self._client()
+        extra = {"Range": f"bytes={start}-"} if start else {}
+        try:
+            response = await client.get_object(Bucket=bucket, Key=key, **extra)
+        except ClientError as exc:
+            # `start` no fim do objeto (ex.: exatamente HEADER_BYTES): S3/R2 respondem 416.
+            if start and exc.response.get("Error", {}).get("Code") == "InvalidRange":
+                return
+            raise
+        async with response["Body"] as body:
+            async for chunk in body.iter_chunks(chunk_size):
+                yield chunk
 
     async def upload_file(
         self,
@@ -48,10 +152,73 @@ class StorageClient:
         extra: dict[str, str] | None = None
         if content_type:
             extra = {"ContentType": content_type}
-        async with self._client() as client:
-            await client.upload_file(str(source), bucket, key, ExtraArgs=extra)
+        client = await self._client()
+        config = self._transfer_config(source.stat().st_size)
+        await client.upload_file(str(source), bucket, key, ExtraArgs=extra, Config=config)
+
+    def _transfer_config(self, size_bytes: int) -> TransferConfig:
+        """Multipart acima de um chunk; o chunk cresce para nunca passar de 10k partes."""
+        chunk = self._settings.storage_multipart_chunk_mb * _MB
+        chunk = max(chunk, math.ceil(size_bytes / _MAX_MULTIPART_PARTS / _MB) * _MB)
+        return TransferConfig(
+            multipart_threshold=chunk,
+            multipart_chunksize=chunk,
+            max_concurrency=_MULTIPART_PART_CONCURRENCY,
+        )
+
+    async def create_multipart_upload(self, *, bucket: str, key: str, content_type: str | None = None) -> str:
+        client = await self._client()
+        extra = {"ContentType": content_type} if content_type else {}
+        response = await client.create_multipart_upload(Bucket=bucket, Key=key, **extra)
+        return str(response["UploadId"])
+
+    async def upload_part(self, *, bucket: str, key: str, upload_id: str, part_number: int, body: bytes) -> str:
+        client = await self._client()
+        response = await client.upload_part(
+            Bucket=bucket,
+            Key=key,
+            UploadId=upload_id,
+            PartNumber=part_number,
+            Body=body,
+        )
+        return str(response["ETag"])
+
+    async def complete_multipart_upload(
+        self,
+        *,
+        bucket: str,
+        key: str,
+        upload_id: str,
+        parts: list[tuple[int, str]],
+    ) -> None:
+        client = await self._client()
+        await client.complete_multipart_upload(
+            Bucket=bucket,
+            Key=key,
+            UploadId=upload_id,
+            MultipartUpload={"Parts": [{"PartNumber": number, "ETag": etag} for number, etag in parts]},
+        )
+
+    async def abort_multipart_upload(self, *, bucket: str, key: str, upload_id: str) -> None:
+        client = await self._client()
+        await client.abort_multipart_upload(Bucket=bucket, Key=key, UploadId=upload_id)
 
     async def delete_object(self, *, bucket: str, key: str) -> None:
         logger.debug("Deleting s3://%s/%s", bucket, key)
-        async with self._client() as client:
-            await client.delete_object(Bucket=bucket, Key=key)
+        client = await self._client()
+        await client.delete_object(Bucket=bucket, Key=key)
+
+
+async def start_shared_storage() -> None:
+    await StorageClient().start()
+
+
+async def close_shared_storage() -> None:
+    """Fecha os clientes S3 do loop atual (shutdown do worker)."""
+    clients = _CLIENTS.pop(asyncio.get_running_loop(), {})
+    for opening in clients.values():
+        try:
+            entry = await opening
+        except Exception:  # pragma: no cover - abertura já tinha falhado
+            continue
+        await entry.stack.aclose()
@@ -0,0 +1,274 @@
+"""Supervisor multi-processo do worker.
+
+`python -m app.main` roda um único `QueueConsumer` num event loop, o que
+limita o processo a um core para o que roda no loop. Aqui o supervisor sobe
+`WORKER_PROCESSES` filhos (default: cores disponíveis), cada um com seu
+próprio loop, engine e pools, e:
+
+- resolve `QUEUE_LANES` uma vez e entrega a mesma configuração a todos os filhos;
+- divide o pool de CPU e o orçamento de threads de vídeo entre os filhos, para
+  que o total de processos/threads (e a memória) não cresça com N;
+- reinicia filhos que morrem ou param de mandar heartbeat, com backoff
+  exponencial por slot;
+- grava a saúde agregada em `WORKER_HEALTH_FILE` (JSON), conferida por
+  `python -m app.supervisor --check` no HEALTHCHECK do container.
+
+SIGTERM/SIGINT são repassados aos filhos, que terminam os jobs em andamento.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import multiprocessing
+import os
+import signal
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from multiprocessing.process import BaseProcess
+from multiprocessing.sharedctypes import Synchronized
+from pathlib import Path
+from typing import Any, Mapping
+
+from .settings import _available_cpus, get_settings
+
+logger = logging.getLogger(__name__)
+
+# Filho que rodou pelo menos isso é considerado estável: o backoff volta ao início.
+_STABLE_AFTER_SECONDS = 60.0
+_BACKOFF_BASE_SECONDS = 1.0
+_BACKOFF_MAX_SECONDS = 60.0
+_TICK_SECONDS = 1.0
+_HEARTBEAT_SECONDS = 5.0
+
+
+@dataclass(slots=True)
+class _Slot:
+    index: int
+    heartbeat: Synchronized
+    process: BaseProcess | None = None
+    started_at: float = 0.0
+    restarts: int = 0
+    failures: int = 0
+    restart_at: float = 0.0
+    last_exit: int | None = None
+
+    def backoff(self) -> float:
+        return min(_BACKOFF_MAX_SECONDS, _BACKOFF_BASE_SECONDS * 2 ** max(0, self.failures - 1))
+
+
+def child_env(processes: int, environ: Mapping[str, str] | None = None) -> dict[str, str]:
+    """Variáveis que dividem os recursos por processo entre os filhos.
+
+    Valores definidos explicitamente no ambiente são respeitados (valem por filho).
+    """
+    environ = os.environ if environ is None else environ
+    cpus = _available_cpus()
+    share = max(1, cpus // max(1, processes))
+    overrides: dict[str, str] = {}
+    if "WORKER_CPU_POOL_SIZE" not in environ:
+        overrides["WORKER_CPU_POOL_SIZE"] = str(share)
+    if "WORKER_VIDEO_THREAD_BUDGET" not in environ:
+        overrides["WORKER_VIDEO_THREAD_BUDGET"] = str(share)
+    return overrides
+
+
+def _child_main(index: int, lanes: Any, env: dict[str, str], heartbeat: Synchronized) -> None:
+    os.environ.update(env)
+    import asyncio
+
+    from .main import configure_logging, main
+
+    configure_logging(f"worker-{index}")
+
+    def _beat() -> None:
+        heartbeat.value = time.time()
+
+    asyncio.run(main(lanes=lanes, heartbeat=_beat, heartbeat_interval=_HEARTBEAT_SECONDS))
+
+
+class Supervisor:
+    def __init__(
+        self,
+        processes: int,
+        *,
+        lanes: Any = None,
+        stall_seconds: float = 120.0,
+        health_file: Path | None = None,
+    ) -> None:
+        self.processes = processes
+        self.lanes = lanes
+        self.stall_seconds = stall_seconds
+        self.health_file = health_file
+        self._stopping = threading.Event()
+        # spawn: filhos começam limpos (sem engine/pools herdados), como o pool de CPU.
+        self._ctx = multiprocessing.get_context("spawn")
+        self._env = child_env(processes)
+        self._slots = [_Slot(index=i, heartbeat=self._ctx.Value("d", 0.0)) for i in range(processes)]
+
+    def stop(self, *_: object) -> None:
+        if not self._stopping.is_set():
+            logger.info("Shutdown solicitado; repassando aos %s filhos", self.processes)
+        self._stopping.set()
+
+    def run(self) -> None:
+        logger.info(
+            "Supervisor iniciado com %s processos (%s)",
+            self.processes,
+            ", ".join(f"{key}={value}" for key, value in sorted(self._env.items())) or "recursos explícitos",
+        )
+        for slot in self._slots:
+            self._start(slot)
+        try:
+            while not self._stopping.wait(_TICK_SECONDS):
+                self.tick()
+        finally:
+            self._shutdown()
+
+    def tick(self) -> None:
+        now = time.time()
+        for slot in self._slots:
+            process = slot.process
+            if process is not None and process.is_alive():
+                if self._stalled(slot, now):
+                    logger.error(
+                        "Worker %s (pid %s) sem heartbeat há %.0fs; reiniciando",
+                        slot.index,
+                        process.pid,
+                        now - slot.heartbeat.value,
+                    )
+                    process.kill()
+                    process.join(5)
+                    self._schedule_restart(slot, now)
+                continue
+            if process is not None:
+                self._schedule_restart(slot, now)
+            elif now >= slot.restart_at:
+                self._start(slot)
+        self._write_health(now)
+
+    def health(self, now: float | None = None) -> dict[str, Any]:
+        now = time.time() if now is None else now
+        children = []
+        for slot in self._slots:
+            alive = slot.process is not None and slot.process.is_alive()
+            age = now - slot.heartbeat.value if slot.heartbeat.value else None
+            children.append(
+                {
+                    "index": slot.index,
+                    "pid": slot.process.pid if alive and slot.process is not None else None,
+                    "alive": alive,
+                    "healthy": alive and age is not None and (self.stall_seconds <= 0 or age < self.stall_seconds),
+                    "heartbeat_age_seconds": round(age, 1) if age is not None else None,
+                    "restarts": slot.restarts,
+                    "last_exit_code": slot.last_exit,
+                }
+            )
+        healthy = sum(1 for child in children if child["healthy"])
+        return {
+            "updated_at": now,
+            "processes": self.processes,
+            "healthy": healthy,
+            "status": "ok" if healthy == self.processes else "degraded",
+            "restarts": sum(slot.restarts for slot in self._slots),
+            "children": children,
+        }
+
+    def _stalled(self, slot: _Slot, now: float) -> bool:
+        # Antes do primeiro heartbeat conta o tempo desde o start (import + conexão ao banco).
+        last = slot.heartbeat.value or slot.started_at
+        return self.stall_seconds > 0 and now - last > self.stall_seconds
+
+    def _start(self, slot: _Slot) -> None:
+        slot.heartbeat.value = 0.0
+        process = self._ctx.Process(
+            target=_child_main,
+            args=(slot.index, self.lanes, self._env, slot.heartbeat),
+            name=f"babybook-worker-{slot.index}",
+        )
+        process.start()
+        slot.process = process
+        slot.started_at = time.time()
+        logger.info("Worker %s iniciado (pid %s)", slot.index, process.pid)
+
+    def _schedule_restart(self, slot: _Slot, now: float) -> None:
+        process = slot.process
+        assert process is not None
+        slot.last_exit = process.exitcode
+        slot.process = None
+        slot.restarts += 1
+        if now - slot.started_at >= _STABLE_AFTER_SECONDS:
+            slot.failures = 0
+        slot.failures += 1
+        delay = slot.backoff()
+        slot.restart_at = now + delay
+        logger.warning(
+            "Worker %s saiu (código %s); reinício em %.0fs",
+            slot.index,
+            slot.last_exit,
+            delay,
+        )
+
+    def _shutdown(self) -> None:
+        running = [slot.process for slot in self._slots if slot.process is not None and slot.process.is_alive()]
+        for process in running:
+            # SIGTERM; ignora filhos que já saíram.
+            process.terminate()
+        # Sem timeout: cada filho termina os jobs em andamento; o orquestrador manda SIGKILL se passar do prazo.
+        for process in running:
+            process.join()
+        self._write_health(time.time())
+        logger.info("Supervisor encerrado")
+
+    def _write_health(self, now: float) -> None:
+        if self.health_file is None:
+            return
+        staging = self.health_file.with_name(f".{self.health_file.name}.tmp")
+        try:
+            staging.write_text(json.dumps(self.health(now)))
+            os.replace(staging, self.health_file)
+        except OSError:
+            logger.warning("Não foi possível gravar %s", self.health_file, exc_info=True)
+
+
+def check_health(path: Path, *, max_age_seconds: float = 30.0) -> bool:
+    """True se o supervisor atualizou o arquivo recentemente e todos os filhos estão saudáveis."""
+    try:
+        report = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return False
+    fresh = time.time() - float(report.get("updated_at", 0)) <= max_age_seconds
+    return fresh and report.get("status") == "ok"
+
+
+def _resolve_lanes() -> Any:
+    from .queue import lanes_from_env
+
+    # Só o backend de banco filtra por kind; nos demais cada filho usa a lane única.
+    if os.getenv("QUEUE_PROVIDER", "database").lower() != "database":
+        return None
+    return lanes_from_env()
+
+
+def run_supervisor() -> None:
+    from .main import configure_logging
+
+    configure_logging("supervisor")
+    settings = get_settings()
+    supervisor = Supervisor(
+        processes=max(1, settings.worker_processes),
+        lanes=_resolve_lanes(),
+        stall_seconds=settings.worker_stall_seconds,
+        health_file=settings.worker_health_file,
+    )
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(sig, supervisor.stop)
+    supervisor.run()
+
+
+if __name__ == "__main__":
+    if "--check" in sys.argv[1:]:
+        sys.exit(0 if check_health(get_settings().worker_health_file) else 1)
+    run_supervisor()
@@ -25,6 +25,9 @@ class AssetJobPayload:
     trace_id: str | None
     mime: str | None
     scope: str | None
+    encoder_profile: str | None = None
+    # Hash declarado no upload (`Asset.sha256`), conferido no download.
+    sha256: str | None = None
 
     @classmethod
     def parse(cls, payload: dict[str, Any], metadata: dict[str, Any]) -> "AssetJobPayload":
@@ -42,6 +45,8 @@ class AssetJobPayload:
             trace_id=metadata.get("trace_id"),
             mime=payload.get("mime"),
             scope=payload.get("scope"),
+            encoder_profile=payload.get("encoder_profile"),
+            sha256=payload.get("sha256"),
         )
 
 
@@ -49,6 +54,8 @@ class AssetJobPayload:
 class ExportItem:
     key: str
     filename: str
+    # "uploads" para originais (bucket de uploads); padrão: bucket de derivados.
+    scope: str | None = None
 
 
 @dataclass(slots=True)
@@ -57,6 +64,8 @@ class ExportJobPayload:
     account_id: uuid.UUID
     items: list[ExportItem]
     trace_id: str | None
+    # Última tentativa do job na fila (só o backend de banco informa).
+    final_attempt: bool = False
 
     @classmethod
     def parse(cls, payload: dict[str, Any], metadata: dict[str, Any]) -> "ExportJobPayload":
@@ -69,7 +78,7 @@ class ExportJobPayload:
             if not key:
                 continue
             filename = item.get("filename") or key.split("/")[-1]
-            items.append(ExportItem(key=key, filename=filename))
+            items.append(ExportItem(key=key, filename=filename, scope=item.get("scope")))
         if not items:
             raise ValueError("Export job sem itens para empacotar")
         return cls(
@@ -77,9 +86,15 @@ class ExportJobPayload:
             account_id=account_id,
             items=items,
             trace_id=metadata.get("trace_id"),
+            final_attempt=_is_final_attempt(metadata),
         )
 
 
+def _is_final_attempt(metadata: dict[str, Any]) -> bool:
+    attempt, max_attempts = metadata.get("attempt"), metadata.get("max_attempts")
+    return isinstance(attempt, int) and isinstance(max_attempts, int) and attempt >= max_attempts
+
+
 @dataclass(slots=True)
 class VariantData:
     preset: str
@@ -0,0 +1,93 @@
+"""Upload concorrente dos derivados de um job.
+
+Os handlers geram 3-6 arquivos (original canônico + variantes) e antes os
+enviavam um a um. `upload_derivatives` dispara todos juntos, limitados por
+job (`WORKER_UPLOAD_JOB_CONCURRENCY`) e pelo processo inteiro
+(`WORKER_UPLOAD_PROCESS_CONCURRENCY`), para que lanes concorrentes não
+estourem o pool de conexões do cliente S3. Arquivos grandes seguem em
+multipart (ver `StorageClient.upload_file`).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import weakref
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Sequence
+
+from .settings import WorkerSettings, get_settings
+from .storage import StorageClient
+from .types import VariantData
+
+_PROCESS_LIMITS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+@dataclass(slots=True)
+class PendingUpload:
+    """Arquivo local a enviar; com `preset`, vira uma `VariantData` do asset."""
+
+    key: str
+    source: Path
+    content_type: str | None = None
+    preset: str | None = None
+    kind: str = "photo"
+    width_px: int | None = None
+    height_px: int | None = None
+
+    def to_variant(self) -> VariantData:
+        assert self.preset is not None
+        return VariantData(
+            preset=self.preset,
+            key=self.key,
+            size_bytes=self.source.stat().st_size,
+            kind=self.kind,
+            width_px=self.width_px,
+            height_px=self.height_px,
+        )
+
+
+def _process_limit(settings: WorkerSettings) -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    limit = _PROCESS_LIMITS.get(loop)
+    if limit is None:
+        limit = _PROCESS_LIMITS[loop] = asyncio.Semaphore(max(1, settings.upload_process_concurrency))
+    return limit
+
+
+async def upload_derivatives(
+    storage: StorageClient,
+    bucket: str,
+    uploads: Sequence[PendingUpload],
+    *,
+    settings: WorkerSettings | None = None,
+    concurrency: int | None = None,
+) -> list[VariantData]:
+    """Envia `uploads` em paralelo e devolve as variantes, na ordem de entrada.
+
+    Itens sem `preset` (ex.: o original canônico) são enviados mas não entram
+    no retorno. Se um upload falhar, os demais são cancelados e a exceção sobe.
+    """
+    settings = settings or get_settings()
+    job_limit = asyncio.Semaphore(max(1, concurrency or settings.upload_job_concurrency))
+    process_limit = _process_limit(settings)
+
+    async def _upload(item: PendingUpload) -> None:
+        async with job_limit, process_limit:
+            await storage.upload_file(
+                bucket=bucket,
+                key=item.key,
+                source=item.source,
+                content_type=item.content_type,
+            )
+
+    try:
+        async with asyncio.TaskGroup() as group:
+            for item in uploads:
+                group.create_task(_upload(item))
+    except ExceptionGroup as exc:
+        # Handlers e fila esperam a exceção original, não o grupo.
+        raise exc.exceptions[0]
+    return [item.to_variant() for item in uploads if item.preset is not None]
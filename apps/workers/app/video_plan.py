@@ -0,0 +1,245 @@
+"""Planejamento de transcode guiado por ffprobe.
+
+Um único ffprobe da origem decide, por preset, se a saída precisa ser
+re-encodada, se basta copiar os streams (remux com `+faststart`) ou se o
+preset pode ser pulado por estar acima da resolução da origem.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import re
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Literal, Sequence
+
+# Perfis H.264 que qualquer player (web/iOS/Android) decodifica por hardware.
+COPY_H264_PROFILES = frozenset({"Baseline", "Constrained Baseline", "Main", "High"})
+COPY_PIX_FMTS = frozenset({"yuv420p", "yuvj420p"})
+COPY_AUDIO_CODECS = frozenset({"aac"})
+
+
+@dataclass(slots=True)
+class SourceProbe:
+    """Metadados da origem. `width`/`height` já consideram a rotação de exibição."""
+
+    width: int
+    height: int
+    duration_ms: int
+    format_name: str = ""
+    video_codec: str | None = None
+    video_profile: str | None = None
+    pix_fmt: str | None = None
+    video_bitrate: int | None = None
+    audio_codec: str | None = None
+    # Rotação horária (graus) que o player aplica para exibir o vídeo.
+    rotation: int = 0
+
+    @property
+    def is_mp4_family(self) -> bool:
+        names = set(self.format_name.split(","))
+        return bool(names & {"mp4", "mov"})
+
+    @classmethod
+    def from_ffprobe(cls, data: dict[str, Any]) -> "SourceProbe":
+        streams = data.get("streams") or []
+        video: dict[str, Any] = next((s for s in streams if s.get("codec_type") == "video"), {})
+        audio = next((s for s in streams if s.get("codec_type") == "audio"), None)
+        fmt = data.get("format") or {}
+
+        width = int(video.get("width") or 0)
+        height = int(video.get("height") or 0)
+        rotation = _rotation(video)
+        if rotation % 180 == 90:
+            width, height = height, width
+        duration_raw = fmt.get("duration") or video.get("duration")
+        bitrate_raw = video.get("bit_rate") or fmt.get("bit_rate")
+        return cls(
+            width=width,
+            height=height,
+            duration_ms=int(float(duration_raw) * 1000) if duration_raw else 0,
+            format_name=str(fmt.get("format_name") or ""),
+            video_codec=video.get("codec_name"),
+            video_profile=video.get("profile"),
+            pix_fmt=video.get("pix_fmt"),
+            video_bitrate=int(bitrate_raw) if bitrate_raw else None,
+            audio_codec=audio.get("codec_name") if audio else None,
+            rotation=rotation,
+        )
+
+
+def _rotation(stream: dict[str, Any]) -> int:
+    # A display matrix usa sentido anti-horário; a tag legada `rotate`, horário.
+    for side_data in stream.get("side_data_list") or []:
+        if "rotation" in side_data:
+            return round(-float(side_data["rotation"])) % 360
+    rotate = (stream.get("tags") or {}).get("rotate")
+    return round(float(rotate)) % 360 if rotate else 0
+
+
+async def probe_source(executable: str, path: Path) -> SourceProbe:
+    process = await asyncio.create_subprocess_exec(
+        executable,
+        "-v",
+        "error",
+        "-show_streams",
+        "-show_format",
+        "-print_format",
+        "json",
+        str(path),
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    stdout, stderr = await process.communicate()
+    if process.returncode != 0:
+        raise RuntimeError(f"ffprobe exit {process.returncode}: {stderr.decode()}")
+    return SourceProbe.from_ffprobe(json.loads(stdout.decode() or "{}"))
+
+
+@dataclass(frozen=True, slots=True)
+class VideoTarget:
+    """Caixa máxima de um preset. `max_bitrate` (bps) limita o remux."""
+
+    preset: str
+    max_width: int
+    max_height: int | None = None
+    max_bitrate: int | None = None
+
+    def fits(self, probe: SourceProbe) -> bool:
+        if probe.width > self.max_width:
+            return False
+        return self.max_height is None or probe.height <= self.max_height
+
+    def scale_filter(self) -> str:
+        """Reduz para caber na caixa; nunca amplia nem aplica padding."""
+        if self.max_height is None:
+            return f"scale=w='min({self.max_width},iw)':h=-2"
+        return (
+            f"scale=w='min({self.max_width},iw)':h='min({self.max_height},ih)'"
+            ":force_original_aspect_ratio=decrease:force_divisible_by=2"
+        )
+
+
+@dataclass(slots=True)
+class PresetPlan:
+    target: VideoTarget
+    action: Literal["copy", "encode"]
+    reason: str
+
+    @property
+    def preset(self) -> str:
+        return self.target.preset
+
+
+@dataclass(slots=True)
+class TranscodePlan:
+    source: SourceProbe
+    outputs: list[PresetPlan]
+    skipped: list[str] = field(default_factory=list)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "source": asdict(self.source),
+            "outputs": [
+                {"preset": item.preset, "action": item.action, "reason": item.reason}
+                for item in self.outputs
+            ],
+            "skipped": list(self.skipped),
+        }
+
+
+def plan_transcode(
+    probe: SourceProbe,
+    targets: Sequence[VideoTarget],
+    *,
+    container: str = "mp4",
+) -> TranscodePlan:
+    """Decide copy/encode por preset e descarta presets redundantes.
+
+    Um preset é pulado quando outro preset menor já comporta a origem sem
+    redimensionar: ambos gerariam o mesmo arquivo na resolução nativa.
+    """
+    plan = TranscodePlan(source=probe, outputs=[])
+    for target in targets:
+        covered_by_smaller = any(
+            other.max_width < target.max_width and other.fits(probe) for other in targets
+        )
+        if covered_by_smaller:
+            plan.skipped.append(target.preset)
+            continue
+        if not target.fits(probe):
+            plan.outputs.append(PresetPlan(target, "encode", "downscale"))
+            continue
+        reason = _copy_blocker(probe, target, container)
+        if reason is None:
+            plan.outputs.append(PresetPlan(target, "copy", "source_compatible"))
+        else:
+            plan.outputs.append(PresetPlan(target, "encode", reason))
+    return plan
+
+
+def _copy_blocker(probe: SourceProbe, target: VideoTarget, container: str) -> str | None:
+    if container != "mp4" or not probe.is_mp4_family:
+        return "container"
+    if probe.video_codec != "h264":
+        return f"codec:{probe.video_codec or 'unknown'}"
+    if probe.video_profile not in COPY_H264_PROFILES:
+        return f"profile:{probe.video_profile or 'unknown'}"
+    if probe.pix_fmt not in COPY_PIX_FMTS:
+        return f"pix_fmt:{probe.pix_fmt or 'unknown'}"
+    if probe.audio_codec is not None and probe.audio_codec not in COPY_AUDIO_CODECS:
+        return f"audio:{probe.audio_codec}"
+    if target.max_bitrate is not None:
+        if probe.video_bitrate is None or probe.video_bitrate > target.max_bitrate:
+            return "bitrate"
+    return None
+
+
+def copy_output_args(output: Path) -> list[str]:
+    """Remux sem re-encode; `+faststart` move o moov para o início (streaming)."""
+    return ["-map", "0:v:0", "-map", "0:a?", "-c", "copy", "-movflags", "+faststart", str(output)]
+
+
+@dataclass(slots=True)
+class FFmpegReport:
+    duration_ms: int = 0
+    output_sizes: dict[int, tuple[int, int]] = field(default_factory=dict)
+
+
+_OUTPUT_HEADER_RE = re.compile(r"^Output #(\d+),")
+_VIDEO_STREAM_RE = re.compile(r"^\s*Stream #(\d+):\d+.*: Video: .*?, (\d+)x(\d+)")
+_DURATION_RE = re.compile(r"Duration: (\d+):(\d{2}):(\d{2}(?:\.\d+)?)")
+_PROGRESS_TIME_RE = re.compile(r"time=(\d+):(\d{2}):(\d{2}(?:\.\d+)?)")
+
+
+def parse_ffmpeg_report(stderr: str) -> FFmpegReport:
+    """Extrai dimensões de cada saída e a duração do log do próprio ffmpeg (sem ffprobe)."""
+    report = FFmpegReport()
+    current_output: int | None = None
+    for line in stderr.splitlines():
+        header = _OUTPUT_HEADER_RE.match(line)
+        if header:
+            current_output = int(header.group(1))
+            continue
+        if line.startswith("Input #"):
+            current_output = None
+            continue
+        if current_output is not None and current_output not in report.output_sizes:
+            stream = _VIDEO_STREAM_RE.match(line)
+            if stream and int(stream.group(1)) == current_output:
+                report.output_sizes[current_output] = (int(stream.group(2)), int(stream.group(3)))
+        if not report.duration_ms:
+            duration = _DURATION_RE.search(line)
+            if duration:
+                report.duration_ms = _clock_to_ms(*duration.groups())
+    if not report.duration_ms:
+        # Containers sem duração no cabeçalho: usa o último tempo reportado pelo encoder.
+        progress = _PROGRESS_TIME_RE.findall(stderr)
+        if progress:
+            report.duration_ms = _clock_to_ms(*progress[-1])
+    return report
+
+
+def _clock_to_ms(hours: str, minutes: str, seconds: str) -> int:
+    return int((int(hours) * 3600 + int(minutes) * 60 + float(seconds)) * 1000)
@@ -0,0 +1,226 @@
+"""Transcode segmentado para vídeos longos.
+
+Um único libx264 satura poucos cores e prende o slot do worker por minutos.
+Acima de `WORKER_VIDEO_SEGMENT_MIN_SECONDS`, a origem é cortada em keyframes
+(`-f segment -c copy`), os pedaços são encodados em paralelo e depois
+concatenados sem re-encode (concat demuxer). O áudio é encodado uma vez,
+sobre a origem inteira, e remuxado no final.
+
+Cada pedaço reserva threads do `ThreadBudget` do processo e as divide entre
+as saídas (a soma dos `-threads` do comando é o que foi reservado); jobs
+concorrentes disputam o mesmo orçamento em vez de sobrecarregar a CPU.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import AsyncIterator, Awaitable
+
+from .ffmpeg_runner import FFmpegRunner, TimeCallback
+from .settings import WorkerSettings, get_settings
+from .video_plan import FFmpegReport, parse_ffmpeg_report
+
+logger = logging.getLogger(__name__)
+
+# Container intermediário: Matroska tolera cortes em keyframe sem edit lists.
+_CHUNK_SUFFIX = ".mkv"
+
+
+class ThreadBudget:
+    """Semáforo ponderado: cada encode reserva N threads do total do host."""
+
+    def __init__(self, total: int) -> None:
+        self.total = max(1, total)
+        self._available = self.total
+        self._condition = asyncio.Condition()
+
+    @property
+    def available(self) -> int:
+        return self._available
+
+    @asynccontextmanager
+    async def reserve(self, threads: int) -> AsyncIterator[int]:
+        threads = max(1, min(threads, self.total))
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._available >= threads)
+            self._available -= threads
+        try:
+            yield threads
+        finally:
+            async with self._condition:
+                self._available += threads
+                self._condition.notify_all()
+
+
+_BUDGET: ThreadBudget | None = None
+
+
+def get_thread_budget() -> ThreadBudget:
+    global _BUDGET
+    if _BUDGET is None:
+        _BUDGET = ThreadBudget(get_settings().video_thread_budget)
+    return _BUDGET
+
+
+def should_segment(duration_ms: int, settings: WorkerSettings | None = None) -> bool:
+    settings = settings or get_settings()
+    threshold = settings.video_segment_min_seconds
+    return threshold > 0 and duration_ms >= threshold * 1000
+
+
+@dataclass(frozen=True, slots=True)
+class SegmentedOutput:
+    path: Path
+    video_filter: str
+    # Codec de vídeo aplicado a cada pedaço (sem `-threads`).
+    video_args: list[str]
+    audio_args: list[str]
+    container_args: list[str] = field(default_factory=list)
+
+
+_ROTATION_FILTERS = {90: "transpose=clock", 180: "hflip,vflip", 270: "transpose=cclock"}
+
+
+def segment_seconds(duration_ms: int, budget: ThreadBudget, threads_per_chunk: int) -> int:
+    """Duração alvo dos pedaços: um pedaço por fatia do orçamento de threads."""
+    chunks = max(2, budget.total // max(1, threads_per_chunk))
+    return max(1, math.ceil(duration_ms / 1000 / chunks))
+
+
+def split_threads(granted: int, outputs: int) -> list[int]:
+    """Divide `granted` threads entre `outputs` encoders (mínimo 1 cada)."""
+    share, extra = divmod(granted, max(1, outputs))
+    return [max(1, share + (1 if position < extra else 0)) for position in range(outputs)]
+
+
+async def transcode_segmented(
+    run: FFmpegRunner,
+    executable: str,
+    source: Path,
+    workdir: Path,
+    outputs: list[SegmentedOutput],
+    *,
+    duration_ms: int,
+    has_audio: bool,
+    rotation: int = 0,
+    budget: ThreadBudget | None = None,
+    threads_per_chunk: int | None = None,
+    on_time: TimeCallback | None = None,
+) -> FFmpegReport:
+    """Encoda `outputs` a partir de `source` em pedaços paralelos.
+
+    Retorna o relatório do primeiro pedaço (dimensões por saída, na ordem de
+    `outputs`) com a duração da origem. A rotação vem do probe da origem e é
+    aplicada explicitamente: os pedaços remuxados podem perder a display matrix.
+    `on_time` recebe a soma do tempo já encodado em todos os pedaços.
+    """
+    budget = budget or get_thread_budget()
+    threads = threads_per_chunk or get_settings().video_segment_threads
+    workdir.mkdir(parents=True, exist_ok=True)
+
+    await run(
+        executable,
+        [
+            "-y",
+            "-hide_banner",
+            "-i",
+            str(source),
+            "-map",
+            "0:v:0",
+            "-c",
+            "copy",
+            "-f",
+            "segment",
+            "-segment_time",
+            str(segment_seconds(duration_ms, budget, threads)),
+            "-reset_timestamps",
+            "1",
+            str(workdir / f"src_%04d{_CHUNK_SUFFIX}"),
+        ],
+    )
+    chunks = sorted(workdir.glob(f"src_*{_CHUNK_SUFFIX}"))
+    if not chunks:
+        raise RuntimeError("ffmpeg segment não gerou pedaços")
+    logger.info("Transcode segmentado: %s pedaços, %s threads cada", len(chunks), threads)
+
+    encoded_ms = [0] * len(chunks)
+
+    def _chunk_time(index: int) -> TimeCallback | None:
+        if on_time is None:
+            return None
+
+        def _on_chunk_time(elapsed_ms: int) -> None:
+            encoded_ms[index] = elapsed_ms
+            on_time(sum(encoded_ms))
+
+        return _on_chunk_time
+
+    async def _encode_chunk(index: int, chunk: Path) -> str:
+        # Cada saída é um encoder próprio no mesmo processo: as threads reservadas
+        # são repartidas entre elas, não repetidas por saída.
+        async with budget.reserve(max(threads, len(outputs))) as granted:
+            args = ["-y", "-hide_banner", "-noautorotate", "-i", str(chunk)]
+            for position, output in enumerate(outputs):
+                video_filter = ",".join(filter(None, [_ROTATION_FILTERS.get(rotation), output.video_filter]))
+                args += ["-map", "0:v:0", "-vf", video_filter, *output.video_args]
+                args += ["-threads", str(split_threads(granted, len(outputs))[position])]
+                args += ["-an", "-metadata:s:v:0", "rotate=0"]
+                args.append(str(_chunk_output(workdir, position, index)))
+            return await run(executable, args, on_time=_chunk_time(index))
+
+    async def _encode_audio(position: int, output: SegmentedOutput) -> None:
+        async with budget.reserve(1):
+            await run(
+                executable,
+                [
+                    "-y",
+                    "-hide_banner",
+                    "-i",
+                    str(source),
+                    "-map",
+                    "0:a:0",
+                    "-vn",
+                    *output.audio_args,
+                    str(_audio_output(workdir, position)),
+                ],
+            )
+
+    tasks: list[Awaitable[object]] = [_encode_chunk(index, chunk) for index, chunk in enumerate(chunks)]
+    if has_audio:
+        tasks += [_encode_audio(position, output) for position, output in enumerate(outputs)]
+    results = await asyncio.gather(*tasks)
+
+    for position, output in enumerate(outputs):
+        concat_list = workdir / f"concat_{position}.txt"
+        concat_list.write_text(
+            "".join(
+                f"file '{_concat_escape(_chunk_output(workdir, position, index))}'\n"
+                for index in range(len(chunks))
+            )
+        )
+        args = ["-y", "-hide_banner", "-f", "concat", "-safe", "0", "-i", str(concat_list)]
+        if has_audio:
+            args += ["-i", str(_audio_output(workdir, position)), "-map", "0:v:0", "-map", "1:a:0"]
+        args += ["-c", "copy", *output.container_args, str(output.path)]
+        await run(executable, args)
+
+    report = parse_ffmpeg_report(str(results[0]))
+    report.duration_ms = duration_ms
+    return report
+
+
+def _chunk_output(workdir: Path, position: int, index: int) -> Path:
+    return workdir / f"out{position}_{index:04d}{_CHUNK_SUFFIX}"
+
+
+def _audio_output(workdir: Path, position: int) -> Path:
+    return workdir / f"audio{position}.mka"
+
+
+def _concat_escape(path: Path) -> str:
+    return str(path).replace("'", "'\\''")
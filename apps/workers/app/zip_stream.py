@@ -0,0 +1,189 @@
+"""Escritor de ZIP sequencial (sem seek), com ZIP64.
+
+`zipfile.ZipFile` precisa de um arquivo em disco (ou faz seek para corrigir
+os cabeçalhos). Aqui cada entrada é emitida como bytes prontos para um
+multipart upload: cabeçalho local com bit 3 (tamanhos no data descriptor),
+dados e data descriptor de 64 bits. Cabeçalhos locais sempre carregam o
+extra ZIP64, então não há limite de 4GB por arquivo nem no total.
+
+O estado (`offset` e `entries`) é serializável, o que permite retomar uma
+exportação a partir de um checkpoint.
+"""
+
+from __future__ import annotations
+
+import struct
+import zlib
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import PurePosixPath
+from typing import Any
+
+ZIP_STORED = 0
+ZIP_DEFLATED = 8
+
+# Formatos já comprimidos: deflate só gasta CPU sem reduzir o tamanho.
+STORED_SUFFIXES = frozenset(
+    {
+        ".jpg", ".jpeg", ".png", ".gif", ".webp", ".heic", ".heif", ".avif",
+        ".mp4", ".m4v", ".mov", ".webm", ".mkv", ".m4a", ".mp3", ".aac", ".ogg",
+        ".zip", ".gz",
+    }
+)
+
+_FLAG_DATA_DESCRIPTOR = 0x08
+_FLAG_UTF8 = 0x800
+_VERSION_ZIP64 = 45
+_MAX_32 = 0xFFFFFFFF
+_MAX_16 = 0xFFFF
+
+_LOCAL_HEADER = struct.Struct("<4sHHHHHLLLHH")
+_DATA_DESCRIPTOR = struct.Struct("<4sLQQ")
+_CENTRAL_HEADER = struct.Struct("<4sHHHHHHLLLHHHHHLL")
+_ZIP64_END = struct.Struct("<4sQHHLLQQQQ")
+_ZIP64_LOCATOR = struct.Struct("<4sLQL")
+_END = struct.Struct("<4sHHHHLLH")
+
+
+def compression_for(filename: str) -> int:
+    return ZIP_STORED if PurePosixPath(filename).suffix.lower() in STORED_SUFFIXES else ZIP_DEFLATED
+
+
+@dataclass(slots=True)
+class ZipEntry:
+    name: str
+    method: int
+    offset: int
+    crc: int = 0
+    compressed_size: int = 0
+    size: int = 0
+
+
+class ZipStreamWriter:
+    def __init__(
+        self,
+        *,
+        date_time: datetime,
+        offset: int = 0,
+        entries: list[ZipEntry] | None = None,
+    ) -> None:
+        self.date_time = date_time
+        self.offset = offset
+        self.entries: list[ZipEntry] = entries or []
+        self._dos_time = (date_time.hour << 11) | (date_time.minute << 5) | (date_time.second // 2)
+        self._dos_date = ((max(date_time.year, 1980) - 1980) << 9) | (date_time.month << 5) | date_time.day
+        self._current: ZipEntry | None = None
+        self._compressor: Any = None
+
+    def state(self) -> dict[str, Any]:
+        """Checkpoint entre entradas (nunca no meio de uma)."""
+        assert self._current is None
+        return {"offset": self.offset, "entries": [asdict(entry) for entry in self.entries]}
+
+    @classmethod
+    def from_state(cls, state: dict[str, Any], *, date_time: datetime) -> "ZipStreamWriter":
+        return cls(
+            date_time=date_time,
+            offset=int(state["offset"]),
+            entries=[ZipEntry(**entry) for entry in state["entries"]],
+        )
+
+    def start_entry(self, name: str, method: int | None = None) -> bytes:
+        assert self._current is None
+        method = compression_for(name) if method is None else method
+        encoded = name.encode("utf-8")
+        self._current = ZipEntry(name=name, method=method, offset=self.offset)
+        self._compressor = zlib.compressobj(6, zlib.DEFLATED, -15) if method == ZIP_DEFLATED else None
+        # Tamanhos vão no data descriptor; o extra ZIP64 (zerado) sinaliza descriptor de 64 bits.
+        extra = struct.pack("<HHQQ", 0x0001, 16, 0, 0)
+        header = _LOCAL_HEADER.pack(
+            b"PK\x03\x04",
+            _VERSION_ZIP64,
+            _FLAG_DATA_DESCRIPTOR | _FLAG_UTF8,
+            method,
+            self._dos_time,
+            self._dos_date,
+            0,
+            _MAX_32,
+            _MAX_32,
+            len(encoded),
+            len(extra),
+        )
+        return self._emit(header + encoded + extra)
+
+    def write(self, data: bytes) -> bytes:
+        entry = self._current
+        assert entry is not None
+        entry.crc = zlib.crc32(data, entry.crc)
+        entry.size += len(data)
+        out = self._compressor.compress(data) if self._compressor is not None else data
+        entry.compressed_size += len(out)
+        return self._emit(out)
+
+    def end_entry(self) -> bytes:
+        entry = self._current
+        assert entry is not None
+        tail = self._compressor.flush() if self._compressor is not None else b""
+        entry.compressed_size += len(tail)
+        descriptor = _DATA_DESCRIPTOR.pack(b"PK\x07\x08", entry.crc, entry.compressed_size, entry.size)
+        self.entries.append(entry)
+        self._current = None
+        self._compressor = None
+        return self._emit(tail + descriptor)
+
+    def finish(self) -> bytes:
+        """Diretório central + registros de fim (ZIP64 quando necessário)."""
+        assert self._current is None
+        central_offset = self.offset
+        chunks: list[bytes] = []
+        for entry in self.entries:
+            encoded = entry.name.encode("utf-8")
+            zip64_fields = [
+                value
+                for value in (entry.size, entry.compressed_size, entry.offset)
+                if value >= _MAX_32
+            ]
+            extra = struct.pack(f"<HH{len(zip64_fields)}Q", 0x0001, 8 * len(zip64_fields), *zip64_fields) if zip64_fields else b""
+            chunks.append(
+                _CENTRAL_HEADER.pack(
+                    b"PK\x01\x02",
+                    _VERSION_ZIP64,
+                    _VERSION_ZIP64,
+                    _FLAG_DATA_DESCRIPTOR | _FLAG_UTF8,
+                    entry.method,
+                    self._dos_time,
+                    self._dos_date,
+                    entry.crc,
+                    min(entry.compressed_size, _MAX_32),
+                    min(entry.size, _MAX_32),
+                    len(encoded),
+                    len(extra),
+                    0,
+                    0,
+                    0,
+                    0,
+                    min(entry.offset, _MAX_32),
+                )
+                + encoded
+                + extra
+            )
+        central = b"".join(chunks)
+        count = len(self.entries)
+        tail = b""
+        if count >= _MAX_16 or len(central) >= _MAX_32 or central_offset >= _MAX_32:
+            zip64_end_offset = central_offset + len(central)
+            tail += _ZIP64_END.pack(
+                b"PK\x06\x06", _ZIP64_END.size - 12, _VERSION_ZIP64, _VERSION_ZIP64,
+                0, 0, count, count, len(central), central_offset,
+            )
+            tail += _ZIP64_LOCATOR.pack(b"PK\x06\x07", 0, zip64_end_offset, 1)
+        tail += _END.pack(
+            b"PK\x05\x06", 0, 0,
+            min(count, _MAX_16), min(count, _MAX_16),
+            min(len(central), _MAX_32), min(central_offset, _MAX_32), 0,
+        )
+        return self._emit(central + tail)
+
+    def _emit(self, data: bytes) -> bytes:
+        self.offset += len(data)
+        return data
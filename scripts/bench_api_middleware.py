@@ -0,0 +1,120 @@
+"""
+Benchmark do custo por requisição dos middlewares de cabeçalho da API.
+Execute: python scripts/bench_api_middleware.py [--requests 20000] [--rounds 5]
+
+Compara, sobre uma rota mínima e chamando o app ASGI direto (sem rede nem
+cliente HTTP), o par antigo BaseHTTPMiddleware (trace-id) +
+@app.middleware("http") (cabeçalhos de segurança) com o
+`ResponseHeadersMiddleware` ASGI puro. A rota sem middleware dá a linha de base.
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add api to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "apps" / "api"))
+
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from babybook_api.observability import TRACE_ID_HEADER, ResponseHeadersMiddleware, new_trace_id
+from babybook_api.security import security_headers
+
+HEADERS = security_headers(hsts=True)
+
+
+async def _ok(request):
+    return PlainTextResponse("ok")
+
+
+class _LegacyTraceId(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        trace_id = new_trace_id()
+        request.state.trace_id = trace_id
+        response = await call_next(request)
+        response.headers.setdefault(TRACE_ID_HEADER, trace_id)
+        return response
+
+
+async def _legacy_security_headers(request, call_next):
+    response = await call_next(request)
+    for name, value in HEADERS.items():
+        response.headers[name] = value
+    return response
+
+
+def _apps() -> dict[str, Starlette]:
+    routes = [Route("/", _ok)]
+    return {
+        "sem middleware": Starlette(routes=routes),
+        "BaseHTTPMiddleware x2": Starlette(
+            routes=routes,
+            middleware=[
+                Middleware(BaseHTTPMiddleware, dispatch=_legacy_security_headers),
+                Middleware(_LegacyTraceId),
+            ],
+        ),
+        "ASGI puro": Starlette(
+            routes=routes,
+            middleware=[Middleware(ResponseHeadersMiddleware, security_headers=HEADERS)],
+        ),
+    }
+
+
+async def _run(app: Starlette, requests: int) -> float:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/",
+        "raw_path": b"/",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 1234),
+        "server": ("bench", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    started = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope), receive, send)
+    return (time.perf_counter() - started) / requests * 1_000_000
+
+
+async def bench(requests: int, rounds: int) -> None:
+    apps = _apps()
+    for app in apps.values():
+        await _run(app, 200)  # aquecimento
+    print(f"{'stack':<24} {'us/req (mediana)':>18} {'overhead us':>12}")
+    medians: dict[str, float] = {}
+    for name, app in apps.items():
+        medians[name] = statistics.median([await _run(app, requests) for _ in range(rounds)])
+    baseline = medians["sem middleware"]
+    for name, median in medians.items():
+        print(f"{name:<24} {median:>18.1f} {median - baseline:>12.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(bench(args.requests, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
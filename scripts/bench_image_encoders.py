@@ -0,0 +1,71 @@
+"""
+Benchmark dos perfis de encoder de imagem do worker.
+Execute: python scripts/bench_image_encoders.py foto1.jpg [foto2.jpg ...] [--profiles balanced,max]
+
+Para cada imagem, gera os níveis da pirâmide uma vez e mede, por perfil e
+preset, o tempo de encode e o tamanho do arquivo resultante.
+"""
+import argparse
+import io
+import sys
+import time
+from pathlib import Path
+
+# Add workers to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "apps" / "workers"))
+
+from PIL import Image, ImageOps
+
+from app.images import ENCODER_PROFILES, IMAGE_PRESETS, _fit_within, resolve_encoder_profiles
+
+
+def _levels(path: Path) -> dict[str, Image.Image]:
+    with Image.open(path) as image:
+        image = ImageOps.exif_transpose(image).convert("RGB")
+    levels: dict[str, Image.Image] = {}
+    for preset, max_width in IMAGE_PRESETS:
+        size = _fit_within(image.size, (max_width, max_width * 2))
+        levels[preset] = image.resize(size, Image.Resampling.LANCZOS, reducing_gap=3.0)
+    return levels
+
+
+def bench(paths: list[Path], profile_names: list[str]) -> None:
+    totals: dict[str, list[float]] = {name: [0.0, 0] for name in profile_names}
+    print(f"{'perfil':<10} {'preset':<6} {'formato':<7} {'q':>3} {'esf':>3} {'ms':>9} {'KB':>9}")
+    for path in paths:
+        levels = _levels(path)
+        print(f"# {path.name}")
+        for name in profile_names:
+            profiles = resolve_encoder_profiles(name)
+            for preset, level in levels.items():
+                profile = profiles[preset]
+                buffer = io.BytesIO()
+                started = time.perf_counter()
+                level.save(buffer, **profile.save_kwargs())
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                size_kb = buffer.tell() / 1024
+                totals[name][0] += elapsed_ms
+                totals[name][1] += size_kb
+                print(
+                    f"{name:<10} {preset:<6} {profile.format:<7} {profile.quality:>3} "
+                    f"{profile.effort:>3} {elapsed_ms:>9.1f} {size_kb:>9.1f}"
+                )
+    print("# total")
+    for name, (elapsed_ms, size_kb) in totals.items():
+        print(f"{name:<10} {'*':<6} {'':<7} {'':>3} {'':>3} {elapsed_ms:>9.1f} {size_kb:>9.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("images", nargs="+", type=Path)
+    parser.add_argument(
+        "--profiles",
+        default=",".join(ENCODER_PROFILES),
+        help="Perfis separados por vírgula (default: todos)",
+    )
+    args = parser.parse_args()
+    bench(args.images, [name.strip() for name in args.profiles.split(",") if name.strip()])
+
+
+if __name__ == "__main__":
+    main()
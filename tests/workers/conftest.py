@@ -0,0 +1,104 @@
+import asyncio
+from collections.abc import Iterable
+
+import pytest
+
+from app.storage import ObjectHead
+
+
+class FakeStorage:
+    """StorageClient em memória, com o que os testes dos workers observam.
+
+    `data` responde por qualquer key (testes de um objeto só); `objects`
+    mapeia key -> bytes. `truncate_first_stream` corta o primeiro
+    `iter_object` após um bloco; keys em `fail_downloads` falham uma vez.
+    """
+
+    def __init__(
+        self,
+        data: bytes | None = None,
+        *,
+        objects: dict[str, bytes] | None = None,
+        etag: str = "v1",
+        chunk_size: int = 300,
+        truncate_first_stream: bool = False,
+        fail_downloads: Iterable[str] = (),
+    ) -> None:
+        self.data = data
+        self.objects = dict(objects or {})
+        self.etag = etag
+        self.chunk_size = chunk_size
+        self.truncate_first_stream = truncate_first_stream
+        self.fail_downloads = set(fail_downloads)
+        self.ranges: list[tuple[int, int]] = []
+        self.streamed_from: list[int] = []
+        self.downloaded: list[str] = []
+        self.deleted: list[str] = []
+        self.active_downloads = 0
+        self.peak_downloads = 0
+        self.uploads_created = 0
+        self.parts: dict[int, bytes] = {}
+        self.completed: list[tuple[int, str]] | None = None
+        self.aborted = False
+
+    @property
+    def reads(self) -> int:
+        return len(self.ranges) + len(self.streamed_from)
+
+    def _object(self, key: str) -> bytes:
+        if key in self.objects:
+            return self.objects[key]
+        if self.data is None:
+            raise KeyError(key)
+        return self.data
+
+    async def head_object(self, *, bucket, key) -> ObjectHead:
+        return ObjectHead(size=len(self._object(key)), etag=self.etag)
+
+    async def read_range(self, *, bucket, key, start, end) -> bytes:
+        self.ranges.append((start, end))
+        return self._object(key)[start : end + 1]
+
+    async def iter_object(self, *, bucket, key, start=0, chunk_size=1024 * 1024):
+        truncate = self.truncate_first_stream and not self.streamed_from
+        self.streamed_from.append(start)
+        data = self._object(key)
+        for offset in range(start, len(data), self.chunk_size):
+            yield data[offset : offset + self.chunk_size]
+            if truncate:
+                return
+
+    async def download_file(self, *, bucket, key, destination) -> None:
+        if key in self.fail_downloads:
+            self.fail_downloads.discard(key)
+            raise ConnectionError("queda no meio do download")
+        self.active_downloads += 1
+        self.peak_downloads = max(self.peak_downloads, self.active_downloads)
+        try:
+            await asyncio.sleep(0.001)
+            destination.write_bytes(self._object(key))
+        finally:
+            self.active_downloads -= 1
+        self.downloaded.append(key)
+
+    async def delete_object(self, *, bucket, key) -> None:
+        self.deleted.append(key)
+
+    async def create_multipart_upload(self, *, bucket, key, content_type=None) -> str:
+        self.uploads_created += 1
+        return "upload-1"
+
+    async def upload_part(self, *, bucket, key, upload_id, part_number, body) -> str:
+        self.parts[part_number] = body
+        return f"etag-{part_number}"
+
+    async def complete_multipart_upload(self, *, bucket, key, upload_id, parts) -> None:
+        self.completed = parts
+
+    async def abort_multipart_upload(self, *, bucket, key, upload_id) -> None:
+        self.aborted = True
+
+
+@pytest.fixture
+def fake_storage() -> type[FakeStorage]:
+    return FakeStorage
@@ -0,0 +1,104 @@
+import asyncio
+import json
+import uuid
+
+import httpx
+import pytest
+
+from app import api_client
+from app.api_client import AssetUpdateError, _AssetBatcher
+
+
+def _client(requests: list[dict], missing: set[str] | None = None) -> httpx.AsyncClient:
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        requests.append(body)
+        ids = [update["asset_id"] for update in body["updates"]]
+        return httpx.Response(200, json={"updated": [], "missing": [i for i in ids if i in (missing or set())]})
+
+    return httpx.AsyncClient(base_url="http://api.test", transport=httpx.MockTransport(handler))
+
+
+@pytest.mark.asyncio
+async def test_concurrent_updates_are_sent_as_one_batch():
+    requests: list[dict] = []
+    async with _client(requests) as client:
+        batcher = _AssetBatcher(client, window_seconds=0.02, max_batch=100)
+        ids = [uuid.uuid4() for _ in range(5)]
+        await asyncio.gather(*(batcher.submit(asset_id, {"status": "ready"}) for asset_id in ids))
+
+    assert len(requests) == 1
+    assert [update["asset_id"] for update in requests[0]["updates"]] == [str(i) for i in ids]
+
+
+@pytest.mark.asyncio
+async def test_full_batch_is_sent_without_waiting_for_window():
+    requests: list[dict] = []
+    async with _client(requests) as client:
+        batcher = _AssetBatcher(client, window_seconds=30, max_batch=2)
+        await asyncio.wait_for(
+            asyncio.gather(*(batcher.submit(uuid.uuid4(), {"status": "ready"}) for _ in range(4))),
+            timeout=1,
+        )
+
+    assert [len(request["updates"]) for request in requests] == [2, 2]
+
+
+@pytest.mark.asyncio
+async def test_missing_asset_fails_only_its_caller():
+    requests: list[dict] = []
+    gone, kept = uuid.uuid4(), uuid.uuid4()
+    async with _client(requests, missing={str(gone)}) as client:
+        batcher = _AssetBatcher(client, window_seconds=0.01, max_batch=100)
+        results = await asyncio.gather(
+            batcher.submit(gone, {"status": "ready"}),
+            batcher.submit(kept, {"status": "ready"}),
+            return_exceptions=True,
+        )
+
+    assert isinstance(results[0], AssetUpdateError)
+    assert results[1] is None
+
+
+@pytest.mark.asyncio
+async def test_rejected_batch_is_retried_item_by_item():
+    paths: list[str] = []
+    bad, good = uuid.uuid4(), uuid.uuid4()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        paths.append(request.url.path)
+        body = json.loads(request.content)
+        if request.url.path == "/assets:batch" or body.get("status") == "???":
+            return httpx.Response(422, json={"detail": "invalid status"})
+        return httpx.Response(200, json={"id": request.url.path.rsplit("/", 1)[-1], "status": body["status"]})
+
+    async with httpx.AsyncClient(base_url="http://api.test", transport=httpx.MockTransport(handler)) as client:
+        batcher = _AssetBatcher(client, window_seconds=0.01, max_batch=100)
+        results = await asyncio.gather(
+            batcher.submit(bad, {"status": "???"}),
+            batcher.submit(good, {"status": "ready"}),
+            return_exceptions=True,
+        )
+
+    assert isinstance(results[0], httpx.HTTPStatusError)
+    assert results[0].response.status_code == 422
+    assert results[1] is None
+    assert sorted(paths) == sorted(["/assets:batch", f"/assets/{bad}", f"/assets/{good}"])
+
+
+@pytest.mark.asyncio
+async def test_close_drains_pending_updates(monkeypatch):
+    requests: list[dict] = []
+    client = _client(requests)
+    api = api_client._LoopApi.__new__(api_client._LoopApi)
+    api.client = client
+    api.assets = _AssetBatcher(client, window_seconds=30, max_batch=100)
+    monkeypatch.setitem(api_client._APIS, asyncio.get_running_loop(), api)
+
+    pending = asyncio.create_task(api_client.patch_asset(uuid.uuid4(), status="failed", error_code="x"))
+    await asyncio.sleep(0)
+    await api_client.close_api_client()
+    await pending
+
+    assert requests[0]["updates"][0]["error_code"] == "x"
+    assert client.is_closed
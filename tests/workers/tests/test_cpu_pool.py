@@ -0,0 +1,39 @@
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+from app import cpu_pool, media_processing
+from app.settings import get_settings
+
+
+@pytest.fixture
+def source_image(tmp_path: Path) -> Path:
+    path = tmp_path / "source"
+    Image.new("RGB", (1200, 800), color=(200, 120, 40)).save(path, format="JPEG")
+    return path
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("pool_size", [0, 1])
+async def test_run_cpu_bound_renders_variants_by_path(monkeypatch, tmp_path, source_image, pool_size):
+    monkeypatch.setattr(get_settings(), "cpu_pool_size", pool_size)
+    try:
+        rendered = await cpu_pool.run_cpu_bound(
+            media_processing._optimize_image_variants,
+            source_image,
+            tmp_path,
+            [("optimized", 1920, 1080), ("variant_320", 320, 180)],
+            80,
+            "webp",
+        )
+    finally:
+        cpu_pool.shutdown_cpu_executor()
+
+    assert [(preset, width, height) for preset, _, width, height in rendered] == [
+        ("optimized", 1200, 800),
+        ("variant_320", 270, 180),
+    ]
+    for _, path, _, _ in rendered:
+        assert path.parent == tmp_path
+        assert path.stat().st_size > 0
@@ -0,0 +1,146 @@
+import io
+import uuid
+import zipfile
+
+import pytest
+
+from app import exports
+from app.export_checkpoints import ExportProgress
+
+
+class _FakeCheckpoints:
+    """Linha de `data_exports` em memória; `progress=None` simula job sem linha."""
+
+    def __init__(self, progress: ExportProgress | None = None) -> None:
+        self.progress = progress
+        self.saves = 0
+
+    async def load(self, export_id):
+        return self.progress
+
+    async def begin(self, export_id, *, upload_id, checkpoint) -> None:
+        self.progress = ExportProgress("running", upload_id, checkpoint, 0, 0)
+
+    async def save(self, export_id, *, items_done, bytes_written, checkpoint=None) -> None:
+        self.saves += 1
+        self.progress.status = "running"
+        self.progress.items_done = items_done
+        self.progress.bytes_written = bytes_written
+        if checkpoint is not None:
+            self.progress.checkpoint = checkpoint
+
+    async def complete(self, export_id, *, result_key, items_done, bytes_written) -> None:
+        self.progress = ExportProgress("completed", None, None, items_done, bytes_written)
+
+    async def fail(self, export_id, *, message) -> None:
+        self.progress.status = "failed"
+
+    async def reset(self, export_id) -> None:
+        self.progress.upload_id = None
+        self.progress.checkpoint = None
+
+
+@pytest.fixture(autouse=True)
+def _untracked_exports(monkeypatch):
+    monkeypatch.setattr(exports, "_CHECKPOINTS", _FakeCheckpoints())
+
+
+def _payload(objects: dict[str, bytes]) -> dict:
+    return {
+        "export_id": str(uuid.uuid4()),
+        "account_id": str(uuid.uuid4()),
+        "items": [{"key": key, "filename": f"fotos/{key}"} for key in objects],
+    }
+
+
+@pytest.mark.asyncio
+async def test_export_streams_zip_into_multipart_parts(monkeypatch, tmp_path, fake_storage):
+    objects = {f"{index}.jpg": bytes([index]) * 4000 for index in range(12)}
+    storage = fake_storage(objects=objects)
+    monkeypatch.setattr(exports, "_STORAGE", storage)
+    monkeypatch.setattr(exports, "_MIN_PART_BYTES", 10_000)
+    monkeypatch.setattr(exports._SETTINGS, "export_part_mb", 0)
+    monkeypatch.setattr(exports._SETTINGS, "export_download_concurrency", 3)
+    monkeypatch.setattr(exports._SETTINGS, "tmp_dir", tmp_path)
+
+    await exports.build_export_zip(_payload(objects), {})
+
+    assert storage.completed == [(number, f"etag-{number}") for number in range(1, len(storage.parts) + 1)]
+    assert len(storage.parts) > 1
+    assert all(len(storage.parts[number]) == 10_000 for number in range(1, len(storage.parts)))
+    assert 1 < storage.peak_downloads <= 3
+    archive = zipfile.ZipFile(io.BytesIO(b"".join(storage.parts[n] for n in sorted(storage.parts))))
+    assert {name: archive.read(name) for name in archive.namelist()} == {
+        f"fotos/{key}": data for key, data in objects.items()
+    }
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_export_aborts_multipart_when_item_fails(monkeypatch, tmp_path, fake_storage):
+    storage = fake_storage(objects={"a.jpg": b"a"})
+    monkeypatch.setattr(exports, "_STORAGE", storage)
+    monkeypatch.setattr(exports._SETTINGS, "tmp_dir", tmp_path)
+    payload = _payload({"a.jpg": b"a"})
+    payload["items"].append({"key": "missing.jpg", "filename": "missing.jpg"})
+
+    with pytest.raises(KeyError):
+        await exports.build_export_zip(payload, {})
+
+    assert storage.aborted
+    assert storage.completed is None
+
+
+@pytest.mark.asyncio
+async def test_export_resumes_from_checkpoint_after_failure(monkeypatch, tmp_path, fake_storage):
+    objects = {f"{index:02d}.jpg": bytes([index]) * 6000 for index in range(10)}
+    storage = fake_storage(objects=objects, fail_downloads={"07.jpg"})
+    checkpoints = _FakeCheckpoints(ExportProgress("queued", None, None, 0, 0))
+    monkeypatch.setattr(exports, "_STORAGE", storage)
+    monkeypatch.setattr(exports, "_CHECKPOINTS", checkpoints)
+    monkeypatch.setattr(exports, "_MIN_PART_BYTES", 10_000)
+    monkeypatch.setattr(exports._SETTINGS, "export_part_mb", 1)
+    monkeypatch.setattr(exports._SETTINGS, "export_download_concurrency", 1)
+    monkeypatch.setattr(exports._SETTINGS, "export_checkpoint_seconds", 0)
+    monkeypatch.setattr(exports._SETTINGS, "tmp_dir", tmp_path)
+    payload = _payload(objects)
+
+    with pytest.raises(ConnectionError):
+        await exports.build_export_zip(payload, {})
+
+    assert not storage.aborted
+    assert checkpoints.progress.status == "failed"
+    resumed_at = checkpoints.progress.checkpoint["items"]
+    assert 0 < resumed_at <= 7
+    storage.downloaded.clear()
+
+    await exports.build_export_zip(payload, {})
+
+    assert storage.uploads_created == 1
+    assert storage.downloaded == sorted(objects)[resumed_at:]
+    assert checkpoints.progress.status == "completed"
+    assert checkpoints.progress.items_done == len(objects)
+    assert storage.completed == [(number, f"etag-{number}") for number in range(1, len(storage.completed) + 1)]
+    archive = zipfile.ZipFile(io.BytesIO(b"".join(storage.parts[n] for n, _ in storage.completed)))
+    assert archive.testzip() is None
+    assert {name: archive.read(name) for name in archive.namelist()} == {
+        f"fotos/{key}": data for key, data in objects.items()
+    }
+
+
+@pytest.mark.asyncio
+async def test_export_aborts_multipart_on_final_attempt(monkeypatch, tmp_path, fake_storage):
+    objects = {f"{index:02d}.jpg": bytes([index]) * 6000 for index in range(4)}
+    storage = fake_storage(objects=objects, fail_downloads={"02.jpg"})
+    checkpoints = _FakeCheckpoints(ExportProgress("queued", None, None, 0, 0))
+    monkeypatch.setattr(exports, "_STORAGE", storage)
+    monkeypatch.setattr(exports, "_CHECKPOINTS", checkpoints)
+    monkeypatch.setattr(exports._SETTINGS, "tmp_dir", tmp_path)
+
+    with pytest.raises(ConnectionError):
+        await exports.build_export_zip(_payload(objects), {"attempt": 5, "max_attempts": 5})
+
+    assert storage.aborted
+    assert checkpoints.progress.status == "failed"
+    assert checkpoints.progress.upload_id is None
+    assert checkpoints.progress.checkpoint is None
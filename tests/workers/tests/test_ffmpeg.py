@@ -0,0 +1,61 @@
+from pathlib import Path
+
+from app import ffmpeg
+from app.video_plan import PresetPlan, VideoTarget, parse_ffmpeg_report
+
+_LADDER_STDERR = """\
+Input #0, mov,mp4,m4a,3gp,3g2,mj2, from 'source':
+  Duration: 00:01:02.50, start: 0.000000, bitrate: 9012 kb/s
+  Stream #0:0[0x1](und): Video: h264 (High) (avc1 / 0x31637661), yuv420p(progressive), 3840x2160, 8800 kb/s, 30 fps
+  Stream #0:1[0x2](und): Audio: aac (LC) (mp4a / 0x6134706D), 48000 Hz, stereo, fltp, 192 kb/s
+Stream mapping:
+  Stream #0:0 (h264) -> split:default
+  scale:default -> Stream #0:0 (libx264)
+Output #0, mp4, to 'video_1080p.mp4':
+  Stream #0:0: Video: h264 (avc1 / 0x31637661), yuv420p(progressive), 1920x1080, q=2-31, 30 fps
+  Stream #0:1(und): Audio: aac (LC) (mp4a / 0x6134706D), 48000 Hz, stereo, fltp, 128 kb/s
+Output #1, mp4, to 'video_720p.mp4':
+  Stream #1:0: Video: h264 (avc1 / 0x31637661), yuv420p(progressive), 1280x720, q=2-31, 30 fps
+  Stream #1:1(und): Audio: aac (LC) (mp4a / 0x6134706D), 48000 Hz, stereo, fltp, 128 kb/s
+frame= 1875 fps=120 q=-1.0 Lsize=   12000kB time=00:01:02.48 bitrate=1573.2kbits/s speed=4.0x
+"""
+
+
+def _plan(action: str, target: VideoTarget) -> PresetPlan:
+    return PresetPlan(target, action, "test")  # type: ignore[arg-type]
+
+
+def test_ladder_args_decode_once_and_split_per_preset(tmp_path: Path):
+    outputs = [(_plan("encode", target), tmp_path / f"{target.preset}.mp4") for target in ffmpeg.VIDEO_PRESETS]
+
+    args = ffmpeg._ladder_args(tmp_path / "source", outputs)
+
+    assert args.count("-i") == 1
+    graph = args[args.index("-filter_complex") + 1]
+    assert graph.startswith("[0:v]split=2[v0][v1];")
+    assert "[v0]scale=w='min(1920,iw)':h=-2[v0out]" in graph
+    assert "[v1]scale=w='min(1280,iw)':h=-2[v1out]" in graph
+    assert args[-1] == str(tmp_path / "video_720p.mp4")
+
+
+def test_ladder_args_remux_only_skips_filter_graph(tmp_path: Path):
+    output = tmp_path / "video_720p.mp4"
+
+    args = ffmpeg._ladder_args(tmp_path / "source", [(_plan("copy", ffmpeg.VIDEO_PRESETS[1]), output)])
+
+    assert "-filter_complex" not in args
+    assert args[-5:] == ["-c", "copy", "-movflags", "+faststart", str(output)]
+    assert "libx264" not in args
+
+
+def test_parse_ffmpeg_report_reads_sizes_and_duration():
+    report = parse_ffmpeg_report(_LADDER_STDERR)
+
+    assert report.output_sizes == {0: (1920, 1080), 1: (1280, 720)}
+    assert report.duration_ms == 62500
+
+
+def test_parse_ffmpeg_report_falls_back_to_encoder_time():
+    stderr = _LADDER_STDERR.replace("Duration: 00:01:02.50", "Duration: N/A")
+
+    assert parse_ffmpeg_report(stderr).duration_ms == 62480
@@ -0,0 +1,93 @@
+import asyncio
+
+import pytest
+
+from app import ffmpeg_runner
+from app.ffmpeg_runner import StderrBuffer, run_ffmpeg
+from app.progress import JobProgress
+from app.video_plan import parse_ffmpeg_report
+
+
+def test_stderr_buffer_keeps_head_and_bounded_tail():
+    buffer = StderrBuffer(head=2, tail=3)
+
+    buffer.feed("Input #0\nDuration: 00:00:10.00\n")
+    for frame in range(10):
+        buffer.feed(f"frame={frame} time=00:00:0{frame}.00\r")
+    buffer.feed("tail without newline")
+    buffer.close()
+
+    assert buffer.head == ["Input #0", "Duration: 00:00:10.00"]
+    assert list(buffer.tail) == ["frame=8 time=00:00:08.00", "frame=9 time=00:00:09.00", "tail without newline"]
+    assert "[... 8 linhas omitidas ...]" in buffer.text()
+
+
+def _ladder_header(metadata_lines: int) -> str:
+    lines = ["Input #0, mov,mp4,m4a,3gp,3g2,mj2, from 'IMG_0001.MOV':", "  Duration: 00:01:00.00, bitrate: 12000 kb/s"]
+    lines += [f"      com.apple.quicktime.meta{index}: value" for index in range(metadata_lines)]
+    for index, (width, height) in enumerate([(1920, 1080), (1280, 720)]):
+        lines += [f"[libx264 @ 0x{index}] using SAR=1/1", f"[libx264 @ 0x{index}] profile High, level 4.0"]
+        lines += [f"Output #{index}, mp4, to 'video_{height}p.mp4':"]
+        lines += [f"      side data {line}: value" for line in range(metadata_lines // 2)]
+        lines += [f"  Stream #{index}:0: Video: h264, yuv420p(tv, bt709), {width}x{height}, q=2-31, 30 fps"]
+    return "\n".join(lines) + "\n"
+
+
+def test_stderr_buffer_keeps_whole_header_before_stats():
+    buffer = StderrBuffer(tail=5)
+
+    buffer.feed(_ladder_header(metadata_lines=60))
+    for second in range(50):
+        buffer.feed(f"frame={second * 30} fps=60 time=00:00:{second:02d}.00\r")
+    buffer.close()
+
+    assert len(buffer.head) > 80
+    assert parse_ffmpeg_report(buffer.text()).output_sizes == {0: (1920, 1080), 1: (1280, 720)}
+
+
+class _FakeProcess:
+    def __init__(self, stderr: bytes) -> None:
+        self.stdout = asyncio.StreamReader()
+        self.stdout.feed_eof()
+        self.stderr = asyncio.StreamReader()
+        self.stderr.feed_data(stderr)
+        self.stderr.feed_eof()
+
+    async def wait(self) -> int:
+        return 0
+
+
+@pytest.mark.asyncio
+async def test_run_ffmpeg_disables_stats_and_reports_every_output(monkeypatch):
+    argv: list[str] = []
+
+    async def _exec(*args, **kwargs):
+        argv.extend(args)
+        return _FakeProcess(_ladder_header(metadata_lines=60).encode())
+
+    monkeypatch.setattr(ffmpeg_runner.asyncio, "create_subprocess_exec", _exec)
+
+    stderr = await run_ffmpeg("ffmpeg", ["-i", "in.mov", "out.mp4"])
+
+    assert argv[:4] == ["ffmpeg", "-progress", "pipe:1", "-nostats"]
+    assert set(parse_ffmpeg_report(stderr).output_sizes) == {0, 1}
+
+
+@pytest.mark.asyncio
+async def test_job_progress_throttles_media_updates():
+    sent: list[dict] = []
+
+    async def _sender(job_id: str, **fields) -> None:
+        sent.append(fields)
+
+    progress = JobProgress("job_1", min_interval=60.0, sender=_sender)
+    await progress.set_stage("transcoding", 5.0)
+    on_time = progress.media_callback(10_000, 5.0, 90.0)
+    for elapsed_ms in range(0, 10_001, 1_000):
+        on_time(elapsed_ms)
+    await asyncio.sleep(0)
+    await progress.complete()
+
+    assert [item["stage"] for item in sent] == ["transcoding", "completed"]
+    assert sent[-1]["status"] == "completed"
+    assert sent[-1]["progress"] == 100.0
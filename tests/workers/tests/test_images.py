@@ -0,0 +1,102 @@
+import dataclasses
+import uuid
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+from app import images, source_fetch
+from app.source_fetch import SourceRejected
+
+
+def _sizes(results: list[tuple[str, Path, int, int]]) -> dict[str, tuple[int, int]]:
+    return {preset: (width, height) for preset, _, width, height in results}
+
+
+def test_resize_variants_pyramid_respects_exif_rotation(tmp_path: Path):
+    source = tmp_path / "original"
+    exif = Image.Exif()
+    exif[0x0112] = 6  # rotate 90° CW on display
+    Image.new("RGB", (4000, 3000), color=(10, 90, 200)).save(source, format="JPEG", exif=exif)
+
+    results = images._resize_variants(source)
+
+    assert [preset for preset, *_ in results] == ["thumb", "card", "full"]
+    assert _sizes(results) == {
+        "thumb": (400, 533),
+        "card": (800, 1067),
+        "full": (1600, 2133),
+    }
+    for preset, path, width, height in results:
+        with Image.open(path) as rendered:
+            assert rendered.format == "WEBP"
+            assert rendered.size == (width, height)
+
+
+def test_resize_variants_never_upscales_small_sources(tmp_path: Path):
+    source = tmp_path / "original"
+    Image.new("RGBA", (300, 200), color=(0, 0, 0, 0)).save(source, format="PNG")
+
+    results = images._resize_variants(source)
+
+    assert set(_sizes(results).values()) == {(300, 200)}
+
+
+def test_resize_variants_uses_profile_format_per_preset(tmp_path: Path):
+    source = tmp_path / "original"
+    Image.new("RGB", (2000, 1500), color=(200, 120, 40)).save(source, format="JPEG")
+    profiles = dict(images.ENCODER_PROFILES["fast"])
+    profiles["full"] = images.EncoderProfile("avif", quality=50, effort=0)
+
+    results = images._resize_variants(source, profiles)
+
+    paths = {preset: path for preset, path, *_ in results}
+    assert paths["thumb"].suffix == ".webp"
+    assert paths["full"].suffix == ".avif"
+    with Image.open(paths["full"]) as rendered:
+        assert rendered.format == "AVIF"
+
+
+def test_resolve_encoder_profiles_falls_back_to_default_for_unknown_name():
+    assert images.resolve_encoder_profiles("nope") == images.ENCODER_PROFILES["balanced"]
+    assert images.resolve_encoder_profiles(None) == images.ENCODER_PROFILES["balanced"]
+
+
+def test_resolve_encoder_profiles_replaces_avif_when_unsupported(monkeypatch):
+    monkeypatch.setattr(images.features, "check", lambda name: False)
+
+    profiles = images.resolve_encoder_profiles("avif")
+
+    assert profiles["full"].format == "webp"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("code", "deleted"),
+    [("checksum_mismatch", False), ("invalid_file_signature", True)],
+)
+async def test_create_thumbnail_keeps_upload_unless_signature_is_invalid(
+    monkeypatch, tmp_path: Path, fake_storage, code, deleted
+):
+    storage = fake_storage()
+    patched: list[dict] = []
+
+    async def _reject(*args, **kwargs):
+        raise SourceRejected(code, "recusado")
+
+    async def _patch_asset(asset_id, **fields):
+        patched.append(fields)
+
+    monkeypatch.setattr(images, "_SETTINGS", dataclasses.replace(images._SETTINGS, tmp_dir=tmp_path))
+    monkeypatch.setattr(images, "_STORAGE", storage)
+    monkeypatch.setattr(images, "fetch_source", _reject)
+    monkeypatch.setattr(images, "get_source_cache", lambda: None)
+    monkeypatch.setattr(source_fetch, "patch_asset", _patch_asset)
+
+    await images.create_thumbnail(
+        {"asset_id": str(uuid.uuid4()), "account_id": str(uuid.uuid4()), "key": "u/original.jpg", "mime": "image/jpeg"},
+        {},
+    )
+
+    assert patched == [{"status": "failed", "error_code": code, "viewer_accessible": False}]
+    assert storage.deleted == (["u/original.jpg"] if deleted else [])
@@ -1,6 +1,17 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+
 import pytest
 
 from app import queue
+from babybook_api.db.models import WORKER_JOBS_CHANNEL, WorkerJob
+
+
+@pytest.fixture(autouse=True)
+def _no_resource_hooks(monkeypatch):
+    # O consumer abre o cliente S3 compartilhado no startup; os testes de fila não precisam.
+    monkeypatch.setattr(queue, "RESOURCE_HOOKS", [])
 
 
 @pytest.mark.asyncio
@@ -15,3 +26,286 @@ async def test_consumer_runs(monkeypatch):
     consumer = queue.QueueConsumer(concurrency=1, exit_on_idle=True)
     await consumer.run()
     assert called, "handler deve ser chamado para job em memória"
+
+
+def test_database_backend_listen_dsn_drops_sqlalchemy_driver():
+    backend = queue.DatabaseQueueBackend(
+        "postgresql+asyncpg://bb:secret@db:5432/babybook",
+        visibility_timeout=60,
+        max_attempts=5,
+    )
+    assert backend._listen_enabled
+    assert backend._listen_dsn == "postgresql://bb:secret@db:5432/babybook"
+
+
+@pytest.mark.asyncio
+async def test_database_backend_notify_wakes_idle_consumer():
+    backend = queue.DatabaseQueueBackend(
+        "sqlite+aiosqlite:///:memory:",
+        visibility_timeout=60,
+        max_attempts=5,
+    )
+    assert not backend._listen_enabled
+    waiter = asyncio.create_task(backend.wait_for_jobs(30))
+    await asyncio.sleep(0)
+    backend._on_notify(None, 0, WORKER_JOBS_CHANNEL, "image.thumbnail")
+    await asyncio.wait_for(waiter, timeout=1)
+    await backend.close()
+
+
+async def _sqlite_backend_with_running_job(
+    tmp_path,
+    lease_token: str,
+    *,
+    attempts: int = 1,
+    available_at: datetime | None = None,
+) -> tuple[queue.DatabaseQueueBackend, uuid.UUID]:
+    backend = queue.DatabaseQueueBackend(
+        f"sqlite+aiosqlite:///{tmp_path / 'jobs.db'}",
+        visibility_timeout=60,
+        max_attempts=5,
+    )
+    async with backend._engine.begin() as conn:
+        await conn.run_sync(WorkerJob.__table__.create)
+    async with backend._sessionmaker() as session:
+        job = WorkerJob(
+            kind="video.transcode",
+            payload={},
+            job_metadata={},
+            status="running",
+            attempts=attempts,
+            lease_token=lease_token,
+            available_at=available_at or datetime.utcnow(),
+        )
+        session.add(job)
+        await session.commit()
+        return backend, job.id
+
+
+@pytest.mark.asyncio
+async def test_database_backend_rejects_stale_lease(tmp_path):
+    backend, job_id = await _sqlite_backend_with_running_job(tmp_path, lease_token="current")
+    stale = queue.QueueMessage(id=str(job_id), kind="video.transcode", payload={}, lease_token="stale")
+    current = queue.QueueMessage(id=str(job_id), kind="video.transcode", payload={}, lease_token="current")
+
+    assert await backend.extend_lease(stale) is False
+    assert await backend.extend_lease(current) is True
+
+    await backend.ack(stale, success=True)
+    async with backend._sessionmaker() as session:
+        assert await session.get(WorkerJob, job_id) is not None
+
+    await backend.ack(current, success=True)
+    async with backend._sessionmaker() as session:
+        assert await session.get(WorkerJob, job_id) is None
+    await backend.close()
+
+
+@pytest.mark.asyncio
+async def test_database_backend_fails_expired_lease_on_last_attempt(tmp_path):
+    backend, job_id = await _sqlite_backend_with_running_job(
+        tmp_path,
+        lease_token="dead-worker",
+        attempts=5,
+        available_at=datetime.utcnow() - timedelta(minutes=5),
+    )
+
+    assert await backend.fetch(10) == []
+    async with backend._sessionmaker() as session:
+        job = await session.get(WorkerJob, job_id)
+        assert job.status == "failed"
+        assert job.last_error == "lease_expired"
+        assert job.lease_token is None
+    await backend.close()
+
+
+@pytest.mark.asyncio
+async def test_database_backend_reclaims_expired_lease_with_attempts_left(tmp_path):
+    backend, job_id = await _sqlite_backend_with_running_job(
+        tmp_path,
+        lease_token="dead-worker",
+        attempts=4,
+        available_at=datetime.utcnow() - timedelta(minutes=5),
+    )
+
+    messages = await backend.fetch(10)
+
+    assert [message.id for message in messages] == [str(job_id)]
+    assert messages[0].lease_token != "dead-worker"
+    assert messages[0].metadata["attempt"] == 5
+    assert messages[0].metadata["max_attempts"] == 5
+    await backend.close()
+
+
+@pytest.mark.asyncio
+async def test_consumer_cancels_handler_when_lease_is_lost(monkeypatch):
+    monkeypatch.setenv("QUEUE_PROVIDER", "memory")
+    monkeypatch.setenv("QUEUE_HEARTBEAT_INTERVAL", "0.01")
+    acked: list[bool] = []
+
+    async def _slow_handler(payload: dict, metadata: dict) -> None:
+        await asyncio.sleep(5)
+
+    async def _lost_lease(message: queue.QueueMessage) -> bool:
+        return False
+
+    async def _ack(message: queue.QueueMessage, *, success: bool, error: str | None = None) -> None:
+        acked.append(success)
+
+    monkeypatch.setitem(queue.JOB_MAP, "video.transcode", _slow_handler)
+    consumer = queue.QueueConsumer(concurrency=1, exit_on_idle=True)
+    monkeypatch.setattr(consumer.backend, "extend_lease", _lost_lease)
+    monkeypatch.setattr(consumer.backend, "ack", _ack)
+
+    message = queue.QueueMessage(id="job-1", kind="video.transcode", payload={})
+    await asyncio.wait_for(consumer._handle_message(message), timeout=1)
+    assert acked == []
+
+
+def test_build_job_lanes_applies_overrides():
+    overrides = queue._parse_lane_overrides("video.transcode=3, export.zip=0, bogus")
+    lanes = queue.build_job_lanes(overrides)
+    by_kind = {lane.name: lane for lane in lanes}
+
+    assert all(lane.kinds == (lane.name,) for lane in lanes)
+    assert by_kind["image.thumbnail"].concurrency == queue.JOB_LANE_CONCURRENCY["image.thumbnail"]
+    assert by_kind["video.transcode"].concurrency == 3
+    assert "export.zip" not in by_kind
+
+
+class _LaneBackend:
+    supports_lanes = True
+
+    def __init__(self, jobs: list[queue.QueueMessage]) -> None:
+        self.jobs = jobs
+        self.fetches: list[tuple[int, tuple[str, ...] | None]] = []
+        self.released: list[str] = []
+
+    async def fetch(self, batch_size, kinds=None):
+        self.fetches.append((batch_size, tuple(kinds) if kinds else None))
+        picked = [job for job in self.jobs if not kinds or job.kind in kinds][:batch_size]
+        for job in picked:
+            self.jobs.remove(job)
+        return picked
+
+    async def ack(self, message, *, success, error=None):
+        return None
+
+    async def extend_lease(self, message):
+        return True
+
+    async def release(self, message):
+        self.released.append(message.id)
+
+    async def wait_for_jobs(self, poll_interval, kinds=None):
+        await asyncio.sleep(0.01)
+
+    async def close(self):
+        return None
+
+
+@pytest.mark.asyncio
+async def test_consumer_lanes_fetch_only_their_kinds(monkeypatch):
+    monkeypatch.setenv("QUEUE_PROVIDER", "memory")
+    handled: list[str] = []
+
+    async def _handler(payload: dict, metadata: dict) -> None:
+        handled.append(payload["id"])
+
+    monkeypatch.setitem(queue.JOB_MAP, "image.thumbnail", _handler)
+    monkeypatch.setitem(queue.JOB_MAP, "video.transcode", _handler)
+    lanes = [
+        queue.JobLane(name="thumbs", kinds=("image.thumbnail",), concurrency=4),
+        queue.JobLane(name="video", kinds=("video.transcode",), concurrency=1),
+    ]
+    consumer = queue.QueueConsumer(exit_on_idle=True, lanes=lanes)
+    consumer.backend = _LaneBackend(
+        [
+            queue.QueueMessage(id="v1", kind="video.transcode", payload={"id": "v1"}),
+            queue.QueueMessage(id="t1", kind="image.thumbnail", payload={"id": "t1"}),
+            queue.QueueMessage(id="t2", kind="image.thumbnail", payload={"id": "t2"}),
+        ]
+    )
+    await consumer.run()
+
+    assert sorted(handled) == ["t1", "t2", "v1"]
+    assert {kinds for _, kinds in consumer.backend.fetches} == {("image.thumbnail",), ("video.transcode",)}
+
+
+@pytest.mark.asyncio
+async def test_consumer_refills_free_slot_without_waiting_for_slow_job(monkeypatch):
+    monkeypatch.setenv("QUEUE_PROVIDER", "memory")
+    monkeypatch.setenv("QUEUE_PREFETCH", "0")
+    order: list[str] = []
+    slow_started = asyncio.Event()
+
+    async def _handler(payload: dict, metadata: dict) -> None:
+        if payload["id"] == "slow":
+            slow_started.set()
+            await asyncio.sleep(0.2)
+        else:
+            await slow_started.wait()
+        order.append(payload["id"])
+
+    monkeypatch.setitem(queue.JOB_MAP, "video.transcode", _handler)
+    lanes = [queue.JobLane(name="video", kinds=("video.transcode",), concurrency=2)]
+    consumer = queue.QueueConsumer(exit_on_idle=True, lanes=lanes)
+    consumer.backend = _LaneBackend(
+        [queue.QueueMessage(id=job_id, kind="video.transcode", payload={"id": job_id}) for job_id in ("slow", "f1", "f2", "f3")]
+    )
+    await consumer.run()
+
+    assert order == ["f1", "f2", "f3", "slow"]
+
+
+@pytest.mark.asyncio
+async def test_consumer_stop_finishes_in_flight_and_releases_prefetched(monkeypatch):
+    monkeypatch.setenv("QUEUE_PROVIDER", "memory")
+    monkeypatch.setenv("QUEUE_PREFETCH", "2")
+    finished: list[str] = []
+    started = asyncio.Event()
+
+    async def _handler(payload: dict, metadata: dict) -> None:
+        started.set()
+        await asyncio.sleep(0.05)
+        finished.append(payload["id"])
+
+    monkeypatch.setitem(queue.JOB_MAP, "video.transcode", _handler)
+    lanes = [queue.JobLane(name="video", kinds=("video.transcode",), concurrency=1)]
+    consumer = queue.QueueConsumer(lanes=lanes)
+    backend = _LaneBackend(
+        [queue.QueueMessage(id=job_id, kind="video.transcode", payload={"id": job_id}) for job_id in ("j1", "j2", "j3")]
+    )
+    consumer.backend = backend
+    runner = asyncio.create_task(consumer.run())
+    await started.wait()
+    consumer.stop()
+    await asyncio.wait_for(runner, timeout=1)
+
+    assert finished == ["j1"]
+    assert backend.released == ["j2", "j3"]
+
+
+@pytest.mark.asyncio
+async def test_consumer_runs_resource_hooks_around_jobs(monkeypatch):
+    monkeypatch.setenv("QUEUE_PROVIDER", "memory")
+    events: list[str] = []
+
+    def _hook(name: str):
+        async def _run() -> None:
+            events.append(name)
+
+        return _run
+
+    async def _handler(payload: dict, metadata: dict) -> None:
+        events.append("job")
+
+    monkeypatch.setattr(
+        queue,
+        "RESOURCE_HOOKS",
+        [(_hook("open:a"), _hook("close:a")), (_hook("open:b"), _hook("close:b"))],
+    )
+    monkeypatch.setitem(queue.JOB_MAP, "video.transcode", _handler)
+    consumer = queue.QueueConsumer(concurrency=1, exit_on_idle=True)
+    await consumer.run()
+    assert events == ["open:a", "open:b", "job", "close:b", "close:a"]
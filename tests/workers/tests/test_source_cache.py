@@ -0,0 +1,87 @@
+import hashlib
+import os
+from functools import partial
+
+import pytest
+
+from app.file_validation import validate_magic_bytes
+from app.source_cache import SourceCache
+from app.source_fetch import SourceRejected, fetch_source
+
+_JPEG = b"\xFF\xD8\xFF\xE0" + os.urandom(3000)
+
+
+def _fetch(storage, cache, destination, mime="image/jpeg"):
+    return fetch_source(
+        storage,
+        bucket="uploads",
+        key="u/1/assets/2/original.jpg",
+        destination=destination,
+        check_header=partial(validate_magic_bytes, declared_content_type=mime),
+        expected_sha256=hashlib.sha256(storage.data).hexdigest(),
+        cache=cache,
+    )
+
+
+@pytest.mark.asyncio
+async def test_second_job_gets_hardlink_without_reading_storage(tmp_path, fake_storage):
+    cache = SourceCache(tmp_path / "cache", max_bytes=10 * 1024 * 1024, min_free_bytes=0)
+    storage = fake_storage(_JPEG)
+
+    first = tmp_path / "job1" / "original"
+    await _fetch(storage, cache, first)
+    reads_after_first = storage.reads
+    second = tmp_path / "job2" / "original"
+    await _fetch(storage, cache, second)
+
+    assert storage.reads == reads_after_first
+    assert second.read_bytes() == _JPEG
+    assert os.stat(first).st_ino == os.stat(second).st_ino
+
+
+@pytest.mark.asyncio
+async def test_new_etag_misses_and_hit_still_runs_job_checks(tmp_path, fake_storage):
+    cache = SourceCache(tmp_path / "cache", max_bytes=10 * 1024 * 1024, min_free_bytes=0)
+    storage = fake_storage(_JPEG)
+    await _fetch(storage, cache, tmp_path / "job1" / "original")
+
+    with pytest.raises(SourceRejected):
+        await _fetch(storage, cache, tmp_path / "job2" / "original", mime="video/mp4")
+
+    storage.etag = "v2"
+    reads = storage.reads
+    await _fetch(storage, cache, tmp_path / "job3" / "original")
+    assert storage.reads > reads
+
+
+@pytest.mark.asyncio
+async def test_cache_evicts_least_recently_used_over_budget(tmp_path, fake_storage):
+    cache = SourceCache(tmp_path / "cache", max_bytes=len(_JPEG) * 2, min_free_bytes=0)
+    storages = [fake_storage(_JPEG, etag=f"v{index}") for index in range(3)]
+    for index, storage in enumerate(storages[:2]):
+        await _fetch(storage, cache, tmp_path / f"job{index}" / "original")
+    # Hit no primeiro: o segundo passa a ser o menos recente.
+    reads = storages[0].reads
+    await _fetch(storages[0], cache, tmp_path / "again" / "original")
+    assert storages[0].reads == reads
+
+    await _fetch(storages[2], cache, tmp_path / "job2" / "original")
+
+    names = {cache.entry_name("uploads", "u/1/assets/2/original.jpg", s.etag) for s in storages}
+    kept = {path.name for path in (tmp_path / "cache").iterdir()} & names
+    assert kept == {
+        cache.entry_name("uploads", "u/1/assets/2/original.jpg", "v0"),
+        cache.entry_name("uploads", "u/1/assets/2/original.jpg", "v2"),
+    }
+
+
+@pytest.mark.asyncio
+async def test_rejected_source_is_not_cached(tmp_path, fake_storage):
+    cache = SourceCache(tmp_path / "cache", max_bytes=10 * 1024 * 1024, min_free_bytes=0)
+    storage = fake_storage(b"MZ" + b"\x00" * 3000)
+
+    with pytest.raises(SourceRejected):
+        await _fetch(storage, cache, tmp_path / "job" / "original")
+
+    assert [p.name for p in (tmp_path / "cache").iterdir()] == [".staging"]
+    assert list((tmp_path / "cache" / ".staging").iterdir()) == []
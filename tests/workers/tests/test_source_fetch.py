@@ -0,0 +1,212 @@
+import hashlib
+import uuid
+from functools import partial
+
+import pytest
+from botocore.exceptions import ClientError
+
+from app import source_fetch
+from app import storage as storage_module
+from app.file_validation import validate_magic_bytes
+from app.settings import get_settings
+from app.source_fetch import HEADER_BYTES, SourceRejected, fetch_source, reject_source
+
+_JPEG = b"\xFF\xD8\xFF\xE0" + b"\x00" * 2000
+
+
+def _check(mime: str):
+    return partial(validate_magic_bytes, declared_content_type=mime)
+
+
+@pytest.mark.asyncio
+async def test_fetch_source_streams_body_after_header_and_verifies_sha256(tmp_path, fake_storage):
+    storage = fake_storage(_JPEG)
+    destination = tmp_path / "original"
+
+    digest = await fetch_source(
+        storage,
+        bucket="b",
+        key="k",
+        destination=destination,
+        check_header=_check("image/jpeg"),
+        expected_sha256=hashlib.sha256(_JPEG).hexdigest().upper(),
+    )
+
+    assert destination.read_bytes() == _JPEG
+    assert digest == hashlib.sha256(_JPEG).hexdigest()
+    assert storage.ranges == [(0, HEADER_BYTES - 1)]
+    # O corpo continua de onde o cabeçalho parou: nenhum byte é baixado duas vezes.
+    assert storage.streamed_from == [HEADER_BYTES]
+
+
+@pytest.mark.asyncio
+async def test_fetch_source_rejects_spoofed_signature_before_download(tmp_path, fake_storage):
+    storage = fake_storage(b"MZ" + b"\x00" * 5000)
+
+    with pytest.raises(SourceRejected) as excinfo:
+        await fetch_source(
+            storage,
+            bucket="b",
+            key="k",
+            destination=tmp_path / "original",
+            check_header=_check("image/jpeg"),
+        )
+
+    assert excinfo.value.code == "invalid_file_signature"
+    assert storage.streamed_from == []
+    assert not (tmp_path / "original").exists()
+
+
+@pytest.mark.asyncio
+async def test_fetch_source_rejects_checksum_mismatch(tmp_path, fake_storage):
+    storage = fake_storage(_JPEG)
+
+    with pytest.raises(SourceRejected) as excinfo:
+        await fetch_source(
+            storage,
+            bucket="b",
+            key="k",
+            destination=tmp_path / "original",
+            check_header=_check("image/jpeg"),
+            expected_sha256="0" * 64,
+        )
+
+    assert excinfo.value.code == "checksum_mismatch"
+    assert not excinfo.value.discards_source
+    # Antes de recusar, o objeto é baixado de novo (o primeiro stream pode ter vindo corrompido).
+    assert storage.streamed_from == [HEADER_BYTES, HEADER_BYTES]
+
+
+@pytest.mark.asyncio
+async def test_fetch_source_redownloads_after_corrupted_stream(tmp_path, fake_storage):
+    storage = fake_storage(_JPEG, truncate_first_stream=True)
+    destination = tmp_path / "original"
+
+    digest = await fetch_source(
+        storage,
+        bucket="b",
+        key="k",
+        destination=destination,
+        check_header=_check("image/jpeg"),
+        expected_sha256=hashlib.sha256(_JPEG).hexdigest(),
+    )
+
+    assert digest == hashlib.sha256(_JPEG).hexdigest()
+    assert destination.read_bytes() == _JPEG
+
+
+@pytest.mark.asyncio
+async def test_fetch_source_small_object_needs_only_the_range_get(tmp_path, fake_storage):
+    small = _JPEG[:100]
+    storage = fake_storage(small)
+
+    await fetch_source(
+        storage,
+        bucket="b",
+        key="k",
+        destination=tmp_path / "original",
+        check_header=_check("image/jpeg"),
+        expected_sha256=hashlib.sha256(small).hexdigest(),
+    )
+
+    assert (tmp_path / "original").read_bytes() == small
+    assert storage.streamed_from == []
+
+
+class _Body:
+    def __init__(self, data: bytes) -> None:
+        self.data = data
+
+    async def __aenter__(self) -> "_Body":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        return None
+
+    async def read(self) -> bytes:
+        return self.data
+
+    async def iter_chunks(self, chunk_size):
+        for offset in range(0, len(self.data), chunk_size):
+            yield self.data[offset : offset + chunk_size]
+
+
+class _S3Client:
+    """Responde Range como o S3: início além do fim do objeto vira 416 InvalidRange."""
+
+    def __init__(self, data: bytes) -> None:
+        self.data = data
+
+    async def __aenter__(self) -> "_S3Client":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        return None
+
+    async def get_object(self, *, Bucket, Key, Range=None):
+        if Range is None:
+            return {"Body": _Body(self.data)}
+        first, _, last = Range.removeprefix("bytes=").partition("-")
+        start = int(first)
+        if start >= len(self.data):
+            raise ClientError({"Error": {"Code": "InvalidRange"}}, "GetObject")
+        end = int(last) if last else len(self.data) - 1
+        return {"Body": _Body(self.data[start : end + 1])}
+
+
+@pytest.mark.asyncio
+async def test_fetch_source_object_of_exactly_header_size(monkeypatch, tmp_path):
+    exact = _JPEG[:HEADER_BYTES]
+    client = storage_module.StorageClient(get_settings())
+    monkeypatch.setattr(client._session, "client", lambda *args, **kwargs: _S3Client(exact))
+
+    try:
+        digest = await fetch_source(
+            client,
+            bucket="b",
+            key="k",
+            destination=tmp_path / "original",
+            check_header=_check("image/jpeg"),
+            expected_sha256=hashlib.sha256(exact).hexdigest(),
+        )
+    finally:
+        await storage_module.close_shared_storage()
+
+    assert digest == hashlib.sha256(exact).hexdigest()
+    assert (tmp_path / "original").read_bytes() == exact
+
+
+class _RecordingProgress:
+    def __init__(self) -> None:
+        self.failed: list[str] = []
+
+    async def fail(self, code: str) -> None:
+        self.failed.append(code)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(("code", "deleted"), [("invalid_file_signature", True), ("checksum_mismatch", False)])
+async def test_reject_source_fails_asset_and_deletes_only_unsalvageable_uploads(
+    monkeypatch, fake_storage, code, deleted
+):
+    patched: list[dict] = []
+
+    async def _patch_asset(asset_id, **fields):
+        patched.append(fields)
+
+    monkeypatch.setattr(source_fetch, "patch_asset", _patch_asset)
+    storage = fake_storage()
+    progress = _RecordingProgress()
+
+    await reject_source(
+        storage,
+        bucket="uploads",
+        key="u/original.jpg",
+        asset_id=uuid.uuid4(),
+        exc=SourceRejected(code, "recusado"),
+        progress=progress,
+    )
+
+    assert progress.failed == [code]
+    assert patched == [{"status": "failed", "error_code": code, "viewer_accessible": False}]
+    assert storage.deleted == (["u/original.jpg"] if deleted else [])
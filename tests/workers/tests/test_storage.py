@@ -0,0 +1,49 @@
+import asyncio
+
+import pytest
+
+from app import storage
+from app.settings import get_settings
+
+
+class _FakeClient:
+    def __init__(self, opened: list["_FakeClient"]) -> None:
+        self.closed = False
+        self.deleted: list[str] = []
+        opened.append(self)
+
+    async def __aenter__(self) -> "_FakeClient":
+        await asyncio.sleep(0)
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self.closed = True
+
+    async def delete_object(self, *, Bucket: str, Key: str) -> None:
+        self.deleted.append(Key)
+
+
+@pytest.mark.asyncio
+async def test_storage_clients_share_one_pooled_client_per_loop(monkeypatch):
+    opened: list[_FakeClient] = []
+    first = storage.StorageClient(get_settings())
+    second = storage.StorageClient(get_settings())
+    for client in (first, second):
+        monkeypatch.setattr(client._session, "client", lambda *args, **kwargs: _FakeClient(opened))
+
+    await asyncio.gather(
+        first.delete_object(bucket="b", key="one"),
+        second.delete_object(bucket="b", key="two"),
+        first.delete_object(bucket="b", key="three"),
+    )
+
+    assert len(opened) == 1
+    assert sorted(opened[0].deleted) == ["one", "three", "two"]
+    assert first._client_kwargs["config"].max_pool_connections == get_settings().storage_max_pool_connections
+
+    await storage.close_shared_storage()
+    assert opened[0].closed
+
+    await first.delete_object(bucket="b", key="four")
+    assert len(opened) == 2
+    await storage.close_shared_storage()
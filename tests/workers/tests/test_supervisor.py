@@ -0,0 +1,104 @@
+import json
+import time
+
+from app import supervisor
+from app.supervisor import Supervisor, check_health, child_env
+
+
+class _FakeProcess:
+    _next_pid = 1000
+
+    def __init__(self) -> None:
+        _FakeProcess._next_pid += 1
+        self.pid = _FakeProcess._next_pid
+        self.exitcode: int | None = None
+        self.killed = False
+
+    def is_alive(self) -> bool:
+        return self.exitcode is None
+
+    def kill(self) -> None:
+        self.killed = True
+        self.exitcode = -9
+
+    def join(self, timeout=None) -> None:
+        pass
+
+
+def _supervisor(monkeypatch, tmp_path, processes=2, stall_seconds=120.0) -> Supervisor:
+    sup = Supervisor(processes, stall_seconds=stall_seconds, health_file=tmp_path / "health.json")
+
+    def fake_start(slot) -> None:
+        slot.process = _FakeProcess()
+        slot.started_at = time.time()
+
+    monkeypatch.setattr(sup, "_start", fake_start)
+    for slot in sup._slots:
+        sup._start(slot)
+        slot.heartbeat.value = time.time()
+    return sup
+
+
+def test_child_env_splits_cores_unless_explicit(monkeypatch):
+    monkeypatch.setattr(supervisor, "_available_cpus", lambda: 8)
+
+    assert child_env(4, environ={}) == {"WORKER_CPU_POOL_SIZE": "2", "WORKER_VIDEO_THREAD_BUDGET": "2"}
+    assert child_env(16, environ={}) == {"WORKER_CPU_POOL_SIZE": "1", "WORKER_VIDEO_THREAD_BUDGET": "1"}
+    assert child_env(4, environ={"WORKER_CPU_POOL_SIZE": "0"}) == {"WORKER_VIDEO_THREAD_BUDGET": "2"}
+
+
+def test_crashed_child_is_restarted_with_backoff(monkeypatch, tmp_path):
+    sup = _supervisor(monkeypatch, tmp_path)
+    slot = sup._slots[0]
+    first = slot.process
+
+    delays = []
+    for _ in range(3):
+        slot.process.exitcode = 1
+        sup.tick()
+        assert slot.process is None
+        delays.append(slot.restart_at - time.time())
+        slot.restart_at = 0.0
+        sup.tick()
+        assert slot.process is not None and slot.process is not first
+        slot.heartbeat.value = time.time()
+
+    assert [round(delay) for delay in delays] == [1, 2, 4]
+    assert slot.restarts == 3
+    assert sup._slots[1].restarts == 0
+
+
+def test_stalled_child_is_killed(monkeypatch, tmp_path):
+    sup = _supervisor(monkeypatch, tmp_path, stall_seconds=10)
+    slot = sup._slots[1]
+    stuck = slot.process
+    slot.heartbeat.value = time.time() - 60
+
+    sup.tick()
+
+    assert stuck.killed
+    assert slot.process is None
+    assert slot.last_exit == -9
+
+
+def test_health_file_aggregates_children(monkeypatch, tmp_path):
+    sup = _supervisor(monkeypatch, tmp_path)
+    sup.tick()
+
+    report = json.loads((tmp_path / "health.json").read_text())
+    assert report["status"] == "ok"
+    assert report["healthy"] == 2
+    assert [child["alive"] for child in report["children"]] == [True, True]
+    assert check_health(tmp_path / "health.json")
+
+    sup._slots[0].process.exitcode = 1
+    sup.tick()
+    assert json.loads((tmp_path / "health.json").read_text())["status"] == "degraded"
+    assert not check_health(tmp_path / "health.json")
+
+
+def test_check_health_rejects_stale_or_missing_report(tmp_path):
+    path = tmp_path / "health.json"
+    assert not check_health(path)
+    path.write_text(json.dumps({"updated_at": time.time() - 300, "status": "ok"}))
+    assert not check_health(path)
@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+
+from app import uploads
+from app.settings import get_settings
+from app.storage import StorageClient
+
+
+class _RecordingStorage:
+    def __init__(self, fail_key: str | None = None) -> None:
+        self.keys: list[str] = []
+        self.active = 0
+        self.peak = 0
+        self._fail_key = fail_key
+
+    async def upload_file(self, *, bucket, key, source, content_type=None) -> None:
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(0.01)
+            if key == self._fail_key:
+                raise RuntimeError("upload falhou")
+            self.keys.append(key)
+        finally:
+            self.active -= 1
+
+
+def _pending(tmp_path, name: str, *, preset: str | None = None) -> uploads.PendingUpload:
+    path = tmp_path / name
+    path.write_bytes(b"x" * 10)
+    return uploads.PendingUpload(key=f"k/{name}", source=path, content_type="image/jpeg", preset=preset, kind="photo")
+
+
+@pytest.mark.asyncio
+async def test_upload_derivatives_runs_concurrently_under_job_cap(tmp_path):
+    storage = _RecordingStorage()
+    items = [_pending(tmp_path, "original")] + [
+        _pending(tmp_path, f"v{index}.jpg", preset=f"p{index}") for index in range(5)
+    ]
+
+    variants = await uploads.upload_derivatives(storage, "bucket", items, concurrency=2)
+
+    assert sorted(storage.keys) == sorted(item.key for item in items)
+    assert storage.peak == 2
+    # O original sobe, mas só as variantes voltam, na ordem de entrada.
+    assert [variant.preset for variant in variants] == [f"p{index}" for index in range(5)]
+    assert all(variant.size_bytes == 10 for variant in variants)
+
+
+@pytest.mark.asyncio
+async def test_upload_derivatives_raises_original_error(tmp_path):
+    storage = _RecordingStorage(fail_key="k/v1.jpg")
+    items = [_pending(tmp_path, f"v{index}.jpg", preset=f"p{index}") for index in range(3)]
+
+    with pytest.raises(RuntimeError, match="upload falhou"):
+        await uploads.upload_derivatives(storage, "bucket", items)
+
+
+def test_transfer_config_grows_part_size_for_huge_files():
+    client = StorageClient(get_settings())
+    chunk = get_settings().storage_multipart_chunk_mb * 1024 * 1024
+
+    assert client._transfer_config(10).multipart_chunksize == chunk
+    huge = client._transfer_config(500 * 1024**3)
+    assert huge.multipart_chunksize > chunk
+    assert 500 * 1024**3 / huge.multipart_chunksize <= 10_000
@@ -0,0 +1,92 @@
+from app.video_plan import SourceProbe, VideoTarget, plan_transcode
+
+LADDER = [
+    VideoTarget("video_1080p", 1920, max_bitrate=10_000_000),
+    VideoTarget("video_720p", 1280, max_bitrate=5_000_000),
+]
+
+
+def _phone_clip(**overrides) -> SourceProbe:
+    fields = {
+        "width": 1280,
+        "height": 720,
+        "duration_ms": 30_000,
+        "format_name": "mov,mp4,m4a,3gp,3g2,mj2",
+        "video_codec": "h264",
+        "video_profile": "High",
+        "pix_fmt": "yuv420p",
+        "video_bitrate": 4_000_000,
+        "audio_codec": "aac",
+    }
+    fields.update(overrides)
+    return SourceProbe(**fields)
+
+
+def _actions(plan) -> dict[str, str]:
+    return {item.preset: item.action for item in plan.outputs}
+
+
+def test_from_ffprobe_swaps_dimensions_for_rotated_video():
+    probe = SourceProbe.from_ffprobe(
+        {
+            "streams": [
+                {
+                    "codec_type": "video",
+                    "codec_name": "h264",
+                    "profile": "High",
+                    "width": 1920,
+                    "height": 1080,
+                    "pix_fmt": "yuv420p",
+                    "bit_rate": "9000000",
+                    "side_data_list": [{"rotation": -90}],
+                },
+                {"codec_type": "audio", "codec_name": "aac"},
+            ],
+            "format": {"format_name": "mov,mp4,m4a,3gp,3g2,mj2", "duration": "12.345"},
+        }
+    )
+
+    assert (probe.width, probe.height) == (1080, 1920)
+    assert probe.duration_ms == 12345
+    assert probe.video_bitrate == 9_000_000
+    assert probe.audio_codec == "aac"
+
+
+def test_compatible_source_at_preset_size_is_remuxed_and_larger_preset_skipped():
+    plan = plan_transcode(_phone_clip(), LADDER)
+
+    assert _actions(plan) == {"video_720p": "copy"}
+    assert plan.skipped == ["video_1080p"]
+
+
+def test_large_source_keeps_full_ladder():
+    plan = plan_transcode(_phone_clip(width=3840, height=2160, video_bitrate=40_000_000), LADDER)
+
+    assert _actions(plan) == {"video_1080p": "encode", "video_720p": "encode"}
+    assert plan.skipped == []
+
+
+def test_source_between_presets_encodes_native_and_downscaled():
+    plan = plan_transcode(_phone_clip(width=1600, height=900, video_bitrate=20_000_000), LADDER)
+
+    assert _actions(plan) == {"video_1080p": "encode", "video_720p": "encode"}
+    assert plan.outputs[0].reason == "bitrate"
+    assert plan.outputs[1].reason == "downscale"
+
+
+def test_incompatible_codec_or_container_is_reencoded():
+    hevc = plan_transcode(_phone_clip(video_codec="hevc"), LADDER)
+    webm = plan_transcode(_phone_clip(), LADDER, container="webm")
+
+    assert hevc.outputs[0].reason == "codec:hevc"
+    assert webm.outputs[0].reason == "container"
+
+
+def test_box_target_never_upscales_or_pads():
+    target = VideoTarget("video_1080p", 1920, 1080)
+
+    scale = target.scale_filter()
+
+    assert "min(1920,iw)" in scale and "min(1080,ih)" in scale
+    assert "pad=" not in scale
+    assert plan_transcode(_phone_clip(width=640, height=360), [target]).outputs[0].action == "copy"
@@ -0,0 +1,123 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from app import video_segments
+from app.video_segments import SegmentedOutput, ThreadBudget, transcode_segmented
+
+
+class _FakeFFmpeg:
+    def __init__(self, chunks: int) -> None:
+        self.chunks = chunks
+        self.calls: list[list[str]] = []
+        self.running_threads = 0
+        self.peak_threads = 0
+
+    async def __call__(self, executable: str, args: list[str], *, on_time=None) -> str:
+        self.calls.append(args)
+        if "segment" in args:
+            pattern = args[-1]
+            for index in range(self.chunks):
+                Path(pattern.replace("%04d", f"{index:04d}")).touch()
+            return ""
+        # Um comando com várias saídas roda um encoder por saída: soma todos os `-threads`.
+        threads = sum(int(args[i + 1]) for i, arg in enumerate(args) if arg == "-threads")
+        self.running_threads += threads
+        self.peak_threads = max(self.peak_threads, self.running_threads)
+        await asyncio.sleep(0.01)
+        self.running_threads -= threads
+        if on_time is not None:
+            on_time(120_000)
+        Path(args[-1]).touch()
+        return "Output #0, matroska, to 'out0_0000.mkv':\n  Stream #0:0: Video: h264, yuv420p, 1280x720, 30 fps\n"
+
+
+def test_should_segment_uses_duration_threshold(monkeypatch):
+    settings = video_segments.get_settings()
+    monkeypatch.setattr(settings, "video_segment_min_seconds", 300)
+
+    assert not video_segments.should_segment(299_000, settings)
+    assert video_segments.should_segment(300_000, settings)
+    monkeypatch.setattr(settings, "video_segment_min_seconds", 0)
+    assert not video_segments.should_segment(3_600_000, settings)
+
+
+@pytest.mark.asyncio
+async def test_transcode_segmented_encodes_chunks_within_thread_budget(tmp_path: Path):
+    fake = _FakeFFmpeg(chunks=5)
+    encoded: list[int] = []
+    output = tmp_path / "video_720p.mp4"
+
+    report = await transcode_segmented(
+        fake,
+        "ffmpeg",
+        tmp_path / "source",
+        tmp_path / "segments",
+        [
+            SegmentedOutput(
+                path=output,
+                video_filter="scale=w='min(1280,iw)':h=-2",
+                video_args=["-c:v", "libx264"],
+                audio_args=["-c:a", "aac"],
+                container_args=["-movflags", "+faststart"],
+            )
+        ],
+        duration_ms=600_000,
+        has_audio=True,
+        rotation=90,
+        budget=ThreadBudget(4),
+        threads_per_chunk=2,
+        on_time=encoded.append,
+    )
+
+    assert fake.peak_threads <= 4
+    chunk_calls = [call for call in fake.calls if "-threads" in call]
+    assert len(chunk_calls) == 5
+    assert all("transpose=clock,scale=w='min(1280,iw)':h=-2" in call for call in chunk_calls)
+    concat_call = fake.calls[-1]
+    assert concat_call[-1] == str(output)
+    assert ["-c", "copy", "-movflags", "+faststart"] == concat_call[-5:-1]
+    concat_list = (tmp_path / "segments" / "concat_0.txt").read_text().splitlines()
+    assert len(concat_list) == 5
+    assert report.output_sizes == {0: (1280, 720)}
+    assert report.duration_ms == 600_000
+    assert encoded[-1] == 600_000
+
+
+@pytest.mark.asyncio
+async def test_transcode_segmented_splits_threads_across_outputs(tmp_path: Path):
+    fake = _FakeFFmpeg(chunks=4)
+    outputs = [
+        SegmentedOutput(
+            path=tmp_path / f"video_{height}p.mp4",
+            video_filter=f"scale=-2:{height}",
+            video_args=["-c:v", "libx264"],
+            audio_args=["-c:a", "aac"],
+        )
+        for height in (1080, 720)
+    ]
+
+    await transcode_segmented(
+        fake,
+        "ffmpeg",
+        tmp_path / "source",
+        tmp_path / "segments",
+        outputs,
+        duration_ms=600_000,
+        has_audio=False,
+        budget=ThreadBudget(4),
+        threads_per_chunk=2,
+    )
+
+    chunk_calls = [call for call in fake.calls if "-threads" in call]
+    assert len(chunk_calls) == 4
+    for call in chunk_calls:
+        assert sum(int(call[i + 1]) for i, arg in enumerate(call) if arg == "-threads") == 2
+    assert fake.peak_threads <= 4
+
+
+def test_split_threads_gives_every_output_at_least_one():
+    assert video_segments.split_threads(4, 2) == [2, 2]
+    assert video_segments.split_threads(5, 2) == [3, 2]
+    assert video_segments.split_threads(1, 1) == [1]
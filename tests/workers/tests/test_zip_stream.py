@@ -0,0 +1,55 @@
+import io
+import os
+import zipfile
+from datetime import datetime
+
+from app.zip_stream import ZIP_DEFLATED, ZIP_STORED, ZipStreamWriter, compression_for
+
+
+def _build(files: dict[str, bytes], writer: ZipStreamWriter | None = None) -> bytes:
+    writer = writer or ZipStreamWriter(date_time=datetime(2026, 3, 4, 5, 6, 8))
+    out = io.BytesIO()
+    for name, data in files.items():
+        out.write(writer.start_entry(name))
+        for start in range(0, len(data), 1000):
+            out.write(writer.write(data[start : start + 1000]))
+        out.write(writer.end_entry())
+    out.write(writer.finish())
+    assert writer.offset == len(out.getvalue())
+    return out.getvalue()
+
+
+def test_streamed_zip_round_trips_with_stored_media():
+    files = {
+        "fotos/bebê.jpg": os.urandom(5000),
+        "notas.txt": b"primeiro sorriso\n" * 500,
+        "vazio.json": b"",
+    }
+    archive = zipfile.ZipFile(io.BytesIO(_build(files)))
+
+    assert archive.testzip() is None
+    assert {name: archive.read(name) for name in files} == files
+    methods = {info.filename: info.compress_type for info in archive.infolist()}
+    assert methods == {"fotos/bebê.jpg": ZIP_STORED, "notas.txt": ZIP_DEFLATED, "vazio.json": ZIP_DEFLATED}
+    assert compression_for("VIDEO.MP4") == ZIP_STORED
+
+
+def test_zip64_end_records_for_many_entries():
+    files = {f"{index}.txt": b"x" for index in range(70_000)}
+    archive = zipfile.ZipFile(io.BytesIO(_build(files)))
+
+    assert len(archive.infolist()) == 70_000
+    assert archive.read("69999.txt") == b"x"
+
+
+def test_writer_resumes_from_state_between_entries():
+    date = datetime(2026, 3, 4)
+    first = ZipStreamWriter(date_time=date)
+    head = first.start_entry("a.txt") + first.write(b"alpha") + first.end_entry()
+
+    resumed = ZipStreamWriter.from_state(first.state(), date_time=date)
+    tail = resumed.start_entry("b.txt") + resumed.write(b"beta") + resumed.end_entry() + resumed.finish()
+
+    archive = zipfile.ZipFile(io.BytesIO(head + tail))
+    assert archive.read("a.txt") == b"alpha"
+    assert archive.read("b.txt") == b"beta"